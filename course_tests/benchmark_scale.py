@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Splunk Advanced Course - Data-Scale Benchmark
+Runs every lab query at several data volumes and estimates how its cost grows
+"""
+
+import sys
+import os
+import json
+import argparse
+from datetime import datetime
+import urllib3
+
+# Disable SSL warnings for testing
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Add utils and the data scripts to path
+COURSE_TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(COURSE_TESTS_DIR), "scripts")
+DATA_DIR = os.path.join(os.path.dirname(COURSE_TESTS_DIR), "data")
+sys.path.append(COURSE_TESTS_DIR)
+sys.path.append(SCRIPTS_DIR)
+
+from utils.splunk_client import SplunkClient
+from utils.parallel import collect_tests
+from utils.scale_benchmark import ScaleBenchmark
+from run_all_tests import REPORTS_DIR, create_lab_tests
+import generate_sample_data
+import load_data_to_splunk
+
+INDEXING_TIMEOUT = 3600  # Seconds to wait for a scaled data set to become searchable
+
+
+def index_suffix(scale: int) -> str:
+    """Suffix of the indexes holding a scale's data set (e.g. '_x10')"""
+    return f"_x{scale}"
+
+
+def prepare_scale(client: SplunkClient, args, scale: int) -> bool:
+    """
+    Generate and load the data set for one scale unless it is already loaded
+
+    Returns:
+        True if the scaled indexes hold their data
+    """
+    suffix = index_suffix(scale)
+    data_dir = os.path.join(DATA_DIR, f"scale{suffix}")
+    manifest = generate_sample_data.read_manifest(data_dir)
+    events_per_day = generate_sample_data.EVENTS_PER_DAY * scale
+
+    if (manifest and manifest.get("events_per_day") == events_per_day
+            and manifest.get("seed") == args.seed):
+        print(f"ℹ {scale}x data already generated in {data_dir}")
+    else:
+        print(f"Generating {scale}x data in {data_dir}...")
+        generate_sample_data.generate_all(output_dir=data_dir, seed=args.seed, scale=scale)
+        manifest = generate_sample_data.read_manifest(data_dir)
+
+    # Expected index counts come from the manifest's per-file event counts
+    expected = {
+        data_file["index"] + suffix: manifest["files"].get(data_file["file"], 0)
+        for data_file in load_data_to_splunk.DATA_FILES
+    }
+    counts = client.get_index_counts(method="tstats") or {}
+    if all(counts.get(index, 0) >= want for index, want in expected.items()):
+        print(f"ℹ {scale}x data already loaded")
+        return True
+
+    print(f"Loading {scale}x data into *{suffix} indexes...")
+    result = load_data_to_splunk.load_all(args.host, args.port, args.username, args.password,
+                                          data_dir=data_dir, clean=True, index_suffix=suffix)
+    if not result["success"]:
+        print(f"✗ Failed to load {scale}x data")
+        return False
+
+    print("Waiting for events to be indexed...")
+    indexed = client.wait_for_index_counts(result["indexes"], timeout=INDEXING_TIMEOUT)
+    if not indexed["success"]:
+        print(f"✗ {scale}x data not fully indexed after {indexed['elapsed']:.0f}s")
+        return False
+    print(f"✓ {scale}x data indexed ({indexed['elapsed']:.0f}s)")
+    return True
+
+
+def print_curves(curves, scales, skipped):
+    """Print per-query scaling curves and complexity estimates"""
+    print("\n" + "=" * 100)
+    print("SCALING CURVES (search job runDuration)")
+    print("=" * 100)
+    header = f"{'Query':<52}" + "".join(f"{str(scale) + 'x':>9}" for scale in scales)
+    print(f"{header} {'k':>6} {'scan k':>7}  Growth")
+    print("-" * 100)
+
+    for curve in curves:
+        cells = ""
+        for scale in scales:
+            measurement = curve["scales"].get(str(scale))
+            if measurement is None:
+                cells += f"{'-':>9}"
+            elif not measurement["success"]:
+                cells += f"{'failed':>9}"
+            else:
+                cells += f"{measurement['run_duration']:>8.2f}s"
+        exponent = curve["duration_exponent"]
+        scan_exponent = curve["scan_exponent"]
+        print(f"{curve['key'][:52]:<52}{cells} "
+              f"{exponent if exponent is not None else float('nan'):>6.2f} "
+              f"{scan_exponent if scan_exponent is not None else float('nan'):>7.2f}  "
+              f"{curve['growth']}")
+
+    print("-" * 100)
+    print("k: fitted exponent of runDuration ~ scale^k (1.0 = linear in data volume)")
+    if skipped:
+        print(f"ℹ {len(skipped)} queries read no course index and were not benchmarked")
+
+    steep = [curve for curve in curves if curve["growth"] == "superlinear"]
+    if steep:
+        print(f"\n⚠ {len(steep)} queries grow faster than the data:")
+        for curve in steep:
+            print(f"  - {curve['key']} (k={curve['duration_exponent']:.2f})")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Splunk Advanced Course - Data-Scale Benchmark"
+    )
+    parser.add_argument(
+        "--host",
+        default=load_data_to_splunk.SPLUNK_HOST,
+        help=f"Splunk host (default: {load_data_to_splunk.SPLUNK_HOST})"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=load_data_to_splunk.SPLUNK_PORT,
+        help=f"Splunk management port (default: {load_data_to_splunk.SPLUNK_PORT})"
+    )
+    parser.add_argument(
+        "--username",
+        default=load_data_to_splunk.SPLUNK_USERNAME,
+        help=f"Splunk username (default: {load_data_to_splunk.SPLUNK_USERNAME})"
+    )
+    parser.add_argument(
+        "--password",
+        default=load_data_to_splunk.SPLUNK_PASSWORD,
+        help="Splunk password"
+    )
+    parser.add_argument(
+        "--scales",
+        default="1,10,100",
+        help="Comma-separated multiples of EVENTS_PER_DAY to benchmark (default: 1,10,100)"
+    )
+    parser.add_argument(
+        "--lab",
+        type=int,
+        choices=range(1, 15),
+        help="Benchmark one lab only (1-14)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per query and scale; the median is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="Data generator seed, so every scale draws from the same distributions (default: 1)"
+    )
+    parser.add_argument(
+        "--skip-load",
+        action="store_true",
+        help="Benchmark the scaled indexes as they are, without generating or loading data"
+    )
+    parser.add_argument(
+        "--keep-indexes",
+        action="store_true",
+        help="Keep the scaled indexes afterwards (by default they are deleted, since they "
+             "would show up in index=* searches and the data checks)"
+    )
+    parser.add_argument(
+        "--output",
+        help=f"JSON report file (default: {REPORTS_DIR}/scale_benchmark_<timestamp>.json)"
+    )
+    args = parser.parse_args()
+
+    scales = sorted({int(item) for item in args.scales.split(",") if item.strip()})
+
+    print("=" * 80)
+    print("Splunk Advanced Course - Data-Scale Benchmark")
+    print("=" * 80)
+
+    client = SplunkClient(args.host, args.port, args.username, args.password)
+    print(f"\nConnecting to Splunk at {args.host}:{args.port}...")
+    if not client.login():
+        print("✗ Failed to connect to Splunk")
+        return 1
+    print("✓ Successfully connected to Splunk")
+
+    lab_tests = create_lab_tests(client)
+    if args.lab is not None:
+        lab_tests = [lab_tests[args.lab - 1]]
+    benchmark = ScaleBenchmark(client, collect_tests(lab_tests), repeat=args.repeat)
+    course_indexes = [index_config["name"] for index_config in load_data_to_splunk.INDEXES]
+
+    start_time = datetime.now()
+    try:
+        for scale in scales:
+            print("\n" + "=" * 80)
+            print(f"Scale {scale}x ({generate_sample_data.EVENTS_PER_DAY * scale:,} events per day)")
+            print("=" * 80)
+            if not args.skip_load and not prepare_scale(client, args, scale):
+                print(f"⚠ Skipping {scale}x")
+                continue
+
+            index_map = {index: index + index_suffix(scale) for index in course_indexes}
+            benchmark.run_scale(scale, index_map)
+
+    except KeyboardInterrupt:
+        print("\n\nBenchmark cancelled by user; reporting the scales measured so far.")
+
+    finally:
+        if not args.keep_indexes and not args.skip_load:
+            print("\nDeleting the scaled indexes (use --keep-indexes to keep them)...")
+            loader = load_data_to_splunk.SplunkLoader(args.host, args.port,
+                                                      args.username, args.password)
+            for scale in scales:
+                for index in course_indexes:
+                    loader.delete_index(index + index_suffix(scale))
+
+    curves = benchmark.analyze()
+    print_curves(curves, scales, benchmark.skipped)
+
+    report = {
+        "timestamp": start_time.isoformat(),
+        "scales": scales,
+        "events_per_day": generate_sample_data.EVENTS_PER_DAY,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "skipped": benchmark.skipped,
+        "curves": curves
+    }
+    filename = args.output or os.path.join(
+        REPORTS_DIR, f"scale_benchmark_{start_time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport saved to {filename}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
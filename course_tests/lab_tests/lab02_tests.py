@@ -43,7 +43,8 @@ class Lab02Tests(LabTestBase):
             test_name="Subsearch with format command",
             query="index=web [search index=app level=ERROR | fields host | format] | head 10",
             expected_min_results=0,
-            earliest_time="-30d"
+            earliest_time="-30d",
+            latency_budget=20.0
         )
         self.add_result(result)
 
@@ -8,6 +8,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.test_base import LabTestBase
+from utils.summaries import summary_source
+
+# Summary rows behind the timechart tests (used with --use-summaries)
+WEB_HOURLY = summary_source("course_web_hourly")
 
 
 class Lab03Tests(LabTestBase):
@@ -84,6 +88,7 @@ class Lab03Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Timechart span=1h avg response time",
             query="index=web | timechart span=1h avg(response_time) as avg_time",
+            summary_query=WEB_HOURLY + " | timechart span=1h sum(sum_response_time) as total, sum(count) as events | eval avg_time=total/events | fields _time, avg_time",
             expected_min_results=1,
             earliest_time="-7d"
         )
@@ -93,6 +98,7 @@ class Lab03Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Timechart count by status",
             query="index=web | timechart span=1h count by status",
+            summary_query=WEB_HOURLY + " | timechart span=1h sum(count) by status",
             expected_min_results=1,
             earliest_time="-7d"
         )
@@ -102,6 +108,9 @@ class Lab03Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Timechart multiple statistics",
             query="index=web | timechart span=1h avg(response_time) as avg_time, max(response_time) as max_time, count",
+            summary_query=WEB_HOURLY + " | timechart span=1h sum(sum_response_time) as total, "
+                          "max(max_response_time) as max_time, sum(count) as count "
+                          "| eval avg_time=total/count | fields _time, avg_time, max_time, count",
             expected_min_results=1,
             earliest_time="-7d"
         )
@@ -9,6 +9,11 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.test_base import LabTestBase
+from utils.summaries import summary_source
+
+# Summary rows behind the timechart tests (used with --use-summaries)
+WEB_HOURLY = summary_source("course_web_hourly")
+SALES_DAILY = summary_source("course_sales_daily")
 
 
 class Lab04Tests(LabTestBase):
@@ -23,7 +28,8 @@ class Lab04Tests(LabTestBase):
             test_name="Basic join operation",
             query="index=web | join type=inner user [search index=auth action=login | fields user, src_ip] | head 10",
             expected_min_results=0,
-            earliest_time="-30d"
+            earliest_time="-30d",
+            latency_budget=30.0
         )
         self.add_result(result)
 
@@ -32,7 +38,8 @@ class Lab04Tests(LabTestBase):
             test_name="Left join operation",
             query="index=web | join type=left user [search index=auth | fields user, action] | head 10",
             expected_min_results=0,
-            earliest_time="-30d"
+            earliest_time="-30d",
+            latency_budget=30.0
         )
         self.add_result(result)
 
@@ -79,6 +86,7 @@ class Lab05Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Timechart with span",
             query="index=web | timechart span=1h count by status",
+            summary_query=WEB_HOURLY + " | timechart span=1h sum(count) by status",
             expected_min_results=1,
             earliest_time="-7d"
         )
@@ -97,6 +105,7 @@ class Lab05Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Timechart for prediction",
             query='index=web | timechart span=1d count as daily_count',
+            summary_query=WEB_HOURLY + " | timechart span=1d sum(count) as daily_count",
             expected_min_results=1,
             earliest_time="-30d"
         )
@@ -117,6 +126,7 @@ class Lab06Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Line chart data (timechart)",
             query="index=web | timechart span=1h avg(response_time) as avg_response",
+            summary_query=WEB_HOURLY + " | timechart span=1h sum(sum_response_time) as total, sum(count) as events | eval avg_response=total/events | fields _time, avg_response",
             expected_min_results=1,
             earliest_time="-7d"
         )
@@ -187,6 +197,40 @@ class Lab07Tests(LabTestBase):
         )
         self.add_result(result)
 
+        # Test 4: Speedup - stats instead of transaction
+        result = self.run_speedup_test(
+            test_name="Speedup: stats vs transaction",
+            naive_query="index=web | transaction src_ip maxspan=1h | stats count as sessions",
+            optimized_query="index=web | stats min(_time) as start, max(_time) as end by src_ip | stats count as sessions",
+            min_speedup=2.0,
+            earliest_time="-7d"
+        )
+        self.add_result(result)
+
+        # Test 5: Speedup - tstats reads index metadata instead of events
+        result = self.run_speedup_test(
+            test_name="Speedup: tstats vs stats count",
+            naive_query="index=web | stats count by host",
+            optimized_query="| tstats count where index=web by host",
+            min_speedup=2.0,
+            same_results=True,
+            earliest_time="-7d"
+        )
+        self.add_result(result)
+
+        # Test 6: Speedup - summary index instead of raw events
+        result = self.run_speedup_test(
+            test_name="Speedup: summary index vs raw events",
+            naive_query="index=web | stats count by status",
+            optimized_query=WEB_HOURLY + " | stats sum(count) as count by status",
+            min_speedup=1.5,
+            min_scan_ratio=10.0,
+            # Reads the shared hourly summary instead of collecting rows of its own
+            summaries=["course_web_hourly"],
+            earliest_time="-7d"
+        )
+        self.add_result(result)
+
         self.print_summary()
         return self.get_summary()
 
@@ -344,6 +388,7 @@ class Lab11Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Prepare data for ML (timechart)",
             query="index=web | timechart span=1h avg(response_time) as avg_time",
+            summary_query=WEB_HOURLY + " | timechart span=1h sum(sum_response_time) as total, sum(count) as events | eval avg_time=total/events | fields _time, avg_time",
             expected_min_results=1,
             earliest_time="-30d"
         )
@@ -373,6 +418,7 @@ class Lab12Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Time series data (daily aggregation)",
             query="index=sales | timechart span=1d sum(final_amount) as daily_revenue",
+            summary_query=SALES_DAILY + " | timechart span=1d sum(revenue) as daily_revenue",
             expected_min_results=1,
             earliest_time="-30d"
         )
@@ -382,6 +428,8 @@ class Lab12Tests(LabTestBase):
         result = self.run_query_test(
             test_name="Trend analysis with trendline",
             query="index=sales | timechart span=1d sum(final_amount) as revenue | trendline sma3(revenue) as trend",
+            summary_query=SALES_DAILY + " | timechart span=1d sum(revenue) as revenue "
+                                        "| trendline sma3(revenue) as trend",
             expected_min_results=1,
             earliest_time="-30d"
         )
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Splunk Advanced Course - SPL Optimization Advisor
+Flags costly patterns in the lab queries and measures safe rewrites
+"""
+
+import sys
+import os
+import json
+import argparse
+from datetime import datetime
+import urllib3
+
+# Disable SSL warnings for testing
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Add utils to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.splunk_client import SplunkClient
+from utils.parallel import collect_tests
+from utils.spl_advisor import RULES, analyze_query, compare_variants
+from run_all_tests import create_lab_tests
+
+SEVERITY_ORDER = {"high": 0, "medium": 1, "info": 2}
+
+
+def print_findings(entries, verbose: bool = False):
+    """Print findings per rule, then per query when verbose"""
+    print("\n" + "=" * 80)
+    print("SPL OPTIMIZATION FINDINGS")
+    print("=" * 80)
+
+    by_rule = {}
+    for entry in entries:
+        for finding in entry["findings"]:
+            by_rule.setdefault(finding["rule"], []).append(entry["key"])
+
+    if not by_rule:
+        print("✓ No costly patterns found")
+        return
+
+    for rule in sorted(by_rule, key=lambda name: (SEVERITY_ORDER[RULES[name][0]], name)):
+        severity, message = RULES[rule]
+        symbol = "⚠" if severity != "info" else "ℹ"
+        print(f"\n{symbol} {rule} ({severity}, {len(by_rule[rule])} queries)")
+        print(f"  {message}")
+        for key in by_rule[rule] if verbose else by_rule[rule][:5]:
+            print(f"    - {key}")
+        if not verbose and len(by_rule[rule]) > 5:
+            print(f"    ... and {len(by_rule[rule]) - 5} more (use --verbose)")
+
+    rewrites = [entry for entry in entries if entry["rewrite"]]
+    if rewrites:
+        print(f"\nSafe rewrites ({len(rewrites)}):")
+        for entry in rewrites:
+            print(f"  {entry['key']}")
+            print(f"    - {entry['query']}")
+            print(f"    + {entry['rewrite']}")
+
+
+def print_speedups(entries):
+    """Print the measured speedups of the rewrites"""
+    measured = [entry for entry in entries if entry.get("measurement")]
+    if not measured:
+        return
+
+    print("\n" + "=" * 80)
+    print("MEASURED SPEEDUPS (median search job runDuration)")
+    print("=" * 80)
+    print(f"{'Query':<48} {'Original':>9} {'Rewrite':>9} {'Speedup':>8}  Same count")
+    print("-" * 80)
+    for entry in measured:
+        measurement = entry["measurement"]
+        if not measurement["success"]:
+            print(f"{entry['key'][:48]:<48} ✗ {measurement['error']}")
+            continue
+        speedup = measurement["speedup"]
+        print(f"{entry['key'][:48]:<48} {measurement['original']['run_duration']:>8.2f}s "
+              f"{measurement['rewrite']['run_duration']:>8.2f}s "
+              f"{(f'{speedup:.1f}x' if speedup else '-'):>8}  "
+              f"{'✓' if measurement['same_result_count'] else '✗'}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Splunk Advanced Course - SPL Optimization Advisor"
+    )
+    parser.add_argument(
+        "--host",
+        default="localhost",
+        help="Splunk host (default: localhost)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8089,
+        help="Splunk management port (default: 8089)"
+    )
+    parser.add_argument(
+        "--username",
+        default="admin",
+        help="Splunk username (default: admin)"
+    )
+    parser.add_argument(
+        "--password",
+        default="changeme",
+        help="Splunk password (default: changeme)"
+    )
+    parser.add_argument(
+        "--lab",
+        type=int,
+        choices=range(1, 15),
+        help="Analyze one lab only (1-14)"
+    )
+    parser.add_argument(
+        "--measure",
+        action="store_true",
+        help="Run each query and its rewrite on Splunk and report the speedup"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs of each variant when measuring (default: 3)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="List every query per finding"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the findings (and measurements) as JSON to this file"
+    )
+    args = parser.parse_args()
+
+    # Queries are only collected, so no connection is needed without --measure
+    client = SplunkClient(args.host, args.port, args.username, args.password)
+    lab_tests = create_lab_tests(client)
+    if args.lab is not None:
+        lab_tests = [lab_tests[args.lab - 1]]
+
+    entries = []
+    for test in collect_tests(lab_tests):
+        analysis = analyze_query(test.spec.query)
+        entries.append({
+            "key": test.spec.key,
+            "query": test.spec.query,
+            "earliest_time": test.spec.earliest_time,
+            "latest_time": test.spec.latest_time,
+            "findings": analysis["findings"],
+            "rewrite": analysis["rewrite"]
+        })
+
+    print(f"Analyzed {len(entries)} queries from {len(lab_tests)} labs")
+    print_findings(entries, verbose=args.verbose)
+
+    if args.measure:
+        print(f"\nConnecting to Splunk at {args.host}:{args.port}...")
+        if not client.login():
+            print("✗ Failed to connect to Splunk")
+            return 1
+
+        for entry in entries:
+            if not entry["rewrite"]:
+                continue
+            print(f"  Measuring {entry['key']}...")
+            try:
+                entry["measurement"] = compare_variants(
+                    client, entry["query"], entry["rewrite"],
+                    entry["earliest_time"], entry["latest_time"], repeat=args.repeat
+                )
+            except Exception as e:
+                entry["measurement"] = {"success": False, "error": str(e)}
+
+        print_speedups(entries)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": datetime.now().isoformat(), "queries": entries}, f, indent=2)
+        print(f"\nFindings saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Splunk Advanced Course - Test Report History
+Latency trends, regression detection and run comparison over saved reports
+"""
+
+import sys
+import os
+import glob
+import json
+import argparse
+
+# Add utils to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.report_store import ReportStore, HISTORY_FILE
+from utils.job_profile import rank_command_hotspots, print_hotspots
+
+# Directory holding saved test_results_*.json reports
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports")
+
+
+def _format_time(value) -> str:
+    """Format an optional duration in seconds"""
+    return f"{value:.2f}s" if value is not None else "-"
+
+
+def show_runs(store: ReportStore, args):
+    """Print the most recent runs"""
+    runs = store.list_runs(args.limit)
+    print(f"{'Run':<6} {'Timestamp':<28} {'Tests':<7} {'Passed':<8} {'Rate':<8} {'Duration':<10}")
+    print("-" * 80)
+    for run in runs:
+        rate = f"{run['pass_rate'] or 0:.1f}%"
+        print(f"{run['run_id']:<6} {run['timestamp']:<28} {run['total_tests'] or 0:<7} "
+              f"{run['total_passed'] or 0:<8} {rate:<8} {_format_time(run['duration'])}")
+
+
+def show_trend(store: ReportStore, args):
+    """Print the latency history of every test matching a pattern"""
+    test_keys = store.find_tests(args.test)
+    if not test_keys:
+        print(f"No stored tests match '{args.test}'")
+        return 1
+
+    for test_key in test_keys:
+        history = store.trend(test_key, args.limit)
+        times = [row["execution_time"] for row in history if row["execution_time"] is not None]
+        peak = max(times) if times else 0
+
+        print(f"\n{test_key}")
+        print("-" * 80)
+        for row in history:
+            value = row["execution_time"] or 0
+            bar = "#" * int(40 * value / peak) if peak else ""
+            status = "✓" if row["passed"] else "✗"
+            print(f"  {row['timestamp'][:19]:<20} {status} {_format_time(row['execution_time']):>9} {bar}")
+    return 0
+
+
+def show_regressions(store: ReportStore, args):
+    """Print tests significantly slower than their rolling baseline"""
+    flagged = store.regressions(run_id=args.run, window=args.window,
+                                threshold=args.threshold, min_samples=args.min_samples)
+    if not flagged:
+        print("No significant latency regressions")
+        return 0
+
+    print(f"{len(flagged)} tests slower than their {args.window}-run baseline "
+          f"(z > {args.threshold}):")
+    print("-" * 80)
+    for item in flagged:
+        print(f"  ⚠ {item['test_key']}: {item['execution_time']:.2f}s vs "
+              f"{item['baseline_mean']:.2f}s ± {item['baseline_stdev']:.2f}s "
+              f"(z={item['z_score']:.1f}, {item['baseline_runs']} runs)")
+    return 1
+
+
+def show_comparison(store: ReportStore, args):
+    """Print per-test differences between two runs"""
+    rows = store.compare(args.run_a, args.run_b)
+    if not rows:
+        print(f"No stored results for runs {args.run_a} and {args.run_b}")
+        return 1
+
+    print(f"{'Test':<56} {'Run ' + str(args.run_a):>9} {'Run ' + str(args.run_b):>9} {'Delta':>9}")
+    print("-" * 86)
+    for row in rows[:args.limit] if args.limit else rows:
+        delta = f"{row['delta']:+.2f}s" if row["delta"] is not None else "-"
+        changed = " *" if row.get("passed_a") != row.get("passed_b") else ""
+        print(f"{row['test_key'][:56]:<56} {_format_time(row.get('time_a')):>9} "
+              f"{_format_time(row.get('time_b')):>9} {delta:>9}{changed}")
+    print("\n* pass/fail status changed")
+    return 0
+
+
+def show_hotspots(args):
+    """Print the most expensive search commands of a saved report"""
+    path = args.report
+    if path is None:
+        reports = sorted(glob.glob(os.path.join(args.reports_dir, "test_results_*.json")))
+        if not reports:
+            print(f"No saved reports in {args.reports_dir}")
+            return 1
+        path = reports[-1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    hotspots = report.get("command_hotspots") or rank_command_hotspots(
+        test for lab in report.get("lab_results", []) for test in lab.get("results", [])
+    )
+    print(f"Report: {os.path.basename(path)}")
+    if not hotspots:
+        print("No job profiles in this report (run the tests with --profile-jobs)")
+        return 1
+    print_hotspots(hotspots, limit=args.limit)
+    return 0
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Splunk Advanced Course - Test Report History"
+    )
+    parser.add_argument(
+        "--reports-dir",
+        default=REPORTS_DIR,
+        help=f"Directory of saved JSON reports (default: {REPORTS_DIR})"
+    )
+    parser.add_argument(
+        "--store",
+        help=f"History database (default: <reports-dir>/{HISTORY_FILE})"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("ingest", help="Add new JSON reports to the history store")
+
+    runs_parser = subparsers.add_parser("runs", help="List stored runs")
+    runs_parser.add_argument("--limit", type=int, default=20, help="Runs to show (default: 20)")
+
+    trend_parser = subparsers.add_parser("trend", help="Show latency trend of matching tests")
+    trend_parser.add_argument("test", help="Substring of the test key, e.g. 'lab04:' or 'join'")
+    trend_parser.add_argument("--limit", type=int, default=20, help="Runs to show (default: 20)")
+
+    regress_parser = subparsers.add_parser("regressions",
+                                           help="Flag tests slower than their rolling baseline")
+    regress_parser.add_argument("--run", type=int, help="Run to check (default: latest)")
+    regress_parser.add_argument("--window", type=int, default=10,
+                                help="Earlier runs in the baseline (default: 10)")
+    regress_parser.add_argument("--threshold", type=float, default=3.0,
+                                help="z-score that counts as a slowdown (default: 3.0)")
+    regress_parser.add_argument("--min-samples", type=int, default=5,
+                                help="Baseline runs needed per test (default: 5)")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two runs")
+    compare_parser.add_argument("run_a", type=int, help="Reference run ID")
+    compare_parser.add_argument("run_b", type=int, help="Run ID to compare")
+    compare_parser.add_argument("--limit", type=int, help="Show only the N largest slowdowns")
+
+    hotspots_parser = subparsers.add_parser("hotspots",
+                                            help="Rank search commands by time in a saved report")
+    hotspots_parser.add_argument("report", nargs="?", help="Report file (default: latest)")
+    hotspots_parser.add_argument("--limit", type=int, default=15, help="Commands to show (default: 15)")
+
+    args = parser.parse_args()
+
+    if args.command == "hotspots":
+        return show_hotspots(args)
+
+    store = ReportStore(args.store or os.path.join(args.reports_dir, HISTORY_FILE))
+    try:
+        # Pick up reports saved by older runs or copied in from elsewhere
+        added = store.ingest_directory(args.reports_dir)
+        if args.command == "ingest":
+            print(f"✓ Added {added} new reports to {store.path}")
+            return 0
+        if args.command == "runs":
+            show_runs(store, args)
+            return 0
+        if args.command == "trend":
+            return show_trend(store, args)
+        if args.command == "regressions":
+            return show_regressions(store, args)
+        return show_comparison(store, args)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
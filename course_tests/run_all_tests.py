@@ -18,8 +18,32 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Add utils to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from utils.splunk_client import SplunkClient
-from utils.test_base import DataValidator
+from utils.splunk_client import SplunkClient, DEFAULT_ORPHAN_AGE
+from utils.result_cache import ResultCache
+from utils.concurrency import SearchGovernor
+from utils.parallel import ParallelTestExecutor, resolve_worker_count
+from utils.query_planner import QueryPlanner
+from utils.latency import LatencyBudgets, LatencyGate, load_report_history
+from utils.report_store import ReportStore, HISTORY_FILE
+from utils.job_profile import rank_command_hotspots, print_hotspots
+from utils.summaries import SummaryBootstrap
+from utils.catalog import CATALOG_DIR, TestCatalog, check_catalog, export_catalog
+from utils.scheduler import LPTScheduler
+from utils.incremental import IncrementalSelector
+from utils.sharding import Shard, ShardedExecutor, parse_hosts
+from utils.test_base import DataValidator, COURSE_INDEXES
+
+# Directory holding saved test_results_*.json reports
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports")
+
+# Most recent reports the scheduler learns test durations from
+SCHEDULE_HISTORY_RUNS = 20
+
+# Default location of the persistent result cache
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "results.sqlite")
+
+# Default location of the incremental-mode state (last passing result per test)
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "incremental.json")
 
 # Import all lab tests
 from lab_tests.lab01_tests import Lab01Tests
@@ -31,11 +55,42 @@ from lab_tests.lab04_to_14_tests import (
     Lab12Tests, Lab13Tests, Lab14Tests
 )
 
+# Lab test classes in lab order
+LAB_TEST_CLASSES = [
+    Lab01Tests, Lab02Tests, Lab03Tests, Lab04Tests, Lab05Tests, Lab06Tests, Lab07Tests,
+    Lab08Tests, Lab09Tests, Lab10Tests, Lab11Tests, Lab12Tests, Lab13Tests, Lab14Tests
+]
+
+
+def create_lab_tests(client: SplunkClient, catalog_dir: str = None) -> List[Any]:
+    """
+    Create one test instance per lab
+
+    Args:
+        client: SplunkClient the labs run their searches on
+        catalog_dir: Read the tests from this catalog directory instead of
+            the Python lab classes (None = lab classes)
+
+    Returns:
+        Lab test instances in lab order (labs 1-14)
+    """
+    if catalog_dir:
+        return TestCatalog(catalog_dir).create_lab_tests(client)
+    return [lab_class(client) for lab_class in LAB_TEST_CLASSES]
+
 
 class CourseTestRunner:
     """Main test runner for all course labs"""
 
-    def __init__(self, host="localhost", port=8089, username="admin", password="changeme"):
+    def __init__(self, host="localhost", port=8089, username="admin", password="changeme",
+                 cache_file=None, cache_max_age=None, job_ttl=60, keep_jobs=False,
+                 use_governor=False, max_concurrent_searches=None,
+                 token_file=None, pool_size=10, max_retries=3, keep_alive=True,
+                 workers=None, share_searches=False, auto_head=None, fetch_all_results=False,
+                 perf_gate=None, perf_tolerance=1.5, reports_dir=REPORTS_DIR,
+                 save_reports=True, job_stats=False, profile_jobs=False, use_summaries=False,
+                 catalog_dir=None, schedule="lpt", incremental=False, force=False,
+                 state_file=DEFAULT_STATE_FILE, hosts=None):
         """
         Initialize test runner
 
@@ -44,9 +99,92 @@ class CourseTestRunner:
             port: Splunk management port
             username: Splunk username
             password: Splunk password
+            cache_file: SQLite file for cached search results (None = no cache)
+            cache_max_age: Maximum age in seconds of reused cache entries
+            job_ttl: Seconds finished search jobs are kept on the server
+            keep_jobs: Keep search jobs after their results are fetched
+            use_governor: Admit searches through a server-aware SearchGovernor
+            max_concurrent_searches: Explicit governor limit (capped by the server limit)
+            token_file: File used to reuse the session key across processes
+            pool_size: HTTP connection pool size
+            max_retries: Retries for failed connections and idempotent requests
+            keep_alive: Reuse HTTP connections between requests
+            workers: Tests run concurrently: a number, 'auto' (the server's
+                search quota) or None to run sequentially
+            share_searches: Run identical queries once and post-process
+                shared base searches instead of rescanning raw events
+            auto_head: Append '| head N' to tests without a maximum bound
+            fetch_all_results: Download every result row instead of only
+                the rows the assertions need
+            perf_gate: Check latencies against budgets: 'warn', 'fail' or None
+            perf_tolerance: Learned budget = historical p95 * tolerance
+            reports_dir: Directory where reports are saved and budgets learned
+            save_reports: Save each run's report and add it to the history store
+            job_stats: Record run duration and scan counts of each search job
+            profile_jobs: Record each search job's full performance breakdown
+                (per-command timings, dispatch time, disk usage) and rank
+                the most expensive search commands
+            use_summaries: Set up the summary searches before the tests and
+                run the dashboard and trend tests against the summary index
+            catalog_dir: Run the tests declared in this catalog directory
+                instead of the Python lab classes
+            schedule: Dispatch order with several workers: 'lpt' (longest
+                first, from the durations in earlier reports) or 'lab'
+            incremental: Reuse the stored results of tests whose query,
+                assertions and input data are unchanged since they passed
+            force: With incremental, run every test and refresh the state
+            state_file: JSON file holding the incremental state
+            hosts: Comma-separated HOST[:PORT[:WORKERS]] list of Splunk
+                instances with identical data; tests are sharded across
+                them and merged into one report (overrides host and port)
         """
-        self.client = SplunkClient(host, port, username, password)
+        result_cache = None
+        if cache_file:
+            result_cache = ResultCache(cache_file, max_age=cache_max_age)
+
+        self.endpoints = parse_hosts(hosts) if hosts else []
+        if self.endpoints:
+            host, port = self.endpoints[0].host, self.endpoints[0].port
+
+        def create_client(host, port, token_file):
+            client = SplunkClient(host, port, username, password, result_cache=result_cache,
+                                  job_ttl=job_ttl, delete_jobs=not keep_jobs,
+                                  token_file=token_file, pool_size=pool_size,
+                                  max_retries=max_retries, keep_alive=keep_alive)
+            client.collect_job_stats = job_stats
+            client.collect_job_profile = profile_jobs
+            # Queries without an index (e.g. Lab 1 keyword searches) read the
+            # course indexes instead of every index on the server
+            client.default_indexes = COURSE_INDEXES
+            return client
+
+        self.client = create_client(host, port, token_file)
+        # One client per instance of the pool, the first being self.client
+        # (the token file holds one session key, so only it reuses one)
+        self.clients = [self.client] + [create_client(endpoint.host, endpoint.port, None)
+                                        for endpoint in self.endpoints[1:]]
+        self.profile_jobs = profile_jobs
+        self.use_summaries = use_summaries
+        self.catalog_dir = catalog_dir
+        self.schedule = schedule
+        self.incremental = incremental
+        self.force = force
+        self.state_file = state_file
+        self.summary_status = None
         self.validator = DataValidator(self.client)
+        self.reports_dir = reports_dir
+        self.save_reports = save_reports
+        self.workers = workers
+        self.share_searches = share_searches
+        self.auto_head = auto_head
+        self.fetch_all_results = fetch_all_results
+        self.latency_gate = None
+        if perf_gate:
+            budgets = LatencyBudgets(load_report_history(reports_dir), tolerance=perf_tolerance)
+            self.latency_gate = LatencyGate(budgets, mode=perf_gate)
+        self.use_governor = (use_governor or max_concurrent_searches is not None
+                             or str(workers).lower() == "auto")
+        self.max_concurrent_searches = max_concurrent_searches
         self.results: List[Dict[str, Any]] = []
         self.start_time = None
         self.end_time = None
@@ -72,12 +210,67 @@ class CourseTestRunner:
             return False
 
         print("✓ Successfully connected to Splunk\n")
+
+        for client in self.clients[1:]:
+            print(f"Connecting to Splunk at {client.host}:{client.port}...")
+            if not client.login():
+                print(f"✗ Failed to connect to {client.host}:{client.port}")
+                return False
+        if len(self.clients) > 1:
+            print(f"✓ Connected to {len(self.clients)} Splunk instances\n")
+
+        if self.use_governor:
+            for client in self.clients:
+                client.governor = SearchGovernor.from_server(
+                    client, override=self.max_concurrent_searches
+                )
+                limits = client.governor.limits
+                print(f"Search concurrency limit on {client.host}:{client.port}: {limits['effective']} "
+                      f"(role quota: {limits.get('user_quota')}, system: {limits.get('system_limit')})")
+            print()
+
         return True
 
-    def validate_data(self) -> bool:
+    def check_shard_data(self) -> bool:
+        """
+        Check that every instance of the pool holds the same course data
+
+        Compares per-index event counts (tstats) with the first instance.
+
+        Returns:
+            True if all counts match
+        """
+        if len(self.clients) < 2:
+            return True
+
+        expected = self.client.get_index_counts() or {}
+        expected = {index: expected.get(index, 0) for index in COURSE_INDEXES}
+        matching = True
+        for client in self.clients[1:]:
+            counts = client.get_index_counts() or {}
+            differing = [f"{index} {counts.get(index, 0)}/{want}" for index, want in expected.items()
+                         if counts.get(index, 0) != want]
+            if differing:
+                matching = False
+                print(f"⚠ {client.host}:{client.port} data differs from "
+                      f"{self.client.host}:{self.client.port}: {', '.join(differing)}")
+        if matching:
+            print(f"✓ All {len(self.clients)} instances hold the same course data")
+        return matching
+
+    def release_jobs(self):
+        """Delete the search jobs created on every instance"""
+        for client in self.clients:
+            if client.delete_jobs:
+                client.release_jobs()
+
+    def validate_data(self, full_scan: bool = False) -> bool:
         """
         Validate that required data exists
 
+        Args:
+            full_scan: Count events with full index scans instead of tstats
+
         Returns:
             True if all required data exists
         """
@@ -85,7 +278,7 @@ class CourseTestRunner:
         print("Validating Course Data")
         print("=" * 80)
 
-        validations = self.validator.validate_all_course_data()
+        validations = self.validator.validate_all_course_data(full_scan=full_scan)
 
         # Print index validations
         print("\nIndex Validation:")
@@ -115,35 +308,35 @@ class CourseTestRunner:
 
         return validations["overall_valid"]
 
-    def run_lab_tests(self, lab_number: int = None):
+    def run_lab_tests(self, lab_number: int = None, ready_indexes=None, indexes=None,
+                      progress=None, test_filter=None):
         """
         Run tests for specific lab or all labs
 
         Args:
             lab_number: Specific lab to test (1-14), or None for all
+            ready_indexes: Optional queue.Queue of index names that become
+                searchable while data is still loading; each test starts once
+                the indexes it reads are ready (None at the end of loading)
+            indexes: Names of the indexes being loaded (with ready_indexes)
+            progress: Optional callable receiving a progress event dictionary
+                as each test completes
+            test_filter: Keys (QueryTest.key) of the tests to run, e.g. the
+                failed tests of an earlier run (None = all)
         """
-        # Define all lab test classes
-        lab_tests = [
-            Lab01Tests(self.client),
-            Lab02Tests(self.client),
-            Lab03Tests(self.client),
-            Lab04Tests(self.client),
-            Lab05Tests(self.client),
-            Lab06Tests(self.client),
-            Lab07Tests(self.client),
-            Lab08Tests(self.client),
-            Lab09Tests(self.client),
-            Lab10Tests(self.client),
-            Lab11Tests(self.client),
-            Lab12Tests(self.client),
-            Lab13Tests(self.client),
-            Lab14Tests(self.client)
-        ]
+        lab_tests = create_lab_tests(self.client, self.catalog_dir)
+
+        for lab_test in lab_tests:
+            lab_test.auto_head = self.auto_head
+            lab_test.latency_gate = self.latency_gate
+            lab_test.use_summaries = self.use_summaries
+            if self.fetch_all_results:
+                lab_test.fetch_limit = 0
 
         # Filter if specific lab requested
         if lab_number is not None:
             if 1 <= lab_number <= 14:
-                lab_tests = [lab_tests[lab_number - 1]]
+                lab_tests = [lab for lab in lab_tests if lab.lab_number == lab_number]
             else:
                 print(f"Error: Invalid lab number {lab_number}. Must be 1-14.")
                 return
@@ -154,13 +347,113 @@ class CourseTestRunner:
         print("Running Lab Tests")
         print("=" * 80)
 
-        # Run all tests
-        for lab_test in lab_tests:
-            result = lab_test.run_all_tests()
-            self.results.append(result)
+        workers = resolve_worker_count(self.workers, self.client.governor)
+        sharded = len(self.clients) > 1 and ready_indexes is None
+        if len(self.clients) > 1 and not sharded:
+            print("ℹ Tests run on the first instance only while data is loading")
+
+        if (sharded or workers > 1 or self.share_searches or ready_indexes is not None
+                or progress is not None or test_filter is not None or self.incremental):
+            # Run independent tests concurrently, reported in lab/test order
+            scheduler = None
+            if self.schedule == "lpt" and (workers > 1 or sharded):
+                scheduler = LPTScheduler(load_report_history(self.reports_dir,
+                                                             limit=SCHEDULE_HISTORY_RUNS))
+            incremental = None
+            if self.incremental:
+                incremental = IncrementalSelector(self.client, self.state_file, force=self.force)
+
+            if sharded:
+                executor = ShardedExecutor(self.create_shards(), share_searches=self.share_searches,
+                                           progress=progress, scheduler=scheduler,
+                                           incremental=incremental)
+            else:
+                if workers > self.client.pool_size:
+                    self.client.configure_pool(workers, self.client.max_retries,
+                                               self.client.keep_alive)
+                planner = QueryPlanner(self.client) if self.share_searches else None
+                executor = ParallelTestExecutor(max_workers=workers, planner=planner,
+                                                progress=progress, scheduler=scheduler,
+                                                incremental=incremental)
+            self.results.extend(executor.run(lab_tests, ready_indexes=ready_indexes,
+                                             indexes=indexes, test_filter=test_filter))
+        else:
+            # Run all tests
+            for lab_test in lab_tests:
+                result = lab_test.run_all_tests()
+                self.results.append(result)
 
         self.end_time = datetime.now()
 
+    def create_shards(self) -> List[Shard]:
+        """
+        Build one shard per instance of the pool
+
+        Each instance runs the worker count given in --hosts, or else the
+        --workers setting resolved against its own governor.
+
+        Returns:
+            Shards in --hosts order
+        """
+        shards = []
+        for endpoint, client in zip(self.endpoints, self.clients):
+            workers = endpoint.workers or resolve_worker_count(self.workers, client.governor)
+            if workers > client.pool_size:
+                client.configure_pool(workers, client.max_retries, client.keep_alive)
+            shards.append(Shard(client, workers, endpoint.label))
+        return shards
+
+    def prepare_summaries(self) -> bool:
+        """
+        Create, backfill and wait for the summary searches
+
+        Tests fall back to their raw-event queries if any summary could
+        not be completed.
+
+        Returns:
+            True if every summary is complete
+        """
+        print("\n" + "=" * 80)
+        print("Preparing Summary Searches")
+        print("=" * 80)
+
+        if len(self.clients) == 1:
+            self.summary_status = SummaryBootstrap(self.client).bootstrap()
+        else:
+            # Every instance answers summary queries, so each needs its summaries
+            statuses = {}
+            for client in self.clients:
+                print(f"{client.host}:{client.port}:")
+                statuses[f"{client.host}:{client.port}"] = SummaryBootstrap(client).bootstrap()
+            self.summary_status = {"success": all(status["success"] for status in statuses.values()),
+                                   "hosts": statuses}
+        if not self.summary_status["success"]:
+            print("⚠ Summaries incomplete; running the tests against raw events")
+            self.use_summaries = False
+        return self.summary_status["success"]
+
+    def cleanup_jobs(self, min_age: float = DEFAULT_ORPHAN_AGE) -> bool:
+        """
+        Reap orphaned search jobs left behind by earlier test runs
+
+        Args:
+            min_age: Seconds after creation a job of another run counts as orphaned
+
+        Returns:
+            True if connection successful
+        """
+        if not self.connect():
+            return False
+
+        print("Cleaning up orphaned course test search jobs...")
+        for client in self.clients:
+            summary = client.cleanup_jobs(min_age=min_age)
+            host = f" on {client.host}:{client.port}" if len(self.clients) > 1 else ""
+            print(f"✓ Found {summary['found']} jobs{host}: "
+                  f"{summary['cancelled']} cancelled, {summary['deleted']} deleted, "
+                  f"{summary['skipped']} recent or in use kept")
+        return True
+
     def print_overall_summary(self):
         """Print overall test summary"""
         print("\n" + "=" * 80)
@@ -181,6 +474,17 @@ class CourseTestRunner:
         print(f"Overall Pass Rate: {(total_passed / total_tests * 100) if total_tests > 0 else 0:.1f}%")
         print(f"Execution Time: {duration:.2f} seconds")
 
+        if self.client.result_cache is not None:
+            cache_stats = self.client.result_cache.get_stats()
+            print(f"Result Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.1f}% hit rate)")
+
+        if self.client.governor is not None:
+            metrics = self.client.governor.get_metrics()
+            wait = metrics["queue_wait"]
+            print(f"Search Queue: limit {metrics['max_concurrent']}, max depth {metrics['max_queue_depth']}, "
+                  f"wait p50 {wait['p50']:.2f}s / p95 {wait['p95']:.2f}s / max {wait['max']:.2f}s")
+
         # Lab-by-lab summary
         print("\n" + "-" * 80)
         print(f"{'Lab':<6} {'Name':<40} {'Tests':<8} {'Passed':<8} {'Failed':<8} {'Rate':<8}")
@@ -198,6 +502,14 @@ class CourseTestRunner:
 
         print("=" * 80)
 
+        if self.latency_gate is not None:
+            self.latency_gate.print_report()
+
+        if self.profile_jobs:
+            print_hotspots(rank_command_hotspots(
+                test for lab in self.results for test in lab["results"]
+            ))
+
         # Failed tests detail
         failed_tests = [
             (r["lab_number"], r["lab_name"], test)
@@ -224,8 +536,15 @@ class CourseTestRunner:
         """
         Prepare test results report data
 
+        When report saving is enabled the report is written as JSON and
+        added to the history store in the reports directory.
+
         Args:
-            filename: Unused parameter (kept for compatibility)
+            filename: JSON file to write (default:
+                <reports_dir>/test_results_<start time>.json)
+
+        Returns:
+            Report dictionary
         """
         report = {
             "timestamp": self.start_time.isoformat(),
@@ -238,9 +557,75 @@ class CourseTestRunner:
             "lab_results": self.results
         }
 
+        if self.latency_gate is not None:
+            report["performance"] = self.latency_gate.get_report()
+
+        if len(self.clients) > 1:
+            report["hosts"] = [endpoint.label for endpoint in self.endpoints]
+
+        if self.summary_status is not None:
+            report["summaries"] = self.summary_status
+
+        if self.profile_jobs:
+            report["command_hotspots"] = rank_command_hotspots(
+                test for lab in self.results for test in lab["results"]
+            )
+
+        if self.save_reports:
+            if filename is None:
+                filename = os.path.join(
+                    self.reports_dir, f"test_results_{self.start_time.strftime('%Y%m%d_%H%M%S')}.json"
+                )
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+                with open(filename, "w", encoding="utf-8") as f:
+                    json.dump(report, f, indent=2)
+
+                store = ReportStore(os.path.join(self.reports_dir, HISTORY_FILE))
+                store.ingest_report(report, source=os.path.basename(filename))
+                store.close()
+            except Exception as e:
+                print(f"  ⚠ Failed to save report: {e}")
+
         return report
 
-    def run(self, lab_number: int = None, skip_validation: bool = False, json_output: bool = False):
+    def run_suite(self, lab_number: int = None, ready_indexes=None, indexes=None,
+                  progress=None, test_filter=None) -> Dict[str, Any]:
+        """
+        Run the lab tests in-process and return the report
+
+        Used by orchestrators (run_full_validation.py) instead of starting
+        this script and parsing its JSON output. The caller connects first.
+
+        Args:
+            lab_number: Specific lab to test, or None for all
+            ready_indexes: Optional queue of indexes becoming ready while
+                data is loading (see run_lab_tests)
+            indexes: Names of the indexes being loaded
+            progress: Optional callable receiving per-test progress events
+            test_filter: Keys of the tests to run (None = all)
+
+        Returns:
+            Report dictionary, as returned by save_report()
+        """
+        if self.use_summaries:
+            if ready_indexes is None:
+                self.prepare_summaries()
+            else:
+                # Summaries can only be backfilled once all data is loaded
+                print("ℹ Summaries skipped while data is still loading")
+                self.use_summaries = False
+
+        try:
+            self.run_lab_tests(lab_number, ready_indexes=ready_indexes, indexes=indexes,
+                               progress=progress, test_filter=test_filter)
+        finally:
+            self.release_jobs()
+
+        return self.save_report()
+
+    def run(self, lab_number: int = None, skip_validation: bool = False, json_output: bool = False,
+            full_scan_validation: bool = False):
         """
         Run complete test suite
 
@@ -248,6 +633,7 @@ class CourseTestRunner:
             lab_number: Specific lab to test, or None for all
             skip_validation: Skip data validation
             json_output: Output results as JSON to stdout
+            full_scan_validation: Validate index counts with full scans
         """
         # Connect to Splunk
         if not self.connect():
@@ -255,10 +641,17 @@ class CourseTestRunner:
 
         # Validate data
         if not skip_validation:
-            self.validate_data()
+            self.validate_data(full_scan=full_scan_validation)
+            self.check_shard_data()
+
+        if self.use_summaries:
+            self.prepare_summaries()
 
         # Run tests
-        self.run_lab_tests(lab_number)
+        try:
+            self.run_lab_tests(lab_number)
+        finally:
+            self.release_jobs()
 
         # Print summary or JSON
         if json_output:
@@ -270,6 +663,10 @@ class CourseTestRunner:
         else:
             # Print human-readable summary
             self.print_overall_summary()
+            self.save_report()
+
+        if self.latency_gate is not None and self.latency_gate.mode == "fail":
+            return self.latency_gate.get_report()["passed"]
 
         return True
 
@@ -300,6 +697,11 @@ def main():
         default="changeme",
         help="Splunk password (default: changeme)"
     )
+    parser.add_argument(
+        "--hosts",
+        help="Shard the tests across several Splunk instances with identical data: "
+             "comma-separated HOST[:PORT[:WORKERS]] (overrides --host/--port)"
+    )
     parser.add_argument(
         "--lab",
         type=int,
@@ -311,27 +713,262 @@ def main():
         action="store_true",
         help="Skip data validation check"
     )
+    parser.add_argument(
+        "--full-scan-validation",
+        action="store_true",
+        help="Validate index counts by scanning raw events instead of using tstats"
+    )
     parser.add_argument(
         "--json-output",
         action="store_true",
         help="Output results as JSON to stdout (for automation)"
     )
 
+    parser.add_argument(
+        "--result-cache",
+        nargs="?",
+        const=DEFAULT_CACHE_FILE,
+        metavar="FILE",
+        help="Reuse search results while index data is unchanged "
+             f"(default file: {DEFAULT_CACHE_FILE})"
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        help="Maximum age in seconds of reused cache entries (default: no limit)"
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip tests whose query, assertions and index data are unchanged "
+             "since they last passed, reusing their stored results"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="With --incremental, run every test and refresh the stored results"
+    )
+    parser.add_argument(
+        "--state-file",
+        default=DEFAULT_STATE_FILE,
+        help=f"Incremental state file (default: {DEFAULT_STATE_FILE})"
+    )
+
+    parser.add_argument(
+        "--job-ttl",
+        type=int,
+        default=60,
+        help="Seconds finished search jobs are kept on the server (default: 60)"
+    )
+    parser.add_argument(
+        "--keep-jobs",
+        action="store_true",
+        help="Keep search jobs after their results are fetched (for inspection)"
+    )
+    parser.add_argument(
+        "--workers",
+        help="Run tests concurrently on N workers, or 'auto' to match the "
+             "server's concurrent-search quota (default: sequential)"
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=["lpt", "lab"],
+        default="lpt",
+        help="Order of concurrent tests: 'lpt' starts the longest first, using "
+             "durations from earlier reports (default), 'lab' keeps lab order"
+    )
+    parser.add_argument(
+        "--share-searches",
+        action="store_true",
+        help="Run identical queries once and post-process shared base "
+             "searches (loadjob, storing only the fields their tests read) instead of "
+             "rescanning raw events"
+    )
+    parser.add_argument(
+        "--auto-head",
+        type=int,
+        metavar="N",
+        help="Append '| head N' to tests without a maximum result bound"
+    )
+    parser.add_argument(
+        "--fetch-all-results",
+        action="store_true",
+        help="Download every result row (default: only the rows the checks need)"
+    )
+    parser.add_argument(
+        "--perf-gate",
+        choices=["warn", "fail"],
+        help="Check test latencies against declared or learned budgets"
+    )
+    parser.add_argument(
+        "--perf-tolerance",
+        type=float,
+        default=1.5,
+        help="Learned budget = historical p95 x tolerance (default: 1.5)"
+    )
+    parser.add_argument(
+        "--reports-dir",
+        default=REPORTS_DIR,
+        help=f"Directory of earlier JSON reports (default: {REPORTS_DIR})"
+    )
+    parser.add_argument(
+        "--no-save-report",
+        action="store_true",
+        help="Do not save the report or add it to the history store"
+    )
+    parser.add_argument(
+        "--job-stats",
+        action="store_true",
+        help="Record each search job's run duration and scan count in the report"
+    )
+    parser.add_argument(
+        "--profile-jobs",
+        action="store_true",
+        help="Record each search job's per-command timings and rank the most "
+             "expensive search commands"
+    )
+    parser.add_argument(
+        "--use-summaries",
+        action="store_true",
+        help="Create and backfill scheduled summary searches, then run the "
+             "timechart tests against the summary index"
+    )
+    parser.add_argument(
+        "--catalog",
+        nargs="?",
+        const=CATALOG_DIR,
+        metavar="DIR",
+        help=f"Run the tests declared in a JSON catalog (default: {CATALOG_DIR})"
+    )
+    parser.add_argument(
+        "--export-catalog",
+        nargs="?",
+        const=CATALOG_DIR,
+        metavar="DIR",
+        help="Write the lab tests as a JSON catalog, then exit"
+    )
+    parser.add_argument(
+        "--check-catalog",
+        nargs="?",
+        const=CATALOG_DIR,
+        metavar="DIR",
+        help="Check that a JSON catalog matches the lab classes, then exit "
+             "(non-zero if it has drifted)"
+    )
+    parser.add_argument(
+        "--governor",
+        action="store_true",
+        help="Queue searches to stay within the server's concurrent-search limit"
+    )
+    parser.add_argument(
+        "--max-concurrent-searches",
+        type=int,
+        help="Concurrent-search limit for the governor (capped by the server limit)"
+    )
+    parser.add_argument(
+        "--token-file",
+        help="Reuse the Splunk session key stored in this file across runs"
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="HTTP connection pool size (default: 10)"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retries for failed connections and idempotent requests (default: 3)"
+    )
+    parser.add_argument(
+        "--no-keep-alive",
+        action="store_true",
+        help="Open a new HTTP connection for every request"
+    )
+    parser.add_argument(
+        "--cleanup-jobs",
+        action="store_true",
+        help="Cancel and delete orphaned search jobs from earlier runs, then exit"
+    )
+    parser.add_argument(
+        "--orphan-age",
+        type=int,
+        default=DEFAULT_ORPHAN_AGE,
+        help=f"Seconds after creation a job of another run counts as orphaned "
+             f"(default: {DEFAULT_ORPHAN_AGE})"
+    )
+
     args = parser.parse_args()
+    if args.hosts:
+        try:
+            parse_hosts(args.hosts)
+        except ValueError as e:
+            parser.error(str(e))
 
     # Create and run test runner
     runner = CourseTestRunner(
         host=args.host,
         port=args.port,
         username=args.username,
-        password=args.password
+        password=args.password,
+        cache_file=args.result_cache,
+        cache_max_age=args.cache_max_age,
+        job_ttl=args.job_ttl,
+        keep_jobs=args.keep_jobs,
+        use_governor=args.governor,
+        max_concurrent_searches=args.max_concurrent_searches,
+        token_file=args.token_file,
+        pool_size=args.pool_size,
+        max_retries=args.max_retries,
+        keep_alive=not args.no_keep_alive,
+        workers=args.workers,
+        share_searches=args.share_searches,
+        auto_head=args.auto_head,
+        fetch_all_results=args.fetch_all_results,
+        perf_gate=args.perf_gate,
+        perf_tolerance=args.perf_tolerance,
+        reports_dir=args.reports_dir,
+        save_reports=not args.no_save_report,
+        job_stats=args.job_stats,
+        profile_jobs=args.profile_jobs,
+        use_summaries=args.use_summaries,
+        catalog_dir=args.catalog,
+        schedule=args.schedule,
+        incremental=args.incremental,
+        force=args.force,
+        state_file=args.state_file,
+        hosts=args.hosts
     )
 
+    if args.export_catalog:
+        exported = export_catalog(create_lab_tests(runner.client), args.export_catalog)
+        print(f"✓ Exported {exported['tests']} tests from {exported['labs']} labs "
+              f"to {exported['directory']}")
+        sys.exit(0)
+
+    if args.check_catalog or args.catalog:
+        parity = check_catalog(create_lab_tests(runner.client), args.check_catalog or args.catalog)
+        if parity["success"]:
+            print("✓ Catalog matches the lab classes")
+        else:
+            print(f"{'✗' if args.check_catalog else '⚠'} Catalog differs from the lab classes "
+                  f"(re-export with --export-catalog):")
+            for difference in parity["differences"]:
+                print(f"  {difference}")
+        if args.check_catalog:
+            sys.exit(0 if parity["success"] else 1)
+
     try:
+        if args.cleanup_jobs:
+            sys.exit(0 if runner.cleanup_jobs(args.orphan_age) else 1)
+
         success = runner.run(
             lab_number=args.lab,
             skip_validation=args.skip_validation,
-            json_output=args.json_output
+            json_output=args.json_output,
+            full_scan_validation=args.full_scan_validation
         )
         sys.exit(0 if success else 1)
 
@@ -5,27 +5,112 @@ Coordinates: Start Splunk → Generate Data → Load Data → Run Tests
 Retries until 100% passing or max attempts reached
 """
 
+import argparse
+import copy
 import subprocess
 import sys
 import os
+import queue
+import threading
 import time
-import json
 from datetime import datetime
 import platform
+import urllib3
+
+# Disable SSL warnings for testing
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Add utils and the data scripts to path
+COURSE_TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(COURSE_TESTS_DIR), "scripts")
+DATA_DIR = os.path.join(os.path.dirname(COURSE_TESTS_DIR), "data")
+sys.path.append(COURSE_TESTS_DIR)
+sys.path.append(SCRIPTS_DIR)
+
+from utils.splunk_client import SplunkClient
+from utils.latency import make_test_key
+from utils.snapshot import IndexSnapshots, snapshot_key
+from run_all_tests import CourseTestRunner
+import generate_sample_data
+import load_data_to_splunk
 
 # Configuration
 MAX_ATTEMPTS = 3
+SPLUNK_HOST = "localhost"
+SPLUNK_PORT = 8089
+SPLUNK_USERNAME = "admin"
 SPLUNK_PASSWORD = "password"
 SPLUNK_CONTAINER = "splunk-course"
+SPLUNK_IMAGE = "splunk/splunk:latest"
+SNAPSHOT_DIR = os.path.join(COURSE_TESTS_DIR, ".cache", "snapshots")
+SNAPSHOT_MAX_AGE = 20    # Hours a snapshot is reused (loaded events are stamped with the load time)
+READY_TIMEOUT = 300      # Seconds to wait for splunkd to come up
+RECHECK_TIMEOUT = 60     # Seconds a running Splunk gets to answer before a rebuild
+INDEXING_TIMEOUT = 300   # Seconds to wait for loaded events to become searchable
+TEST_WORKERS = "auto"    # Concurrent tests (auto = the server's search quota)
+
+def merge_reports(report, rerun):
+    """
+    Replace the results of rerun tests in a report
+
+    Args:
+        report: Report of the full test run
+        rerun: Report of a run of some of its tests
+
+    Returns:
+        New report with the rerun results and recomputed pass counts
+    """
+    merged = copy.deepcopy(report)
+    replacements = {
+        make_test_key(test["lab_number"], test["test_name"]): test
+        for lab in rerun.get("lab_results", []) for test in lab["results"]
+    }
+
+    for lab in merged["lab_results"]:
+        lab["results"] = [
+            replacements.get(make_test_key(test["lab_number"], test["test_name"]), test)
+            for test in lab["results"]
+        ]
+        lab["passed"] = sum(1 for test in lab["results"] if test["passed"])
+        lab["failed"] = lab["total_tests"] - lab["passed"]
+        lab["pass_rate"] = (lab["passed"] / lab["total_tests"] * 100) if lab["total_tests"] else 0
+
+    merged["total_passed"] = sum(lab["passed"] for lab in merged["lab_results"])
+    merged["total_failed"] = sum(lab["failed"] for lab in merged["lab_results"])
+    merged["overall_pass_rate"] = (
+        merged["total_passed"] / merged["total_tests"] * 100 if merged["total_tests"] else 0
+    )
+    return merged
+
 
 class ValidationRunner:
-    def __init__(self):
+    def __init__(self, snapshot_dir=None, seed=None, snapshot_max_age=SNAPSHOT_MAX_AGE):
+        """
+        Initialize validation runner
+
+        Args:
+            snapshot_dir: Directory for index snapshots; when set, the first
+                successful load is saved and later runs restore it instead
+                of re-ingesting (None = always load through HEC)
+            seed: Data generator seed (None = unseeded data)
+            snapshot_max_age: Hours a snapshot stays usable
+        """
         self.is_windows = platform.system() == "Windows"
         self.script_ext = ".bat" if self.is_windows else ".sh"
         self.python_cmd = "python" if self.is_windows else "python3"
-        self.scripts_dir = "../scripts"
+        self.scripts_dir = SCRIPTS_DIR
         self.attempt = 0
         self.results = []
+        self.client = None
+        self.expected_counts = {}
+        self.events = []
+        self.report = None
+        self.seed = seed
+        self.data_loaded = False
+        self.snapshots = None
+        if snapshot_dir:
+            self.snapshots = IndexSnapshots(snapshot_dir, SPLUNK_CONTAINER, SPLUNK_IMAGE,
+                                            max_age=snapshot_max_age * 3600)
 
     def run_command(self, command, cwd=None, shell=False):
         """Run a shell command and return success status"""
@@ -98,77 +183,299 @@ class ValidationRunner:
         """Generate sample data"""
         self.print_step(2, 5, "Generating Sample Data")
 
-        # Check if data already exists
-        data_dir = "../data"
-        if os.path.exists(data_dir) and len(os.listdir(data_dir)) > 0:
-            print("ℹ Sample data already exists, skipping generation")
-            return True
-
-        script = "generate_sample_data.py"
-        success, stdout, stderr = self.run_command([self.python_cmd, script], cwd=self.scripts_dir)
+        # Check if data already exists (generated with the requested seed)
+        if os.path.exists(DATA_DIR) and len(os.listdir(DATA_DIR)) > 0:
+            manifest = generate_sample_data.read_manifest(DATA_DIR)
+            if self.seed is None or (manifest and manifest.get("seed") == self.seed):
+                print("ℹ Sample data already exists, skipping generation")
+                return True
 
-        if success:
-            print("✓ Data generated successfully")
-            return True
-        else:
+        try:
+            generate_sample_data.generate_all(output_dir=DATA_DIR, progress=self.on_progress,
+                                              seed=self.seed)
+        except Exception as e:
             print(f"✗ Failed to generate data")
-            if stderr:
-                print(f"Error: {stderr[:200]}")
+            print(f"Error: {str(e)[:200]}")
             return False
 
-    def load_data(self):
-        """Load data into Splunk"""
-        self.print_step(3, 5, "Loading Data into Splunk")
-
-        # Wait for Splunk to be fully ready (Splunk takes time to start all services)
-        print("Waiting for Splunk to fully initialize (60 seconds)...")
-        time.sleep(60)
+        print("✓ Data generated successfully")
+        return True
+
+    def wait_for_splunk(self):
+        """Wait until splunkd answers REST requests and accepts our login"""
+        print("Waiting for Splunk to be ready...")
+        self.client = SplunkClient(SPLUNK_HOST, SPLUNK_PORT, SPLUNK_USERNAME, SPLUNK_PASSWORD)
+        return self.client.wait_until_ready(timeout=READY_TIMEOUT)
+
+    def load_data(self, loaded_indexes=None, only_indexes=None, clean=False):
+        """
+        Load data into Splunk
+
+        Args:
+            loaded_indexes: Optional queue.Queue receiving each index name as
+                soon as its file has been sent, then None when loading ends
+            only_indexes: Load just these indexes instead of all of them
+            clean: Delete the indexes' existing events first
+        """
+        def on_loaded(event):
+            self.on_progress(event)
+            index = event["index"]
+            self.expected_counts[index] = self.expected_counts.get(index, 0) + event["events"]
+            if loaded_indexes is not None:
+                loaded_indexes.put(index)
+
+        if only_indexes is None:
+            self.expected_counts = {}
+        else:
+            for index in only_indexes:
+                self.expected_counts.pop(index, None)
 
-        script = "load_data_to_splunk.py"
-        success, stdout, stderr = self.run_command([self.python_cmd, script], cwd=self.scripts_dir)
+        try:
+            result = load_data_to_splunk.load_all(
+                username=SPLUNK_USERNAME, password=SPLUNK_PASSWORD,
+                data_dir=DATA_DIR, progress=on_loaded,
+                only_indexes=only_indexes, clean=clean
+            )
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        finally:
+            if loaded_indexes is not None:
+                loaded_indexes.put(None)
 
-        if success:
+        if result["success"]:
             print("✓ Data loaded successfully")
             return True
         else:
             print(f"✗ Failed to load data")
-            if stderr:
-                print(f"Error: {stderr[:200]}")
+            if result.get("error"):
+                print(f"Error: {result['error'][:200]}")
             return False
 
-    def wait_for_data_indexed(self):
-        """Wait for data to be fully indexed"""
-        print("\nWaiting for data to be indexed (30 seconds)...")
-        time.sleep(30)
+    def watch_indexing(self, loaded_indexes, ready_indexes):
+        """
+        Pass each loaded index on once its events are searchable
 
-    def run_tests(self):
-        """Run comprehensive test suite"""
-        self.print_step(4, 5, "Running Comprehensive Test Suite")
+        Args:
+            loaded_indexes: Queue of index names whose data has been sent
+            ready_indexes: Queue receiving each index once its tstats count
+                reaches the number of events sent (None when done)
+        """
+        try:
+            while True:
+                index = loaded_indexes.get()
+                if index is None:
+                    break
+                status = self.client.wait_for_index_counts(
+                    {index: self.expected_counts[index]}, timeout=INDEXING_TIMEOUT,
+                    check_queues=False
+                )
+                if status["success"]:
+                    print(f"  → index={index} searchable after {status['elapsed']:.0f}s, starting its tests")
+                else:
+                    print(f"  ⚠ index={index} still incomplete, starting its tests anyway")
+                ready_indexes.put(index)
+        finally:
+            ready_indexes.put(None)
+
+    def load_and_test(self, clean=False):
+        """
+        Load data and run the test suite, overlapping the two
+
+        Tests start as soon as every index they read is searchable, while
+        the remaining indexes are still loading.
+
+        Args:
+            clean: Delete existing events in the indexes before loading
+
+        Returns:
+            Test result dictionary (see run_tests), or None if Splunk is not ready
+        """
+        self.print_step(3, 5, "Loading Data and Running Tests")
+
+        # Probe instead of sleeping a fixed time (Splunk takes time to start all services)
+        if not self.wait_for_splunk():
+            print("✗ Splunk did not become ready")
+            return None
+
+        loaded_indexes = queue.Queue()
+        ready_indexes = queue.Queue()
+        load_status = {}
 
-        test_script = "run_all_tests.py"
-        success, stdout, stderr = self.run_command(
-            [self.python_cmd, test_script, "--password", SPLUNK_PASSWORD, "--skip-validation", "--json-output"]
+        loader = threading.Thread(
+            target=lambda: load_status.update(success=self.load_data(loaded_indexes, clean=clean)),
+            name="data-loader"
         )
+        watcher = threading.Thread(target=self.watch_indexing,
+                                   args=(loaded_indexes, ready_indexes), name="index-watcher")
+        loader.start()
+        watcher.start()
+
+        indexes = [index["name"] for index in load_data_to_splunk.INDEXES]
+        result = self.run_tests(ready_indexes=ready_indexes, indexes=indexes)
+
+        loader.join()
+        watcher.join()
+        self.data_loaded = load_status.get("success", False)
+        if not self.data_loaded:
+            result["success"] = False
+        return result
+
+    def get_snapshot_key(self):
+        """Key of the current data set, or None if it cannot be identified"""
+        manifest = generate_sample_data.read_manifest(DATA_DIR)
+        if manifest is None:
+            return None
+        return snapshot_key(manifest, [load_data_to_splunk.INDEXES, load_data_to_splunk.DATA_FILES])
+
+    def restore_snapshot(self, key):
+        """
+        Restore the indexes from a snapshot instead of loading them
+
+        Args:
+            key: Snapshot key of the current data set
+
+        Returns:
+            True if the snapshot was restored and every index count matches,
+            False if restoring failed, None if there is no usable snapshot
+        """
+        metadata = self.snapshots.find(key)
+        if metadata is None:
+            print(f"ℹ No usable snapshot for this data set ({key}), loading through HEC")
+            return None
+
+        self.print_step(3, 5, "Restoring Index Snapshot")
+        if not self.snapshots.restore(key) or not self.wait_for_splunk():
+            return False
+
+        self.expected_counts = dict(metadata["counts"])
+        status = self.client.wait_for_index_counts(self.expected_counts, timeout=60)
+        if not status["success"]:
+            print("⚠ Restored index counts do not match the snapshot, reloading data")
+            return False
+        return True
+
+    def save_snapshot(self, key):
+        """Save the loaded indexes once all their events are indexed"""
+        status = self.client.wait_for_index_counts(self.expected_counts, timeout=INDEXING_TIMEOUT)
+        if not status["success"]:
+            print("⚠ Indexing incomplete, not saving a snapshot")
+            return False
+
+        indexes = [index["name"] for index in load_data_to_splunk.INDEXES]
+        manifest = generate_sample_data.read_manifest(DATA_DIR)
+        if not self.snapshots.save(key, indexes, dict(self.expected_counts), manifest):
+            return False
+        return self.wait_for_splunk()
+
+    def run_tests(self, ready_indexes=None, indexes=None, test_filter=None):
+        """
+        Run comprehensive test suite in-process
+
+        Args:
+            ready_indexes: Optional queue of indexes becoming searchable while
+                data is still loading
+            indexes: Names of the indexes being loaded
+            test_filter: Keys of the tests to rerun; their results are merged
+                into the report of the last full run (None = run all tests)
+
+        Returns:
+            Dictionary with success and the report data
+        """
+        self.print_step(4, 5, "Running Comprehensive Test Suite")
+
+        # Reruns are merged into the full report rather than saved on their own
+        runner = CourseTestRunner(password=SPLUNK_PASSWORD, workers=TEST_WORKERS,
+                                  save_reports=test_filter is None)
+        if not runner.connect():
+            return {"success": False, "data": None}
 
-        # Parse JSON from stdout
-        result_data = None
         try:
-            # Extract JSON between markers
-            if "__JSON_REPORT_START__" in stdout and "__JSON_REPORT_END__" in stdout:
-                start_marker = "__JSON_REPORT_START__"
-                end_marker = "__JSON_REPORT_END__"
-                start_idx = stdout.index(start_marker) + len(start_marker)
-                end_idx = stdout.index(end_marker)
-                json_str = stdout[start_idx:end_idx].strip()
-                result_data = json.loads(json_str)
+            report = runner.run_suite(ready_indexes=ready_indexes, indexes=indexes,
+                                      progress=self.on_progress, test_filter=test_filter)
         except Exception as e:
-            print(f"  ⚠ Failed to parse JSON output: {e}")
+            print(f"  ⚠ Test run failed: {e}")
+            return {"success": False, "data": None}
+
+        if test_filter is not None and self.report is not None:
+            report = merge_reports(self.report, report)
+        self.report = report
 
         return {
-            "success": success,
-            "data": result_data,
-            "stdout": stdout
+            "success": report["total_failed"] == 0,
+            "data": report
+        }
+
+    def plan_retry(self, result):
+        """
+        Pick the cheapest retry that can fix a failed attempt
+
+        - rebuild: Splunk is unreachable or no report was produced
+        - reload: some indexes hold the wrong number of events; they are
+          reloaded and the failed tests rerun
+        - rerun: the data is intact; only the failed tests are rerun
+
+        Args:
+            result: Result of the last attempt (None if it did not get to testing)
+
+        Returns:
+            Dictionary with action, indexes to reload and keys of failed tests
+        """
+        rebuild = {"action": "rebuild", "indexes": [], "tests": set()}
+        if not result or not result.get("data") or self.client is None:
+            return rebuild
+
+        print("\nChecking Splunk before retrying...")
+        if not self.client.wait_until_ready(timeout=RECHECK_TIMEOUT, settle=0):
+            return rebuild
+
+        counts = self.client.get_index_counts(method="tstats")
+        if counts is None:
+            return rebuild
+
+        wrong = [index for index, expected in self.expected_counts.items()
+                 if counts.get(index, 0) != expected]
+        for index in wrong:
+            print(f"  ⚠ index={index}: {counts.get(index, 0)} events, expected {self.expected_counts[index]}")
+
+        failed = {
+            make_test_key(test["lab_number"], test["test_name"])
+            for lab in result["data"]["lab_results"] for test in lab["results"]
+            if not test["passed"]
         }
+        return {"action": "reload" if wrong else "rerun", "indexes": wrong, "tests": failed}
+
+    def retry_failures(self, plan):
+        """
+        Reload the indexes with wrong counts, then rerun the failed tests
+
+        Args:
+            plan: Retry plan from plan_retry()
+
+        Returns:
+            Test result dictionary (see run_tests)
+        """
+        if plan["indexes"]:
+            self.print_step(3, 5, f"Reloading {len(plan['indexes'])} indexes: {', '.join(plan['indexes'])}")
+            if not self.load_data(only_indexes=plan["indexes"], clean=True):
+                return {"success": False, "data": None}
+
+            expected = {index: self.expected_counts.get(index, 0) for index in plan["indexes"]}
+            status = self.client.wait_for_index_counts(expected, timeout=INDEXING_TIMEOUT)
+            if not status["success"]:
+                print(f"⚠ Indexing incomplete after {status['elapsed']:.0f}s, rerunning tests anyway")
+
+        print(f"\nRerunning {len(plan['tests'])} failed tests...")
+        return self.run_tests(test_filter=plan["tests"])
+
+    def is_passing(self, result):
+        """Check whether an attempt reached a 100% pass rate"""
+        return bool(result and result.get("data")
+                    and result["data"].get("overall_pass_rate", 0) == 100.0)
+
+    def on_progress(self, event):
+        """Record a progress event from the generation, loading or test stages"""
+        event = dict(event, time=time.time())
+        self.events.append(event)
 
     def generate_final_report(self, final_result):
         """Generate comprehensive final report"""
@@ -208,29 +515,49 @@ class ValidationRunner:
         else:
             print(f"✗ VALIDATION FAILED AFTER {MAX_ATTEMPTS} ATTEMPTS")
 
-    def run_validation_attempt(self):
-        """Run single validation attempt"""
-        self.attempt += 1
-
-        self.print_header(f"VALIDATION ATTEMPT {self.attempt}/{MAX_ATTEMPTS}")
-
-        # Step 1: Start Splunk
-        if not self.start_splunk():
-            return None
+    def run_validation_attempt(self, plan=None):
+        """
+        Run single validation attempt
 
-        # Step 2: Generate data
-        if not self.generate_data():
-            return None
+        Args:
+            plan: Retry plan from plan_retry() (None = full build)
 
-        # Step 3: Load data
-        if not self.load_data():
-            return None
+        Returns:
+            Test result dictionary, or None if the attempt did not get to testing
+        """
+        self.attempt += 1
 
-        # Wait for indexing
-        self.wait_for_data_indexed()
+        self.print_header(f"VALIDATION ATTEMPT {self.attempt}/{MAX_ATTEMPTS}")
 
-        # Step 4: Run tests
-        result = self.run_tests()
+        if plan is not None:
+            result = self.retry_failures(plan)
+        else:
+            self.report = None
+
+            # Step 1: Start Splunk
+            if not self.start_splunk():
+                return None
+
+            # Step 2: Generate data
+            if not self.generate_data():
+                return None
+
+            key = self.get_snapshot_key() if self.snapshots else None
+            if self.snapshots and key is None:
+                print("ℹ Data has no generator manifest, snapshots disabled for this run")
+
+            restored = self.restore_snapshot(key) if key else None
+            if restored:
+                # Step 4: Run tests on the restored indexes
+                result = self.run_tests()
+            else:
+                # Step 3/4: Load data and run tests as each index becomes searchable
+                # (indexes from a snapshot that failed verification are cleaned first)
+                result = self.load_and_test(clean=restored is False)
+                if result is None:
+                    return None
+                if key and self.data_loaded:
+                    self.save_snapshot(key)
 
         # Store result
         self.results.append({
@@ -241,15 +568,13 @@ class ValidationRunner:
         })
 
         # Check if 100% passing
-        if result["data"]:
-            pass_rate = result["data"].get("overall_pass_rate", 0)
-            if pass_rate == 100.0:
-                print(f"\n✓ 100% PASS RATE ACHIEVED!")
-                return result
+        if self.is_passing(result):
+            print(f"\n✓ 100% PASS RATE ACHIEVED!")
+            return result
 
         print(f"\n⚠ Pass rate: {result['data'].get('overall_pass_rate', 0) if result['data'] else 0:.1f}%")
 
-        return None
+        return result
 
     def run(self):
         """Main execution flow"""
@@ -260,7 +585,7 @@ class ValidationRunner:
         print("  2. Generate sample data (~450,000 events)")
         print("  3. Load data into Splunk (6 indexes)")
         print("  4. Run comprehensive test suite (72+ tests)")
-        print("  5. Retry until 100% pass rate or max attempts")
+        print("  5. Retry failures (rerun failed tests, reload bad indexes, or rebuild)")
         print()
         print(f"Max Attempts: {MAX_ATTEMPTS}")
         print(f"Splunk Password: {SPLUNK_PASSWORD}")
@@ -273,17 +598,21 @@ class ValidationRunner:
 
         # Run validation attempts
         final_result = None
+        plan = None
         for _ in range(MAX_ATTEMPTS):
-            result = self.run_validation_attempt()
+            result = self.run_validation_attempt(plan)
 
-            if result:
+            if self.is_passing(result):
                 final_result = result
                 break
 
             if self.attempt < MAX_ATTEMPTS:
-                print(f"\nRetrying in 10 seconds...")
-                time.sleep(10)
-                self.cleanup_splunk()
+                plan = self.plan_retry(result)
+                if plan["action"] == "rebuild":
+                    print(f"\nRebuilding the Splunk environment in 10 seconds...")
+                    time.sleep(10)
+                    self.cleanup_splunk()
+                    plan = None
 
         # Generate final report
         self.generate_final_report(final_result)
@@ -298,8 +627,34 @@ class ValidationRunner:
             return 1
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Splunk Advanced Course - Full Validation Runner"
+    )
+    parser.add_argument(
+        "--snapshot",
+        nargs="?",
+        const=SNAPSHOT_DIR,
+        metavar="DIR",
+        help="Save the first successful load as an index snapshot and restore it "
+             f"in later runs (default directory: {SNAPSHOT_DIR})"
+    )
+    parser.add_argument(
+        "--snapshot-max-age",
+        type=float,
+        default=SNAPSHOT_MAX_AGE,
+        help=f"Hours a snapshot is reused (default: {SNAPSHOT_MAX_AGE}; events carry "
+             "their load time, so older snapshots fall out of the tests' time ranges)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Data generator seed (makes the data set, and its snapshot, reproducible)"
+    )
+    args = parser.parse_args()
+
     try:
-        runner = ValidationRunner()
+        runner = ValidationRunner(snapshot_dir=args.snapshot, seed=args.seed,
+                                  snapshot_max_age=args.snapshot_max_age)
         exit_code = runner.run()
         sys.exit(exit_code)
 
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Splunk Advanced Course - Classroom Load Simulation
+Replays the lab queries as concurrent students to size shared instances
+"""
+
+import sys
+import os
+import json
+import argparse
+from datetime import datetime
+import urllib3
+
+# Disable SSL warnings for testing
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Add utils to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.splunk_client import SplunkClient
+from utils.concurrency import SearchGovernor
+from utils.parallel import collect_tests
+from utils.load_simulator import ClassroomSimulator
+from run_all_tests import REPORTS_DIR, create_lab_tests
+
+
+def parse_levels(value: str):
+    """Parse a comma-separated list of class sizes"""
+    try:
+        levels = sorted({int(item) for item in value.split(",") if item.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid class sizes: '{value}'")
+    if not levels or levels[0] < 1:
+        raise argparse.ArgumentTypeError("class sizes must be positive integers")
+    return levels
+
+
+def print_report(report):
+    """Print the saturation summary and the slowest queries at the largest level"""
+    print("\n" + "=" * 80)
+    print("CLASSROOM LOAD SUMMARY")
+    print("=" * 80)
+    print(f"{'Students':<10} {'Queries':<9} {'p50':>8} {'p95':>8} {'p99':>8} "
+          f"{'Queue p95':>10} {'Failed':>8}")
+    print("-" * 80)
+    for level in report["levels"]:
+        latency = level["latency"]
+        print(f"{level['students']:<10} {level['queries']:<9} {latency['p50']:>7.2f}s "
+              f"{latency['p95']:>7.2f}s {latency['p99']:>7.2f}s "
+              f"{level['queue_wait']['p95']:>9.2f}s {level['failure_rate']:>7.1f}%")
+
+    print("-" * 80)
+    threshold = report["p95_threshold"]
+    if report["saturated_at"] is not None:
+        print(f"⚠ p95 latency exceeded {threshold:.1f}s at {report['saturated_at']} students")
+    else:
+        print(f"✓ p95 latency stayed within {threshold:.1f}s at every class size tested")
+    if report["max_students"] is not None:
+        print(f"  Largest class within the threshold: {report['max_students']} students")
+
+    if report["levels"]:
+        level = report["levels"][-1]
+        slowest = sorted(level["per_query"].items(),
+                         key=lambda item: item[1]["latency"]["p95"], reverse=True)[:10]
+        print(f"\nSlowest queries at {level['students']} students (p95):")
+        for key, stats in slowest:
+            print(f"  {stats['latency']['p95']:>7.2f}s  {key}"
+                  + (f"  ({stats['failures']} failed)" if stats["failures"] else ""))
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Splunk Advanced Course - Classroom Load Simulation"
+    )
+    parser.add_argument(
+        "--host",
+        default="localhost",
+        help="Splunk host (default: localhost)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8089,
+        help="Splunk management port (default: 8089)"
+    )
+    parser.add_argument(
+        "--username",
+        default="admin",
+        help="Splunk username (default: admin)"
+    )
+    parser.add_argument(
+        "--password",
+        default="changeme",
+        help="Splunk password (default: changeme)"
+    )
+    parser.add_argument(
+        "--students",
+        type=parse_levels,
+        default=[5, 10, 20, 30, 40],
+        help="Comma-separated class sizes to simulate, smallest first (default: 5,10,20,30,40)"
+    )
+    parser.add_argument(
+        "--labs",
+        help="Comma-separated lab numbers the students work through (default: all)"
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=30.0,
+        help="Mean seconds between a student's queries (default: 30)"
+    )
+    parser.add_argument(
+        "--ramp-up",
+        type=float,
+        default=60.0,
+        help="Seconds over which the students start (default: 60)"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="Seconds to run each class size (default: until every student finishes)"
+    )
+    parser.add_argument(
+        "--p95-threshold",
+        type=float,
+        default=10.0,
+        help="p95 query latency in seconds that counts as saturated (default: 10)"
+    )
+    parser.add_argument(
+        "--continue-past-saturation",
+        action="store_true",
+        help="Also run the class sizes above the first saturated one"
+    )
+    parser.add_argument(
+        "--max-concurrent-searches",
+        type=int,
+        help="Search slots modelled by the admission queue (default: server limit)"
+    )
+    parser.add_argument(
+        "--no-governor",
+        action="store_true",
+        help="Submit searches directly and let Splunk queue them (queue waits are not measured)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed for think times"
+    )
+    parser.add_argument(
+        "--output",
+        help=f"JSON report file (default: {REPORTS_DIR}/classroom_<timestamp>.json)"
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("Splunk Advanced Course - Classroom Load Simulation")
+    print("=" * 80)
+
+    client = SplunkClient(args.host, args.port, args.username, args.password,
+                          pool_size=max(10, max(args.students)))
+    print(f"\nConnecting to Splunk at {args.host}:{args.port}...")
+    if not client.login():
+        print("✗ Failed to connect to Splunk")
+        return 1
+    print("✓ Successfully connected to Splunk")
+
+    governor = None
+    if not args.no_governor:
+        governor = SearchGovernor.from_server(client, override=args.max_concurrent_searches)
+        limits = governor.limits
+        print(f"Search concurrency limit: {limits['effective']} "
+              f"(role quota: {limits.get('user_quota')}, system: {limits.get('system_limit')})")
+
+    lab_tests = create_lab_tests(client)
+    if args.labs:
+        selected = {int(item) for item in args.labs.split(",") if item.strip()}
+        lab_tests = [lab for lab in lab_tests if lab.lab_number in selected]
+    catalog = collect_tests(lab_tests)
+    print(f"Query catalog: {len(catalog)} queries from {len(lab_tests)} labs")
+
+    simulator = ClassroomSimulator(client, catalog, think_time=args.think_time,
+                                   ramp_up=args.ramp_up, duration=args.duration,
+                                   governor=governor, seed=args.seed)
+    try:
+        report = simulator.find_saturation(args.students, args.p95_threshold,
+                                           stop_at_saturation=not args.continue_past_saturation)
+    except KeyboardInterrupt:
+        print("\n\nSimulation cancelled by user.")
+        return 1
+    finally:
+        client.release_jobs()
+
+    report["timestamp"] = datetime.now().isoformat()
+    print_report(report)
+
+    filename = args.output or os.path.join(
+        REPORTS_DIR, f"classroom_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport saved to {filename}")
+
+    return 0 if report["saturated_at"] is None else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
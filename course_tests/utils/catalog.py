@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Declarative Test Catalog for Course Testing
+Lab tests as JSON data, loaded lab by lab and turned into test objects
+"""
+
+import os
+import re
+import json
+from typing import Dict, List, Any, Optional
+
+from .splunk_client import SplunkClient
+from .result_cache import extract_indexes
+from .spl_advisor import analyze_query
+from .parallel import collect_tests
+from .test_base import LabTestBase, QueryTest, SpeedupTest, COURSE_INDEXES
+
+
+# Default catalog location (course_tests/catalog)
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "catalog")
+
+# File listing the labs of a catalog
+INDEX_FILE = "index.json"
+
+CATALOG_VERSION = 1
+
+# Expected cost of a test, cheapest first
+COST_CLASSES = ("light", "medium", "heavy")
+
+LOOKUP_PATTERN = re.compile(r"\|\s*(?:inputlookup|lookup)\s+(?:\w+=\S+\s+)*([\w.\-]+)", re.IGNORECASE)
+RELATIVE_TIME_PATTERN = re.compile(r"^-(\d+)([smhdw])")
+HOURS_PER_UNIT = {"s": 1 / 3600, "m": 1 / 60, "h": 1, "d": 24, "w": 168}
+
+# Catalog field -> QueryTest attribute, for fields copied as they are
+QUERY_FIELDS = {
+    "query": "query",
+    "earliest_time": "earliest_time",
+    "latest_time": "latest_time",
+    "min_results": "expected_min_results",
+    "max_results": "expected_max_results",
+    "required_fields": "required_fields",
+    "latency_budget": "latency_budget",
+    "summary_query": "summary_query",
+}
+SPEEDUP_FIELDS = ("naive_query", "min_speedup", "min_scan_ratio", "repeat",
+                  "same_results", "setup_query", "ready_query", "summaries")
+
+
+def _range_hours(earliest_time: str) -> float:
+    """Hours covered by a relative earliest time ('0' = all time)"""
+    if earliest_time in ("0", ""):
+        return float("inf")
+    match = RELATIVE_TIME_PATTERN.match(earliest_time)
+    if not match:
+        return 24.0
+    return int(match.group(1)) * HOURS_PER_UNIT[match.group(2)]
+
+
+def estimate_cost_class(spec: QueryTest) -> str:
+    """
+    Estimate how expensive a test is before running it
+
+    Paired benchmarks and queries with high-severity advisor findings
+    (join, transaction, all indexes) are 'heavy'; event searches over
+    more than a day are 'medium'; the rest are 'light'.
+
+    Args:
+        spec: Test parameters
+
+    Returns:
+        One of COST_CLASSES
+    """
+    if isinstance(spec, SpeedupTest):
+        return "heavy"
+    if any(finding["severity"] == "high" for finding in analyze_query(spec.query)["findings"]):
+        return "heavy"
+    if not spec.query.strip().startswith("|") and _range_hours(spec.earliest_time) > 24:
+        return "medium"
+    return "light"
+
+
+def find_dependencies(spec: QueryTest) -> Dict[str, List[str]]:
+    """
+    Find the indexes and lookups a test reads
+
+    Args:
+        spec: Test parameters
+
+    Returns:
+        Dictionary with sorted 'indexes' and 'lookups'
+    """
+    queries = [spec.query]
+    if isinstance(spec, SpeedupTest):
+        queries += [query for query in (spec.naive_query, spec.setup_query) if query]
+
+    indexes, lookups = set(), set()
+    for query in queries:
+        found = extract_indexes(query)
+        if not found and not query.strip().startswith("|"):
+            # Queries naming no index read the default course indexes
+            found = COURSE_INDEXES
+        indexes.update(found)
+        lookups.update(LOOKUP_PATTERN.findall(query))
+
+    return {"indexes": sorted(indexes), "lookups": sorted(lookups)}
+
+
+def spec_to_entry(spec: QueryTest) -> Dict[str, Any]:
+    """
+    Convert a test into its catalog entry
+
+    Fields left at None are omitted.
+
+    Args:
+        spec: Test parameters
+
+    Returns:
+        Catalog entry dictionary
+    """
+    entry = {"name": spec.test_name, "type": "speedup" if isinstance(spec, SpeedupTest) else "query"}
+    for field, attribute in QUERY_FIELDS.items():
+        entry[field] = getattr(spec, attribute)
+    if isinstance(spec, SpeedupTest):
+        for field in SPEEDUP_FIELDS:
+            entry[field] = getattr(spec, field)
+    entry["cost_class"] = spec.cost_class or estimate_cost_class(spec)
+    entry["depends_on"] = spec.depends_on or find_dependencies(spec)
+    return {field: value for field, value in entry.items() if value is not None}
+
+
+def entry_to_spec(entry: Dict[str, Any], lab_number: int) -> QueryTest:
+    """
+    Convert a catalog entry into a test
+
+    Args:
+        entry: Catalog entry dictionary
+        lab_number: Lab the test belongs to
+
+    Returns:
+        QueryTest (or SpeedupTest) carrying the entry's scheduling metadata
+    """
+    if entry.get("type", "query") == "speedup":
+        spec = SpeedupTest(entry["name"], entry["naive_query"], entry["query"], lab_number,
+                           earliest_time=entry.get("earliest_time", "-24h"),
+                           latest_time=entry.get("latest_time", "now"),
+                           **{field: entry[field] for field in SPEEDUP_FIELDS[1:] if field in entry})
+    else:
+        spec = QueryTest(entry["name"], entry["query"], lab_number)
+        for field, attribute in QUERY_FIELDS.items():
+            if field in entry:
+                setattr(spec, attribute, entry[field])
+
+    spec.cost_class = entry.get("cost_class")
+    spec.depends_on = entry.get("depends_on")
+    return spec
+
+
+def export_catalog(lab_tests: List[LabTestBase], directory: str = CATALOG_DIR) -> Dict[str, Any]:
+    """
+    Write the tests of Python lab classes as a catalog
+
+    Args:
+        lab_tests: Lab test instances (their tests are collected, not run)
+        directory: Catalog directory (one file per lab plus the index)
+
+    Returns:
+        Dictionary with success, the number of labs and tests and the directory
+    """
+    os.makedirs(directory, exist_ok=True)
+    index = {"version": CATALOG_VERSION, "labs": []}
+    total = 0
+
+    for lab in lab_tests:
+        entries = [spec_to_entry(test.spec) for test in collect_tests([lab])]
+        filename = f"lab{lab.lab_number:02d}.json"
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            json.dump({"lab_number": lab.lab_number, "lab_name": lab.lab_name,
+                       "tests": entries}, f, indent=2)
+            f.write("\n")
+        index["labs"].append({"lab_number": lab.lab_number, "lab_name": lab.lab_name,
+                              "file": filename, "tests": len(entries)})
+        total += len(entries)
+
+    with open(os.path.join(directory, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+
+    return {"success": True, "labs": len(index["labs"]), "tests": total, "directory": directory}
+
+
+def check_catalog(lab_tests: List[LabTestBase], directory: str = CATALOG_DIR) -> Dict[str, Any]:
+    """
+    Compare a catalog with the tests of the Python lab classes
+
+    The lab classes are the source of truth; a catalog that differs
+    from what export_catalog() would write has drifted.
+
+    Args:
+        lab_tests: Lab test instances (their tests are collected, not run)
+        directory: Catalog directory
+
+    Returns:
+        Dictionary with success and a list of differences
+    """
+    catalog = TestCatalog(directory)
+    try:
+        catalog_labs = {lab["lab_number"]: lab for lab in catalog.labs}
+    except (OSError, ValueError) as e:
+        return {"success": False, "differences": [f"Catalog unreadable: {e}"]}
+
+    differences = []
+    for lab in lab_tests:
+        if lab.lab_number not in catalog_labs:
+            differences.append(f"Lab {lab.lab_number}: missing from the catalog")
+            continue
+        # Round-trip through JSON so tuples and lists compare equal
+        expected = {entry["name"]: entry for entry in json.loads(json.dumps(
+            [spec_to_entry(test.spec) for test in collect_tests([lab])]))}
+        actual = {entry["name"]: entry for entry in catalog.load_lab(lab.lab_number)["tests"]}
+
+        for name in sorted(expected.keys() - actual.keys()):
+            differences.append(f"Lab {lab.lab_number}: '{name}' missing from the catalog")
+        for name in sorted(actual.keys() - expected.keys()):
+            differences.append(f"Lab {lab.lab_number}: '{name}' not in the lab class")
+        for name in sorted(expected.keys() & actual.keys()):
+            fields = sorted(field for field in expected[name].keys() | actual[name].keys()
+                            if expected[name].get(field) != actual[name].get(field))
+            if fields:
+                differences.append(f"Lab {lab.lab_number}: '{name}' differs in {', '.join(fields)}")
+
+    for lab_number in sorted(catalog_labs.keys() - {lab.lab_number for lab in lab_tests}):
+        differences.append(f"Lab {lab_number}: not in the lab classes")
+
+    return {"success": not differences, "differences": differences}
+
+
+class TestCatalog:
+    """A catalog directory whose lab files are read only when a lab is run"""
+
+    def __init__(self, directory: str = CATALOG_DIR):
+        """
+        Args:
+            directory: Catalog directory containing index.json
+        """
+        self.directory = directory
+        self._index: Optional[Dict[str, Any]] = None
+        self._labs: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def labs(self) -> List[Dict[str, Any]]:
+        """Lab entries of the index (lab_number, lab_name, file, tests)"""
+        if self._index is None:
+            with open(os.path.join(self.directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+            if self._index.get("version") != CATALOG_VERSION:
+                raise ValueError(f"Unsupported catalog version {self._index.get('version')} "
+                                 f"in {self.directory}")
+        return self._index["labs"]
+
+    def load_lab(self, lab_number: int) -> Dict[str, Any]:
+        """
+        Read one lab's file (cached after the first read)
+
+        Returns:
+            Dictionary with lab_number, lab_name and the test entries
+        """
+        if lab_number not in self._labs:
+            lab = next((lab for lab in self.labs if lab["lab_number"] == lab_number), None)
+            if lab is None:
+                raise KeyError(f"Lab {lab_number} is not in the catalog")
+            with open(os.path.join(self.directory, lab["file"]), "r", encoding="utf-8") as f:
+                self._labs[lab_number] = json.load(f)
+        return self._labs[lab_number]
+
+    def create_lab_tests(self, client: SplunkClient) -> List["CatalogLab"]:
+        """
+        Create one test instance per catalog lab, without reading the lab files
+
+        Returns:
+            CatalogLab instances in catalog order
+        """
+        return [CatalogLab(client, self, lab["lab_number"], lab["lab_name"]) for lab in self.labs]
+
+
+class CatalogLab(LabTestBase):
+    """Lab whose tests come from a catalog file instead of Python methods"""
+
+    def __init__(self, client: SplunkClient, catalog: TestCatalog, lab_number: int, lab_name: str):
+        super().__init__(client, lab_number, lab_name)
+        self.catalog = catalog
+
+    def run_all_tests(self):
+        """Run (or collect) every test of the lab's catalog file"""
+        print(f"\nRunning Lab {self.lab_number} Tests: {self.lab_name}")
+        print("=" * 70)
+
+        for entry in self.catalog.load_lab(self.lab_number)["tests"]:
+            result = self.submit_test(entry_to_spec(entry, self.lab_number))
+            self.add_result(result)
+
+        self.print_summary()
+        return self.get_summary()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Columnar Search Results for Course Testing
+Converts search results into typed NumPy columns for vectorized analysis
+"""
+
+import math
+import sys
+from typing import Dict, List, Optional, Any
+
+from .metrics import percentile
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for columnar results
+    np = None
+
+
+def _require_numpy():
+    """Raise a helpful error when NumPy is not installed"""
+    if np is None:
+        raise ImportError("Columnar results require NumPy: pip install numpy")
+
+
+def _to_float(value) -> float:
+    """Convert a single value to float (NaN if not numeric)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class CategoricalColumn:
+    """String column stored as integer codes into a table of interned values"""
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self):
+        """Return the column as an object array of strings (None for missing)"""
+        values = np.empty(len(self.codes), dtype=object)
+        present = self.codes >= 0
+        values[present] = self.categories[self.codes[present]]
+        return values
+
+
+class ColumnarResults:
+    """
+    Search results stored column by column
+
+    Numeric fields become float64 arrays (NaN for missing values), fields
+    with few distinct values become CategoricalColumn, and everything else
+    (free text, multivalue fields) stays an object array of interned strings.
+    Numeric fields also keep their original strings for value_counts().
+    """
+
+    def __init__(self, columns: Dict[str, Any], row_count: int,
+                 raw: Optional[Dict[str, Any]] = None):
+        _require_numpy()
+        self.columns = columns
+        self.row_count = row_count
+        self.raw = raw or {}
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]],
+                  categorical_ratio: float = 0.5) -> "ColumnarResults":
+        """
+        Build a columnar table from get_results() rows
+
+        Args:
+            rows: List of result dictionaries
+            categorical_ratio: Maximum distinct/total ratio for a string
+                field to be stored as categorical
+
+        Returns:
+            ColumnarResults instance
+        """
+        _require_numpy()
+
+        fields = []
+        seen = set()
+        for row in rows:
+            for field in row:
+                if field not in seen:
+                    seen.add(field)
+                    fields.append(field)
+
+        columns = {}
+        originals = {}
+        for field in fields:
+            raw = np.array([row.get(field) for row in rows], dtype=object)
+            columns[field] = cls._build_column(raw, categorical_ratio)
+            if isinstance(columns[field], np.ndarray) and columns[field].dtype == np.float64:
+                originals[field] = np.array([sys.intern(str(value)) if value is not None else None
+                                             for value in raw], dtype=object)
+
+        return cls(columns, len(rows), originals)
+
+    @staticmethod
+    def _build_column(raw, categorical_ratio: float):
+        """Pick the most compact typed representation for one field"""
+        present = np.array([value is not None for value in raw], dtype=bool)
+        multivalue = any(isinstance(value, list) for value in raw[present])
+
+        if not multivalue:
+            numeric = np.full(len(raw), np.nan)
+            try:
+                numeric[present] = raw[present].astype(np.float64)
+                return numeric
+            except (TypeError, ValueError):
+                pass
+
+        strings = np.array([
+            sys.intern(" ".join(value) if isinstance(value, list) else str(value))
+            if value is not None else None
+            for value in raw
+        ], dtype=object)
+
+        if multivalue or not present.any():
+            return strings
+
+        categories, inverse = np.unique(strings[present].astype(str), return_inverse=True)
+        if len(categories) > max(1, categorical_ratio * present.sum()):
+            return strings
+
+        codes = np.full(len(raw), -1, dtype=np.int32)
+        codes[present] = inverse
+        interned = np.array([sys.intern(str(value)) for value in categories], dtype=object)
+        return CategoricalColumn(codes, interned)
+
+    @property
+    def fields(self) -> List[str]:
+        """Field names in first-seen order"""
+        return list(self.columns)
+
+    def has_fields(self, required_fields: List[str]) -> List[str]:
+        """
+        Check for required fields
+
+        Args:
+            required_fields: Field names that must be present
+
+        Returns:
+            List of missing field names (empty if all are present)
+        """
+        return [field for field in required_fields if field not in self.columns]
+
+    def column(self, field: str):
+        """Return a field as a plain NumPy array (categoricals decoded)"""
+        values = self.columns[field]
+        if isinstance(values, CategoricalColumn):
+            return values.decode()
+        return values
+
+    def to_numeric(self, field: str):
+        """
+        Coerce a field to float64
+
+        Args:
+            field: Field name
+
+        Returns:
+            float64 array with NaN for missing or non-numeric values
+        """
+        if field not in self.columns:
+            return np.full(self.row_count, np.nan)
+
+        values = self.columns[field]
+        if isinstance(values, np.ndarray) and values.dtype == np.float64:
+            return values
+
+        if isinstance(values, CategoricalColumn):
+            lookup = np.array([_to_float(value) for value in values.categories])
+            numeric = np.full(len(values), np.nan)
+            present = values.codes >= 0
+            numeric[present] = lookup[values.codes[present]]
+            return numeric
+
+        return np.array([_to_float(value) for value in values], dtype=np.float64)
+
+    def count(self, field: Optional[str] = None) -> int:
+        """
+        Count rows, or rows where a field has a value
+
+        Args:
+            field: Field name (None = all rows)
+
+        Returns:
+            Number of rows
+        """
+        if field is None:
+            return self.row_count
+        if field not in self.columns:
+            return 0
+
+        values = self.columns[field]
+        if isinstance(values, CategoricalColumn):
+            return int((values.codes >= 0).sum())
+        if values.dtype == np.float64:
+            return int((~np.isnan(values)).sum())
+        return int(sum(1 for value in values if value is not None))
+
+    def min(self, field: str) -> Optional[float]:
+        """Minimum numeric value of a field (None if no numeric values)"""
+        return self._reduce(field, np.nanmin)
+
+    def max(self, field: str) -> Optional[float]:
+        """Maximum numeric value of a field (None if no numeric values)"""
+        return self._reduce(field, np.nanmax)
+
+    def sum(self, field: str) -> Optional[float]:
+        """Sum of numeric values of a field (None if no numeric values)"""
+        return self._reduce(field, np.nansum)
+
+    def mean(self, field: str) -> Optional[float]:
+        """Mean of numeric values of a field (None if no numeric values)"""
+        return self._reduce(field, np.nanmean)
+
+    def percentile(self, field: str, pct: float) -> Optional[float]:
+        """Percentile (0-100) of numeric values of a field"""
+        return self._reduce(field, lambda values: np.nanpercentile(values, pct))
+
+    def value_counts(self, field: str) -> Dict[str, int]:
+        """
+        Count occurrences of each value of a field
+
+        Args:
+            field: Field name
+
+        Returns:
+            Dictionary of value -> count, most frequent first (keyed by the
+            values as returned by Splunk, also for numeric fields)
+        """
+        if field not in self.columns:
+            return {}
+
+        values = self.raw.get(field, self.columns[field])
+        if isinstance(values, CategoricalColumn):
+            counts = np.bincount(values.codes[values.codes >= 0],
+                                 minlength=len(values.categories))
+            labels = values.categories
+        else:
+            present = [value for value in values if value is not None]
+            if not present:
+                return {}
+            labels, counts = np.unique(np.array(present, dtype=str), return_counts=True)
+
+        order = np.argsort(-counts, kind="stable")
+        return {str(labels[i]): int(counts[i]) for i in order if counts[i] > 0}
+
+    def _reduce(self, field: str, func) -> Optional[float]:
+        """Apply a NaN-aware reduction to the numeric form of a field"""
+        values = self.to_numeric(field)
+        if values.size == 0 or np.isnan(values).all():
+            return None
+        return float(func(values))
+
+
+def summarize_fields(rows: List[Dict[str, Any]], fields: List[str],
+                     pct: float = 50) -> Dict[str, float]:
+    """
+    Percentile of numeric fields over result rows
+
+    Values are coerced to numbers; missing and non-numeric values are
+    ignored. A ColumnarResults table is used when NumPy is installed,
+    metrics.percentile otherwise (both interpolate linearly).
+
+    Args:
+        rows: Result dictionaries (e.g. job statistics of repeated runs)
+        fields: Fields to summarize
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Dictionary of field -> percentile (0.0 without numeric values)
+    """
+    if np is not None:
+        table = ColumnarResults.from_rows(rows)
+        summary = {}
+        for field in fields:
+            value = table.percentile(field, pct)
+            summary[field] = value if value is not None else 0.0
+        return summary
+
+    summary = {}
+    for field in fields:
+        values = [_to_float(row.get(field)) for row in rows]
+        summary[field] = percentile([value for value in values if not math.isnan(value)], pct)
+    return summary
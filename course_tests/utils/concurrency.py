@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Search Concurrency Governor for Course Testing
+Keeps search submission within the server's concurrent-search limits
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+from .metrics import summarize_durations
+
+
+class SearchGovernor:
+    """
+    Priority admission queue for search jobs
+
+    At most 'max_concurrent' searches hold a slot at once. Waiting callers
+    are admitted in priority order (lower value first), then in arrival
+    order, so high-priority searches never starve behind a long backlog.
+    """
+
+    def __init__(self, max_concurrent: int):
+        """
+        Initialize governor
+
+        Args:
+            max_concurrent: Number of searches allowed to run at once
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+
+        self.max_concurrent = max_concurrent
+        self.limits: Dict[str, Any] = {"effective": max_concurrent}
+        self._active = 0
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._waits = []
+        self._max_queue_depth = 0
+
+    @classmethod
+    def from_server(cls, client, fallback: int = 4,
+                    override: Optional[int] = None) -> "SearchGovernor":
+        """
+        Create a governor sized from the server's effective limits
+
+        Args:
+            client: Logged-in SplunkClient
+            fallback: Limit used if the server limits cannot be read
+            override: Explicit limit (still capped by the server limit)
+
+        Returns:
+            SearchGovernor instance
+        """
+        limits = client.get_search_limits()
+        effective = limits.get("effective") or fallback
+        if override:
+            effective = min(override, effective) if limits.get("effective") else override
+
+        governor = cls(effective)
+        governor.limits = dict(limits, effective=effective)
+        return governor
+
+    def acquire(self, priority: int = 0) -> float:
+        """
+        Block until a search slot is available
+
+        Args:
+            priority: Admission priority (lower values are admitted first)
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        start_time = time.time()
+        ticket = (priority, next(self._sequence))
+
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+
+            while self._active >= self.max_concurrent or self._queue[0] != ticket:
+                self._condition.wait()
+
+            heapq.heappop(self._queue)
+            self._active += 1
+            wait_time = time.time() - start_time
+            self._waits.append(wait_time)
+
+            # The next ticket may also fit if slots remain
+            self._condition.notify_all()
+
+        return wait_time
+
+    def release(self):
+        """Return a search slot to the pool"""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int = 0):
+        """
+        Hold a search slot for the duration of a 'with' block
+
+        Args:
+            priority: Admission priority (lower values are admitted first)
+        """
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get queue-wait metrics
+
+        Returns:
+            Dictionary with limit, active and queued counts, maximum queue
+            depth and a summary of queue waits in seconds
+        """
+        with self._condition:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "limits": dict(self.limits),
+                "active": self._active,
+                "queued": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "queue_wait": summarize_durations(self._waits)
+            }
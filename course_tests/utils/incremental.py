@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Incremental Test Selection for Course Testing
+Skips tests whose query, assertions and input data are unchanged since they passed
+"""
+
+import os
+import json
+import fnmatch
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from .catalog import find_dependencies, spec_to_entry
+from .result_cache import resolve_relative_time
+
+
+STATE_VERSION = 1
+
+
+def hash_test_inputs(spec, now: Optional[float] = None) -> str:
+    """
+    Hash everything that decides a test's outcome
+
+    Covers the query that runs (the summary query when summaries are in
+    use), time range, result bounds, required fields, latency budget and
+    speedup thresholds; the estimated cost class is left out. Relative
+    time ranges are also hashed resolved to the hour, so a stored pass
+    expires as events age out of the test's window.
+
+    Args:
+        spec: QueryTest (or SpeedupTest)
+        now: Reference epoch time (default: the current time)
+
+    Returns:
+        Hex digest
+    """
+    entry = spec_to_entry(spec)
+    entry.pop("cost_class", None)
+    entry.pop("depends_on", None)
+    entry["query"] = spec.query
+    entry["window"] = [resolve_relative_time(spec.earliest_time, now),
+                       resolve_relative_time(spec.latest_time, now)]
+    return hashlib.sha256(json.dumps(entry, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_index_fingerprints(client) -> Optional[Dict[str, str]]:
+    """
+    Fingerprint every index with one tstats search
+
+    Args:
+        client: Logged-in SplunkClient
+
+    Returns:
+        Index name -> '<event count>:<latest _indextime>', or None on failure
+    """
+    result = client.execute_search("| tstats count max(_indextime) as latest where index=* by index",
+                                   earliest_time="0", use_cache=False)
+    if not result["success"]:
+        return None
+    return {row["index"]: f"{row.get('count')}:{row.get('latest')}"
+            for row in result["results"] if row.get("index")}
+
+
+class IncrementalSelector:
+    """Chooses the tests that must run and fills in the others from the state file"""
+
+    def __init__(self, client, state_file: str, force: bool = False):
+        """
+        Args:
+            client: SplunkClient used to fingerprint the indexes and lookups
+            state_file: JSON file holding the last passing result of each test
+            force: Run every test, but still record the results
+        """
+        self.client = client
+        self.state_file = state_file
+        self.force = force
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.index_fingerprints: Optional[Dict[str, str]] = None
+        self.lookup_fingerprints: Dict[str, str] = {}
+        self._fingerprints: Dict[str, tuple] = {}
+        self.load()
+
+    def load(self):
+        """Read the state file (a missing or unreadable file means no state)"""
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == STATE_VERSION:
+                self.state = data.get("tests", {})
+        except (OSError, ValueError):
+            self.state = {}
+
+    def save(self):
+        """Write the state file"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "tests": self.state}, f, indent=2)
+
+    def _lookup_fingerprint(self, lookup: str) -> str:
+        if lookup not in self.lookup_fingerprints:
+            check = self.client.check_lookup(lookup)
+            self.lookup_fingerprints[lookup] = str(check["row_count"]) if check["exists"] else "missing"
+        return self.lookup_fingerprints[lookup]
+
+    def data_fingerprint(self, spec) -> Optional[str]:
+        """
+        Fingerprint the data a test reads
+
+        Index wildcards are expanded against the fingerprinted indexes;
+        lookups are fingerprinted by their row count.
+
+        Returns:
+            Fingerprint string, or None if the indexes could not be read
+        """
+        if self.index_fingerprints is None:
+            return None
+        # The query may read the summary index instead of the declared indexes
+        found = find_dependencies(spec)
+        declared = spec.depends_on or {}
+        patterns = set(found["indexes"]) | set(declared.get("indexes", []))
+        lookups = sorted(set(found["lookups"]) | set(declared.get("lookups", [])))
+
+        indexes = sorted({name for pattern in patterns
+                          for name in self.index_fingerprints if fnmatch.fnmatch(name, pattern)})
+        parts = [f"{name}={self.index_fingerprints[name]}" for name in indexes]
+        parts += [f"lookup:{name}={self._lookup_fingerprint(name)}" for name in lookups]
+        return ";".join(parts)
+
+    def select(self, planned: List[Any]) -> List[Any]:
+        """
+        Fill in unchanged tests from the state file
+
+        Benchmark (serial) tests always run, since they measure the
+        server rather than the query.
+
+        Args:
+            planned: PlannedTest objects
+
+        Returns:
+            The tests that must run
+        """
+        self.index_fingerprints = get_index_fingerprints(self.client)
+        if self.index_fingerprints is None:
+            print("⚠ Could not fingerprint the indexes; running every test")
+
+        to_run = []
+        for test in planned:
+            spec = test.spec
+            fingerprint = (hash_test_inputs(spec), self.data_fingerprint(spec))
+            self._fingerprints[spec.key] = fingerprint
+            stored = self.state.get(spec.key)
+
+            if (self.force or spec.serial or fingerprint[1] is None or stored is None
+                    or (stored["hash"], stored["data"]) != fingerprint):
+                to_run.append(test)
+                continue
+
+            self._restore(test.result, stored)
+
+        reused = len(planned) - len(to_run)
+        print(f"Incremental: {reused} unchanged tests reused, {len(to_run)} to run"
+              + (" (forced)" if self.force else ""))
+        return to_run
+
+    def _restore(self, result, stored: Dict[str, Any]):
+        """Copy a stored passing result into a result object"""
+        saved = stored["result"]
+        result.passed = True
+        result.error_message = None
+        result.query = saved.get("query")
+        result.result_count = saved.get("result_count", 0)
+        result.execution_time = saved.get("execution_time", 0.0)
+        result.details = dict(saved.get("details") or {}, reused={"passed_at": stored["passed_at"]})
+
+    def record(self, executed: List[Any]):
+        """
+        Store the outcome of the tests that ran and save the state file
+
+        Passing tests are stored with their fingerprints; failing tests
+        are removed so they run again next time.
+
+        Args:
+            executed: PlannedTest objects returned by select(), now executed
+        """
+        now = datetime.now().isoformat()
+        for test in executed:
+            key = test.spec.key
+            test_fingerprint, data = self._fingerprints.get(key, (None, None))
+            if test.result.passed and data is not None:
+                self.state[key] = {"hash": test_fingerprint, "data": data,
+                                   "passed_at": now, "result": test.result.to_dict()}
+            else:
+                self.state.pop(key, None)
+        self.save()
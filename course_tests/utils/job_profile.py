@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Search Job Profiles for Course Testing
+Per-command timings from the job inspector and suite-wide hotspot ranking
+"""
+
+from typing import Dict, Iterable, List, Any, Optional
+
+from .latency import make_test_key
+
+
+def _number(value, cast=float):
+    """Convert a REST value that may be missing or a string"""
+    try:
+        return cast(value or 0)
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+def parse_performance(performance: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Normalize a job's 'performance' block (the job inspector's execution costs)
+
+    Args:
+        performance: Dictionary of component name (e.g. 'command.stats',
+            'dispatch.fetch', 'startup.handoff') -> cost values
+
+    Returns:
+        Component name -> duration (seconds), invocations, input_count
+        and output_count
+    """
+    components = {}
+    for name, costs in (performance or {}).items():
+        if not isinstance(costs, dict):
+            continue
+        components[name] = {
+            "duration": _number(costs.get("duration_secs")),
+            "invocations": _number(costs.get("invocations"), int),
+            "input_count": _number(costs.get("input_count"), int),
+            "output_count": _number(costs.get("output_count"), int)
+        }
+    return components
+
+
+def build_job_profile(job_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a test's job profile from get_search_job_info() output
+
+    Commands are the top-level 'command.<name>' components; their nested
+    components (e.g. 'command.search.kv') are part of the command's time
+    and are kept only in 'components'.
+
+    Args:
+        job_info: Job information including the 'performance' block
+
+    Returns:
+        Dictionary with run_duration, startup_time (launching the search
+        process, before any command runs), dispatch_time (the top-level
+        dispatch phases), event/scan/result counts, disk_usage (bytes),
+        per-command costs and all components
+    """
+    components = parse_performance(job_info.get("performance"))
+
+    def top_level(prefix):
+        return {name[len(prefix):]: costs for name, costs in components.items()
+                if name.startswith(prefix) and "." not in name[len(prefix):]}
+
+    return {
+        "run_duration": _number(job_info.get("run_duration")),
+        "startup_time": sum(costs["duration"] for costs in top_level("startup.").values()),
+        "dispatch_time": sum(costs["duration"] for costs in top_level("dispatch.").values()),
+        "event_count": _number(job_info.get("event_count"), int),
+        "scan_count": _number(job_info.get("scan_count"), int),
+        "result_count": _number(job_info.get("result_count"), int),
+        "disk_usage": _number(job_info.get("disk_usage"), int),
+        "commands": top_level("command."),
+        "components": components
+    }
+
+
+def rank_command_hotspots(tests: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rank search commands by the time they took across a suite
+
+    Args:
+        tests: Test result dictionaries (LabTestResult.to_dict()); tests
+            without a 'job_profile' in their details are ignored
+
+    Returns:
+        One dictionary per command with total duration, share of all
+        command time, invocations, events in/out, number of tests using
+        it and the test where it was slowest, most expensive first
+    """
+    commands: Dict[str, Dict[str, Any]] = {}
+    for test in tests:
+        profile = (test.get("details") or {}).get("job_profile")
+        if not profile:
+            continue
+        key = make_test_key(test["lab_number"], test["test_name"])
+        for name, costs in profile.get("commands", {}).items():
+            entry = commands.setdefault(name, {
+                "command": name, "duration": 0.0, "invocations": 0,
+                "input_count": 0, "output_count": 0, "tests": 0,
+                "slowest_test": None, "slowest_duration": 0.0
+            })
+            entry["duration"] += costs["duration"]
+            entry["invocations"] += costs["invocations"]
+            entry["input_count"] += costs["input_count"]
+            entry["output_count"] += costs["output_count"]
+            entry["tests"] += 1
+            if costs["duration"] >= entry["slowest_duration"]:
+                entry["slowest_test"] = key
+                entry["slowest_duration"] = costs["duration"]
+
+    total = sum(entry["duration"] for entry in commands.values())
+    for entry in commands.values():
+        entry["share"] = entry["duration"] / total * 100 if total > 0 else 0.0
+
+    return sorted(commands.values(), key=lambda entry: entry["duration"], reverse=True)
+
+
+def print_hotspots(hotspots: List[Dict[str, Any]], limit: int = 10):
+    """Print the most expensive search commands"""
+    print("\n" + "-" * 80)
+    print("Search Command Hotspots (job inspector time across all tests)")
+    if not hotspots:
+        print("  No job profiles recorded")
+        return
+
+    print(f"  {'Command':<16} {'Time':>9} {'Share':>7} {'Tests':>6} {'Events in':>12}  Slowest in")
+    for entry in hotspots[:limit]:
+        print(f"  {entry['command']:<16} {entry['duration']:>8.2f}s {entry['share']:>6.1f}% "
+              f"{entry['tests']:>6} {entry['input_count']:>12,}  "
+              f"{entry['slowest_test']} ({entry['slowest_duration']:.2f}s)")
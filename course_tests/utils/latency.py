@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Latency Budgets for Course Testing
+Declared or learned per-test latency budgets and regression gating
+"""
+
+import glob
+import json
+import os
+import threading
+from typing import Dict, List, Any, Optional
+
+from .columnar import summarize_fields
+from .metrics import percentile
+
+
+def make_test_key(lab_number: int, test_name: str) -> str:
+    """Identifier of a test across runs (matches QueryTest.key)"""
+    return f"lab{int(lab_number):02d}:{test_name}"
+
+
+def load_report_history(reports_dir: str, limit: Optional[int] = None) -> Dict[str, List[float]]:
+    """
+    Load per-test execution times from saved JSON reports
+
+    Args:
+        reports_dir: Directory containing test_results_*.json files
+        limit: Only read the most recent N reports (None = all)
+
+    Returns:
+        Dictionary of test key -> execution times of passing runs, oldest
+        first (results reused by incremental runs or served from the
+        result cache are not counted)
+    """
+    paths = sorted(glob.glob(os.path.join(reports_dir, "test_results_*.json")))
+    if limit:
+        paths = paths[-limit:]
+
+    history: Dict[str, List[float]] = {}
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        for lab in report.get("lab_results", []):
+            for test in lab.get("results", []):
+                details = test.get("details") or {}
+                if not test.get("passed") or details.get("reused") or details.get("cached"):
+                    continue
+                key = make_test_key(test["lab_number"], test["test_name"])
+                history.setdefault(key, []).append(float(test.get("execution_time", 0)))
+
+    return history
+
+
+class LatencyBudgets:
+    """Per-test latency budgets, declared in the lab files or learned from history"""
+
+    def __init__(self, history: Optional[Dict[str, List[float]]] = None,
+                 tolerance: float = 1.5, min_budget: float = 1.0, min_samples: int = 3):
+        """
+        Initialize budgets
+
+        Args:
+            history: Test key -> earlier execution times
+            tolerance: Learned budget = p95 of history * tolerance
+            min_budget: Smallest learned budget in seconds (absorbs jitter
+                on sub-second searches)
+            min_samples: Earlier runs needed before a budget is learned
+        """
+        self.history = history or {}
+        self.tolerance = tolerance
+        self.min_budget = min_budget
+        self.min_samples = min_samples
+
+    def baseline(self, key: str) -> Optional[float]:
+        """Median earlier execution time for a test (None if too little history)"""
+        samples = self.history.get(key, [])
+        if len(samples) < self.min_samples:
+            return None
+        return percentile(samples, 50)
+
+    def budget_for(self, spec) -> Optional[float]:
+        """
+        Get the latency budget for a test
+
+        Args:
+            spec: QueryTest (its latency_budget wins over learned budgets)
+
+        Returns:
+            Budget in seconds, or None if the test has no budget
+        """
+        if getattr(spec, "latency_budget", None) is not None:
+            return spec.latency_budget
+
+        samples = self.history.get(spec.key, [])
+        if len(samples) < self.min_samples:
+            return None
+        return max(self.min_budget, percentile(samples, 95) * self.tolerance)
+
+
+class LatencyGate:
+    """
+    Checks test latencies against their budgets
+
+    In 'warn' mode violations are reported only; in 'fail' mode the
+    offending tests fail and a suite-wide p50/p95 regression fails the run.
+    """
+
+    def __init__(self, budgets: LatencyBudgets, mode: str = "warn"):
+        if mode not in ("warn", "fail"):
+            raise ValueError("mode must be 'warn' or 'fail'")
+
+        self.budgets = budgets
+        self.mode = mode
+        self.checks: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def check(self, spec, result):
+        """
+        Check one passing test result against its budget
+
+        Args:
+            spec: QueryTest that was run
+            result: LabTestResult (failed in 'fail' mode if over budget)
+        """
+        # A cached result says nothing about the search's latency
+        budget = self.budgets.budget_for(spec)
+        if budget is None or result.details.get("cached"):
+            return
+
+        exceeded = result.execution_time > budget
+        result.details["latency_budget"] = budget
+
+        if exceeded:
+            message = f"Latency budget exceeded: {result.execution_time:.2f}s > {budget:.2f}s"
+            if self.mode == "fail":
+                result.passed = False
+                result.error_message = message
+            else:
+                result.details["latency_warning"] = message
+
+        with self._lock:
+            self.checks.append({
+                "key": spec.key,
+                "execution_time": result.execution_time,
+                "budget": budget,
+                "baseline": self.budgets.baseline(spec.key),
+                "exceeded": exceeded
+            })
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Summarize the run against the budgets and the historical baseline
+
+        Returns:
+            Dictionary with violations and suite-level p50/p95 of current
+            vs. baseline latencies ('regressed' is True if either exceeds
+            baseline * tolerance)
+        """
+        with self._lock:
+            checks = list(self.checks)
+
+        compared = [check for check in checks if check["baseline"] is not None]
+
+        suite = {"tests_compared": len(compared), "regressed": False}
+        for pct in (50, 95):
+            values = summarize_fields(compared, ["execution_time", "baseline"], pct)
+            current_value, baseline_value = values["execution_time"], values["baseline"]
+            suite[f"p{pct}"] = current_value
+            suite[f"baseline_p{pct}"] = baseline_value
+            if baseline_value > 0 and current_value > baseline_value * self.budgets.tolerance:
+                suite["regressed"] = True
+
+        violations = [check for check in checks if check["exceeded"]]
+        return {
+            "mode": self.mode,
+            "tests_checked": len(checks),
+            "violations": violations,
+            "suite": suite,
+            "passed": not violations and not suite["regressed"]
+        }
+
+    def print_report(self):
+        """Print the latency gate summary"""
+        report = self.get_report()
+        suite = report["suite"]
+
+        print("\n" + "-" * 80)
+        print(f"Latency Budgets ({report['mode']} mode): {report['tests_checked']} tests checked, "
+              f"{len(report['violations'])} over budget")
+        if suite["tests_compared"]:
+            print(f"  Suite p50: {suite['p50']:.2f}s (baseline {suite['baseline_p50']:.2f}s)   "
+                  f"p95: {suite['p95']:.2f}s (baseline {suite['baseline_p95']:.2f}s)")
+        if suite["regressed"]:
+            print("  ⚠ Suite latency regressed beyond tolerance")
+        for violation in report["violations"]:
+            print(f"  ⚠ {violation['key']}: {violation['execution_time']:.2f}s "
+                  f"> budget {violation['budget']:.2f}s")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Classroom Load Simulation for Course Testing
+Replays the lab query catalog as N concurrent virtual students
+"""
+
+import random
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+from .metrics import summarize_durations
+from .test_base import LabTestResult
+
+
+def summarize_samples(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize query samples of a simulation
+
+    Args:
+        samples: Sample dictionaries recorded by ClassroomSimulator
+
+    Returns:
+        Dictionary with query, error and failure counts, failure rate and
+        latency / queue-wait summaries (see summarize_durations)
+    """
+    errors = sum(1 for sample in samples if not sample["success"])
+    failures = sum(1 for sample in samples if not sample["passed"])
+    return {
+        "queries": len(samples),
+        "errors": errors,
+        "failures": failures,
+        "failure_rate": failures / len(samples) * 100 if samples else 0.0,
+        "latency": summarize_durations(sample["latency"] for sample in samples),
+        "queue_wait": summarize_durations(sample["queue_wait"] for sample in samples)
+    }
+
+
+class ClassroomSimulator:
+    """
+    Simulates students working through the labs at the same time
+
+    Each virtual student runs the catalog's queries in lab order, pausing
+    for a randomized think time after each one, as a student reading the
+    lab instructions and typing the next search would. Students start
+    spread over a ramp-up period so they are not all on the same query.
+    """
+
+    def __init__(self, client, catalog: List[Any], think_time: float = 30.0,
+                 ramp_up: float = 60.0, duration: Optional[float] = None,
+                 governor=None, seed: Optional[int] = None):
+        """
+        Initialize simulator
+
+        Args:
+            client: Logged-in SplunkClient shared by all students (its
+                connection pool should be at least the largest class size)
+            catalog: PlannedTest objects from collect_tests(), in lab order
+            think_time: Mean pause in seconds between a student's queries
+                (each pause is drawn uniformly from 0.5x to 1.5x the mean)
+            ramp_up: Seconds over which the students start
+            duration: Seconds each concurrency level runs (None = until
+                every student has finished the catalog)
+            governor: SearchGovernor modelling the server's concurrent-search
+                quota; queries wait for a slot and the wait is recorded
+                (None = submit directly and let the server queue them)
+            seed: Random seed for think times (None = not reproducible)
+        """
+        self.client = client
+        self.catalog = catalog
+        self.think_time = think_time
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.governor = governor
+        self.seed = seed
+
+    def run_query(self, test) -> Dict[str, Any]:
+        """
+        Run one catalog query as a student would
+
+        Args:
+            test: PlannedTest to run
+
+        Returns:
+            Sample dictionary with test key, lab, latency (queue wait
+            included), queue wait, and whether the search succeeded and
+            the lab's assertions passed
+        """
+        lab, spec = test.lab, test.spec
+        queue_wait = 0.0
+        start_time = time.time()
+
+        if self.governor is not None:
+            queue_wait = self.governor.acquire()
+        try:
+            search_result = self.client.execute_search(
+                query=lab.prepare_query(spec),
+                earliest_time=spec.earliest_time,
+                latest_time=spec.latest_time,
+                use_cache=False,
+                max_results=lab.fetch_limit
+            )
+        except Exception as e:
+            search_result = {"success": False, "error": f"Exception during query: {e}",
+                             "results": [], "count": 0}
+        finally:
+            if self.governor is not None:
+                self.governor.release()
+        latency = time.time() - start_time
+
+        result = lab.evaluate_search_result(spec, LabTestResult(spec.test_name, spec.lab_number),
+                                            search_result, latency)
+        return {
+            "key": spec.key,
+            "lab_number": spec.lab_number,
+            "latency": latency,
+            "queue_wait": queue_wait,
+            "success": bool(search_result["success"]),
+            "passed": result.passed,
+            "error": result.error_message
+        }
+
+    def _student(self, student_id: int, start_delay: float, stop: threading.Event,
+                 samples: List[Dict[str, Any]], lock: threading.Lock):
+        """Work through the catalog until it is done or the level is stopped"""
+        rng = random.Random(None if self.seed is None else self.seed * 1000 + student_id)
+        if stop.wait(start_delay):
+            return
+
+        for test in self.catalog:
+            sample = self.run_query(test)
+            sample["student"] = student_id
+            with lock:
+                samples.append(sample)
+
+            if stop.wait(self.think_time * rng.uniform(0.5, 1.5)):
+                return
+
+    def run_level(self, students: int) -> Dict[str, Any]:
+        """
+        Simulate one class size
+
+        Args:
+            students: Number of concurrent virtual students
+
+        Returns:
+            Level summary (see summarize_samples) with the number of
+            students, elapsed time, query throughput and per-lab and
+            per-query summaries
+        """
+        samples: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+        stop = threading.Event()
+        delays = [self.ramp_up * i / students for i in range(students)]
+
+        start_time = time.time()
+        threads = [
+            threading.Thread(target=self._student, args=(i + 1, delays[i], stop, samples, lock),
+                             name=f"student-{i + 1}", daemon=True)
+            for i in range(students)
+        ]
+        for thread in threads:
+            thread.start()
+
+        deadline = start_time + self.duration if self.duration else None
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.time()))
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start_time
+
+        by_lab: Dict[int, List[Dict[str, Any]]] = {}
+        by_query: Dict[str, List[Dict[str, Any]]] = {}
+        for sample in samples:
+            by_lab.setdefault(sample["lab_number"], []).append(sample)
+            by_query.setdefault(sample["key"], []).append(sample)
+
+        summary = summarize_samples(samples)
+        summary.update({
+            "students": students,
+            "elapsed": elapsed,
+            "queries_per_minute": len(samples) / elapsed * 60 if elapsed > 0 else 0.0,
+            "labs": {str(lab): summarize_samples(items) for lab, items in sorted(by_lab.items())},
+            "per_query": {key: summarize_samples(items) for key, items in by_query.items()}
+        })
+        return summary
+
+    def find_saturation(self, levels: List[int], p95_threshold: float,
+                        stop_at_saturation: bool = True) -> Dict[str, Any]:
+        """
+        Run increasing class sizes and find where p95 latency passes a threshold
+
+        Args:
+            levels: Numbers of concurrent students to simulate, in order
+            p95_threshold: p95 query latency in seconds students tolerate
+            stop_at_saturation: Skip the larger levels once one exceeds
+                the threshold
+
+        Returns:
+            Dictionary with each level's summary, the threshold, the first
+            level whose p95 latency exceeded it ('saturated_at', None if
+            none did) and the largest level within it ('max_students')
+        """
+        results = []
+        saturated_at = None
+        max_students = None
+
+        for students in sorted(levels):
+            print(f"\nSimulating {students} students...")
+            level = self.run_level(students)
+            results.append(level)
+
+            latency, queue_wait = level["latency"], level["queue_wait"]
+            exceeded = latency["p95"] > p95_threshold
+            status = "⚠" if exceeded else "✓"
+            print(f"{status} {students} students: {level['queries']} queries "
+                  f"({level['queries_per_minute']:.1f}/min), "
+                  f"p50 {latency['p50']:.2f}s, p95 {latency['p95']:.2f}s, "
+                  f"queue wait p95 {queue_wait['p95']:.2f}s, "
+                  f"{level['failure_rate']:.1f}% failed")
+
+            if exceeded:
+                if saturated_at is None:
+                    saturated_at = students
+                if stop_at_saturation:
+                    break
+            elif saturated_at is None:
+                max_students = students
+
+        return {
+            "p95_threshold": p95_threshold,
+            "think_time": self.think_time,
+            "ramp_up": self.ramp_up,
+            "duration": self.duration,
+            "catalog_size": len(self.catalog),
+            "search_limit": self.governor.max_concurrent if self.governor is not None else None,
+            "saturated_at": saturated_at,
+            "max_students": max_students,
+            "levels": results
+        }
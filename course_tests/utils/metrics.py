@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Metric Helpers for Course Testing
+Percentiles and duration summaries shared by runners and reports
+"""
+
+import math
+from typing import Dict, Iterable, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Compute a percentile with linear interpolation
+
+    Args:
+        values: Sample values (need not be sorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Percentile value (0.0 for an empty sample)
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return float(ordered[int(rank)])
+
+    weight = rank - lower
+    return ordered[lower] * (1 - weight) + ordered[upper] * weight
+
+
+def summarize_durations(values: Iterable[float]) -> Dict[str, float]:
+    """
+    Summarize a sample of durations
+
+    Args:
+        values: Durations in seconds
+
+    Returns:
+        Dictionary with count, mean, min, p50, p95, p99 and max
+    """
+    values = list(values)
+    if not values:
+        return {"count": 0, "mean": 0.0, "min": 0.0, "p50": 0.0,
+                "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "min": min(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values)
+    }
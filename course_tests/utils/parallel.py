@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Parallel Lab Test Execution for Course Testing
+Runs independent query tests concurrently and reports them in lab order
+"""
+
+import contextlib
+import fnmatch
+import functools
+import io
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Any, Optional, Set
+
+from .result_cache import extract_indexes
+from .test_base import LabTestBase, LabTestResult, QueryTest
+
+
+class PlannedTest:
+    """A query test collected from a lab, waiting to be executed"""
+
+    def __init__(self, lab: LabTestBase, spec: QueryTest, result: LabTestResult):
+        self.lab = lab
+        self.spec = spec
+        self.result = result
+
+    def execute(self, client=None) -> LabTestResult:
+        """Run the test, filling in its result object"""
+        return self.lab.execute_test(self.spec, self.result, client)
+
+    def depends_on(self, indexes: Iterable[str]) -> Set[str]:
+        """
+        Find the indexes this test reads among a set of indexes
+
+        Index wildcards are expanded against 'indexes'; a query that names
+        no index (default indexes, lookups) depends on all of them. Indexes
+        declared in the test catalog are used instead of parsing the query.
+
+        Args:
+            indexes: Candidate index names (e.g. the indexes being loaded)
+
+        Returns:
+            Subset of 'indexes' the test needs
+        """
+        indexes = set(indexes)
+        declared = (self.spec.depends_on or {}).get("indexes")
+        patterns = declared if declared is not None else extract_indexes(self.spec.query)
+        if not patterns:
+            return indexes
+        return {index for index in indexes
+                if any(fnmatch.fnmatch(index, pattern) for pattern in patterns)}
+
+
+def collect_tests(lab_tests: List[LabTestBase],
+                  test_filter: Optional[Set[str]] = None) -> List[PlannedTest]:
+    """
+    Collect the query tests of each lab without running any searches
+
+    Each lab's run_all_tests() is called with a collector attached, so
+    run_query_test() records the test and returns an empty result that
+    is filled in when the test executes. Console output from the
+    collection pass is discarded.
+
+    Args:
+        lab_tests: Lab test instances
+        test_filter: Keys (QueryTest.key) of the tests to keep; the others
+            are dropped from the plan and from the lab results (None = all)
+
+    Returns:
+        Planned tests in lab/test order
+    """
+    planned = []
+
+    for lab in lab_tests:
+        lab.collector = []
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                lab.run_all_tests()
+        finally:
+            collected, lab.collector = lab.collector, None
+
+        if test_filter is not None:
+            collected = [item for item in collected if item[1].key in test_filter]
+            lab.results = [result for _, _, result in collected]
+
+        planned.extend(PlannedTest(lab, spec, result) for _, spec, result in collected)
+
+    return planned
+
+
+class ParallelTestExecutor:
+    """Runs lab query tests on a bounded pool of worker threads"""
+
+    def __init__(self, max_workers: int = 4, verbose: bool = True, planner=None,
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 scheduler=None, incremental=None):
+        """
+        Initialize executor
+
+        Args:
+            max_workers: Number of tests running at once; keep this at or
+                below the server's concurrent-search quota
+            verbose: Print a line as each test completes
+            planner: Optional QueryPlanner that deduplicates searches and
+                shares base searches between tests
+            progress: Optional callable receiving a progress event dictionary
+                as each test completes ({"stage": "test", "event":
+                "test_completed", "result": ...})
+            scheduler: Optional LPTScheduler; tests (or shared searches)
+                are dispatched longest first instead of in lab order
+            incremental: Optional IncrementalSelector; unchanged tests that
+                passed before are filled in from its state instead of run
+        """
+        self.max_workers = max(1, max_workers)
+        self.verbose = verbose
+        self.planner = planner
+        self.progress = progress
+        self.scheduler = scheduler
+        self.incremental = incremental
+        self._print_lock = threading.Lock()
+
+    def execute(self, planned: List[PlannedTest], client=None) -> List[PlannedTest]:
+        """
+        Execute planned tests concurrently
+
+        Tests marked serial (speedup benchmarks) run afterwards, one at a
+        time, so concurrent searches do not distort their timings.
+
+        Args:
+            planned: Tests to run
+            client: Client to run the searches on (default: each lab's client)
+
+        Returns:
+            The same tests, with their results filled in
+        """
+        serial = [test for test in planned if test.spec.serial]
+        concurrent = [test for test in planned if not test.spec.serial]
+        cost = None
+        if self.scheduler is not None:
+            self._print_schedule(concurrent)
+            concurrent = self.scheduler.order(concurrent)
+            cost = self.scheduler.task_cost
+
+        if self.planner is not None:
+            plan = self.planner.plan(concurrent)
+            if self.verbose:
+                stats = plan.get_stats()
+                print(f"Search plan: {stats['tests']} tests -> {stats['distinct_searches']} searches, "
+                      f"{stats['raw_scans']} raw-event scans "
+                      f"({stats['base_searches']} shared base searches)")
+            tasks = self.planner.tasks(plan, self._report, cost)
+        else:
+            tasks = [functools.partial(self._execute_one, test, client) for test in concurrent]
+
+        self.run_tasks(tasks)
+        self.execute_serial(serial, client)
+        return planned
+
+    def execute_serial(self, planned: List[PlannedTest], client=None):
+        """
+        Run timing-sensitive tests one at a time, with no other test running
+
+        Args:
+            planned: Tests whose spec is marked serial (e.g. speedup benchmarks)
+            client: Client to run the searches on (default: each lab's client)
+        """
+        if planned and self.verbose:
+            print(f"Running {len(planned)} benchmark tests one at a time...")
+        for test in planned:
+            self._execute_one(test, client)
+
+    def run_tasks(self, tasks: List[Any]):
+        """
+        Run tasks on the worker pool
+
+        Each task is a callable that may return follow-up tasks (for example
+        post-process searches that can start once their base search is done);
+        these are scheduled as soon as they are returned.
+
+        Args:
+            tasks: Initial callables
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(task) for task in tasks}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for follow_up in future.result() or []:
+                        pending.add(pool.submit(follow_up))
+
+    def execute_staged(self, planned: List[PlannedTest], ready_indexes,
+                       indexes: Iterable[str], client=None) -> List[PlannedTest]:
+        """
+        Execute planned tests as the indexes they read become ready
+
+        Tests that read none of 'indexes' start at once; the others start
+        as soon as every index they depend on has been reported ready, so
+        testing overlaps with loading the remaining indexes. Searches are
+        not shared between tests in this mode. Serial tests (benchmarks)
+        run one at a time once loading has finished.
+
+        Args:
+            planned: Tests to run
+            ready_indexes: queue.Queue yielding each index name once its data
+                is searchable, then None when no more indexes will arrive
+                (tests still waiting then run regardless)
+            indexes: Names of the indexes that are being loaded
+            client: Client to run the searches on (default: each lab's client)
+
+        Returns:
+            The same tests, with their results filled in
+        """
+        serial = [test for test in planned if test.spec.serial]
+        waiting = [(test, test.depends_on(indexes)) for test in planned if not test.spec.serial]
+        if self.scheduler is not None:
+            self.scheduler.fit(planned)
+        ready: Set[str] = set()
+        finished = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = []
+            while True:
+                runnable = [test for test, needs in waiting if finished or needs <= ready]
+                if self.scheduler is not None:
+                    runnable = self.scheduler.order(runnable)
+                waiting = [(test, needs) for test, needs in waiting
+                           if not finished and not needs <= ready]
+                futures.extend(pool.submit(self._execute_one, test, client) for test in runnable)
+
+                if not waiting:
+                    break
+                index = ready_indexes.get()
+                if index is None:
+                    finished = True
+                else:
+                    ready.add(index)
+
+            for future in futures:
+                future.result()
+
+        # Benchmarks wait for loading to finish so indexing does not skew them
+        while serial and not finished:
+            finished = ready_indexes.get() is None
+
+        self.execute_serial(serial, client)
+        return planned
+
+    def _print_schedule(self, planned: List[PlannedTest]):
+        """Print the predicted makespan of a longest-first schedule"""
+        self.scheduler.fit(planned)
+        if not self.verbose or not planned:
+            return
+        prediction = self.scheduler.predict(planned, self.max_workers)
+        print(f"Schedule: longest first, predicted {prediction['makespan']:.1f}s "
+              f"(lower bound {prediction['lower_bound']:.1f}s); "
+              f"{prediction['from_history']}/{prediction['tests']} estimates from history")
+
+    def _execute_one(self, test: PlannedTest, client=None) -> list:
+        """Run a single test and report it"""
+        test.execute(client)
+        self._report(test)
+        return []
+
+    def run(self, lab_tests: List[LabTestBase], ready_indexes=None,
+            indexes: Optional[Iterable[str]] = None,
+            test_filter: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Collect, execute and summarize the tests of several labs
+
+        Args:
+            lab_tests: Lab test instances
+            ready_indexes: Optional queue of indexes becoming ready while
+                data is still loading (see execute_staged)
+            indexes: Names of the indexes being loaded (with ready_indexes)
+            test_filter: Keys of the tests to run (None = all); labs without
+                any selected test are left out
+
+        Returns:
+            Lab summaries in lab order, as returned by get_summary()
+        """
+        planned = collect_tests(lab_tests, test_filter)
+        if test_filter is not None:
+            lab_tests = [lab for lab in lab_tests if lab.results]
+
+        if self.verbose:
+            print(f"\nRunning {len(planned)} tests from {len(lab_tests)} labs "
+                  f"on {self.max_workers} workers...")
+
+        to_run = self.incremental.select(planned) if self.incremental is not None else planned
+
+        if ready_indexes is not None:
+            self.execute_staged(to_run, ready_indexes, indexes or [])
+        else:
+            self.execute(to_run)
+
+        if self.incremental is not None:
+            self.incremental.record(to_run)
+
+        summaries = []
+        for lab in lab_tests:
+            lab.print_summary()
+            summaries.append(lab.get_summary())
+        return summaries
+
+    def _report(self, test: PlannedTest):
+        """Print a single completed test"""
+        if self.progress is not None:
+            self.progress({"stage": "test", "event": "test_completed",
+                           "result": test.result.to_dict()})
+        if not self.verbose:
+            return
+
+        result = test.result
+        status = "✓" if result.passed else "✗"
+        with self._print_lock:
+            print(f"  {status} Lab {result.lab_number}: {result.test_name} "
+                  f"({result.execution_time:.2f}s)")
+
+
+def resolve_worker_count(workers: Optional[str], governor=None) -> int:
+    """
+    Turn a --workers value into a worker count
+
+    Args:
+        workers: Number of workers, 'auto', or None (sequential)
+        governor: SearchGovernor whose limit is used for 'auto'
+
+    Returns:
+        Worker count (1 = run sequentially)
+    """
+    if workers is None:
+        return 1
+    if str(workers).lower() == "auto":
+        return governor.max_concurrent if governor is not None else 4
+    return max(1, int(workers))
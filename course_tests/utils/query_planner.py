@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Search Planner for Course Testing
+Runs identical queries once and shares base searches across tests
+"""
+
+import contextlib
+import functools
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+from .result_cache import INDEX_PATTERN, QUOTED_PATTERN, extract_indexes, normalize_query
+
+
+# Base search terms that do not narrow down the events of the named indexes
+UNSELECTIVE_TERM_PATTERN = re.compile(
+    r'\b(?:sourcetype|earliest|latest)\s*=\s*(?:"[^"]*"|\S+)|\b(?:AND|OR|NOT)\b|[()]'
+)
+
+# Names a post-process pipeline may read fields by (function calls excluded)
+FIELD_TOKEN_PATTERN = re.compile(r"\b[A-Za-z_][\w.]*\b(?!\s*\()")
+SPL_KEYWORDS = {"as", "by", "over", "and", "or", "not", "in", "like", "output", "outputnew"}
+# Wildcard field references (fields *, table foo*, values(*)), not multiplication
+WILDCARD_FIELD_PATTERN = re.compile(r"(?:^|[\s,(])\*|\w\*(?=$|[\s,)])")
+# Commands that read _raw unless given another field
+RAW_COMMANDS = {"rex", "regex", "erex", "spath", "extract", "kv", "xmlkv", "multikv",
+                "search", "transaction"}
+
+
+def split_pipeline(query: str) -> List[str]:
+    """
+    Split an SPL query into its pipeline commands
+
+    Pipes inside quoted strings and subsearch brackets are not treated
+    as command separators.
+
+    Args:
+        query: SPL search query
+
+    Returns:
+        List of command strings (the first one is the base search)
+    """
+    commands = []
+    current = []
+    depth = 0
+    in_quotes = False
+    escaped = False
+
+    for char in query:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            in_quotes = not in_quotes
+        elif not in_quotes and char == "[":
+            depth += 1
+        elif not in_quotes and char == "]":
+            depth = max(0, depth - 1)
+        elif not in_quotes and depth == 0 and char == "|":
+            commands.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+
+    commands.append("".join(current).strip())
+    return commands
+
+
+def split_base_search(query: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a query into base search and post-process pipeline
+
+    Args:
+        query: SPL search query
+
+    Returns:
+        (base search, pipeline) or None if the query cannot share a base
+        search (generating commands, subsearches in the base search)
+    """
+    if query.strip().startswith("|"):
+        return None
+
+    commands = split_pipeline(query)
+    base = commands[0]
+    if not base or "[" in base:
+        return None
+    if base.lower().startswith("search "):
+        base = base[7:].strip()
+
+    return base, " | ".join(commands[1:])
+
+
+def is_selective_base(base: str) -> bool:
+    """
+    Check whether a base search is worth storing for post-processing
+
+    A base job keeps every matching event, so a bare 'index=web' (or any
+    index=* search) can cost more than the member searches it replaces.
+
+    Args:
+        base: Base search (without the leading 'search' keyword)
+
+    Returns:
+        True if the base names concrete indexes and filters their events
+        on more than sourcetype and time
+    """
+    indexes = extract_indexes(base)
+    if not indexes or any("*" in index for index in indexes):
+        return False
+    remainder = UNSELECTIVE_TERM_PATTERN.sub(" ", INDEX_PATTERN.sub(" ", base))
+    return bool(remainder.strip())
+
+
+def base_field_list(pipelines: List[str]) -> Optional[Tuple[List[str], bool]]:
+    """
+    Find the fields post-process pipelines may read from a base search
+
+    Every name in the pipelines (outside quoted strings) counts as a
+    possible field, so the list errs on the side of keeping too many.
+
+    Args:
+        pipelines: Post-process pipelines of a base search's members
+
+    Returns:
+        (sorted field names, whether _raw is needed), or None if a
+        pipeline refers to fields by wildcard
+    """
+    fields, keep_raw = set(), False
+    for pipeline in pipelines:
+        for command in split_pipeline(QUOTED_PATTERN.sub(" ", pipeline)):
+            if WILDCARD_FIELD_PATTERN.search(command):
+                return None
+            tokens = FIELD_TOKEN_PATTERN.findall(command)
+            if not tokens:
+                continue
+            keep_raw = keep_raw or tokens[0].lower() in RAW_COMMANDS or "_raw" in tokens
+            fields.update(token for token in tokens[1:] if token.lower() not in SPL_KEYWORDS)
+    fields.discard("_raw")
+    return sorted(fields), keep_raw
+
+
+def apply_head_limit(query: str, limit: int) -> str:
+    """
+    Append '| head <limit>' so Splunk can stop the search early
+
+    Queries that already end with a head command are left unchanged.
+
+    Args:
+        query: SPL search query
+        limit: Maximum number of results
+
+    Returns:
+        Query with a head limit
+    """
+    last_command = split_pipeline(query)[-1].lower()
+    if last_command == "head" or last_command.startswith("head "):
+        return query
+    return f"{query} | head {limit}"
+
+
+class SearchUnit:
+    """One search whose result is shared by every test that needs it"""
+
+    def __init__(self, query: str, earliest_time: str, latest_time: str):
+        self.query = query
+        self.earliest_time = earliest_time
+        self.latest_time = latest_time
+        self.tests = []
+
+    def run(self, client, report: Callable, query: Optional[str] = None,
+            shared_base: Optional[Dict[str, Any]] = None) -> list:
+        """
+        Run the search once and evaluate every test attached to it
+
+        Args:
+            client: SplunkClient to run the search on
+            report: Called with each completed PlannedTest
+            query: Query to run instead of the unit's own (post-processing)
+            shared_base: Base search details recorded in each result
+
+        Returns:
+            Empty list (no follow-up tasks)
+        """
+        query = query or self.query
+
+        # Tests sharing the search get the loosest limits any of them needs
+        limits = [test.lab.head_limit(test.spec) for test in self.tests]
+        if None not in limits:
+            query = apply_head_limit(query, max(limits))
+        fetch_limits = [test.lab.fetch_limit for test in self.tests]
+        max_results = 0 if 0 in fetch_limits else max(fetch_limits)
+
+        start_time = time.time()
+        try:
+            search_result = client.execute_search(
+                query=query,
+                earliest_time=self.earliest_time,
+                latest_time=self.latest_time,
+                max_results=max_results
+            )
+        except Exception as e:
+            search_result = {"success": False, "error": f"Exception during test: {e}",
+                             "results": [], "count": 0}
+        elapsed = time.time() - start_time
+
+        for test in self.tests:
+            test.lab.evaluate_search_result(test.spec, test.result, search_result, elapsed)
+            if shared_base:
+                test.result.details["shared_base"] = shared_base
+            if len(self.tests) > 1:
+                test.result.details["shared_with"] = len(self.tests) - 1
+            report(test)
+
+        return []
+
+
+class BaseSearchGroup:
+    """
+    Searches that start with the same base search and time range
+
+    With a field list the base job stores only the fields its members
+    read (and _raw only if one needs it); without one it runs in verbose
+    mode, storing every field of the matching events.
+    """
+
+    def __init__(self, base: str, earliest_time: str, latest_time: str,
+                 fields: Optional[List[str]] = None, keep_raw: bool = True):
+        self.base = base
+        self.earliest_time = earliest_time
+        self.latest_time = latest_time
+        self.fields = fields
+        self.keep_raw = keep_raw
+        self.members: List[Tuple[SearchUnit, str]] = []
+        self.job = None
+        self._remaining = 0
+        self._lock = threading.Lock()
+
+    @property
+    def query(self) -> str:
+        """The base search as run, with its field list applied"""
+        if self.fields is None:
+            return self.base
+        query = f"{self.base} | fields {', '.join(self.fields)}" if self.fields else self.base
+        return query if self.keep_raw else f"{query} | fields - _raw"
+
+    def run(self, client, report: Callable, max_count: int, ttl: int) -> list:
+        """
+        Run the base search and return post-process tasks for each member
+
+        Falls back to running every member search directly if the base
+        search fails or its stored events were truncated by max_count.
+
+        Returns:
+            Follow-up tasks
+        """
+        direct = [functools.partial(unit.run, client, report) for unit, _ in self.members]
+        slot = client.governor.slot() if client.governor is not None else contextlib.nullcontext()
+
+        start_time = time.time()
+        try:
+            job_params = {"max_count": max_count}
+            if self.fields is None:
+                job_params["adhoc_search_level"] = "verbose"
+            with slot:
+                self.job = client.search_job(
+                    self.query, self.earliest_time, self.latest_time, ttl=ttl, keep=True,
+                    job_params=job_params
+                )
+                self.job.__enter__()
+                done = self.job.wait()
+        except Exception as e:
+            print(f"  ⚠ Base search failed ({e}), running {len(direct)} searches directly")
+            if self.job is not None:
+                # The job may already exist on the server; it was created to be kept
+                self.job.keep = False
+                self.job.close()
+            return direct
+
+        info = self.job.info() if done else {"success": False,
+                                               "error": "search failed or timed out"}
+        if not info["success"]:
+            problem = f"unavailable ({info.get('error', 'no job information')})"
+        elif int(info["event_count"] or 0) > int(info["result_count"] or 0):
+            problem = "truncated"
+        else:
+            problem = None
+        if problem:
+            print(f"  ⚠ Base search {problem}, running {len(direct)} searches directly")
+            self.job.keep = False
+            self.job.close()
+            return direct
+
+        shared_base = {
+            "base_query": self.query,
+            "base_sid": self.job.sid,
+            "base_time": time.time() - start_time,
+            "base_events": int(info["event_count"] or 0)
+        }
+        self._remaining = len(self.members)
+
+        return [
+            functools.partial(self._run_member, unit, pipeline, client, report, shared_base)
+            for unit, pipeline in self.members
+        ]
+
+    def _run_member(self, unit: SearchUnit, pipeline: str, client, report: Callable,
+                    shared_base: Dict[str, Any]) -> list:
+        """Post-process the saved base job, deleting it after the last member"""
+        query = f"| loadjob {self.job.sid}"
+        if pipeline:
+            query += f" | {pipeline}"
+
+        try:
+            return unit.run(client, report, query=query, shared_base=shared_base)
+        finally:
+            with self._lock:
+                self._remaining -= 1
+                finished = self._remaining == 0
+            if finished:
+                self.job.keep = False
+                self.job.close()
+
+
+class SearchPlan:
+    """Deduplicated searches and shared base-search groups for a test run"""
+
+    def __init__(self, test_count: int, units: List[SearchUnit],
+                 groups: List[BaseSearchGroup]):
+        self.test_count = test_count
+        self.units = units
+        self.groups = groups
+
+    def tasks(self, client, report: Callable, max_count: int, ttl: int,
+              cost: Optional[Callable] = None) -> list:
+        """
+        Initial tasks for the executor (groups return follow-up tasks)
+
+        Args:
+            cost: Optional callable estimating a unit or group; tasks are
+                then returned most expensive first
+        """
+        items = list(self.units) + list(self.groups)
+        if cost is not None:
+            items.sort(key=lambda item: -cost(item))
+        return [functools.partial(item.run, client, report, max_count, ttl)
+                if isinstance(item, BaseSearchGroup) else functools.partial(item.run, client, report)
+                for item in items]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counts of tests, distinct searches and raw-event scans"""
+        members = sum(len(group.members) for group in self.groups)
+        return {
+            "tests": self.test_count,
+            "distinct_searches": len(self.units) + members,
+            "base_searches": len(self.groups),
+            "post_process_searches": members,
+            "raw_scans": len(self.units) + len(self.groups)
+        }
+
+
+class QueryPlanner:
+    """Groups planned tests into shared searches"""
+
+    def __init__(self, client, min_group_size: int = 2,
+                 base_max_count: int = 500000, base_ttl: int = 600):
+        """
+        Initialize planner
+
+        Args:
+            client: SplunkClient used to run the planned searches
+            min_group_size: Distinct searches needed to share a base search
+            base_max_count: Maximum events a base job may store; larger
+                bases fall back to direct searches
+            base_ttl: Seconds a base job is kept while members post-process it
+        """
+        self.client = client
+        self.min_group_size = min_group_size
+        self.base_max_count = base_max_count
+        self.base_ttl = base_ttl
+
+    def plan(self, planned: list) -> SearchPlan:
+        """
+        Build a search plan
+
+        Args:
+            planned: PlannedTest objects from collect_tests()
+
+        Returns:
+            SearchPlan instance
+        """
+        # Identical queries over the same time range run once
+        units: Dict[tuple, SearchUnit] = {}
+        for test in planned:
+            spec = test.spec
+            key = (normalize_query(spec.query), spec.earliest_time, spec.latest_time)
+            if key not in units:
+                units[key] = SearchUnit(spec.query, spec.earliest_time, spec.latest_time)
+            units[key].tests.append(test)
+
+        # Distinct queries sharing a base search become post-process searches
+        candidates: Dict[tuple, List[Tuple[SearchUnit, str]]] = {}
+        standalone = []
+        for unit in units.values():
+            split = split_base_search(unit.query)
+            if split is None:
+                standalone.append(unit)
+                continue
+            base, pipeline = split
+            key = (normalize_query(base), unit.earliest_time, unit.latest_time)
+            candidates.setdefault(key, []).append((unit, pipeline))
+
+        groups = []
+        for (base, earliest_time, latest_time), members in candidates.items():
+            # Share bases that store a bounded field list, or (verbose) few events
+            indexes = extract_indexes(base)
+            field_list = base_field_list([pipeline for _, pipeline in members])
+            if (len(members) < self.min_group_size or not indexes
+                    or any("*" in index for index in indexes)
+                    or (field_list is None and not is_selective_base(base))):
+                standalone.extend(unit for unit, _ in members)
+                continue
+            fields, keep_raw = field_list if field_list is not None else (None, True)
+            group = BaseSearchGroup(base, earliest_time, latest_time, fields, keep_raw)
+            group.members = members
+            groups.append(group)
+
+        return SearchPlan(len(planned), standalone, groups)
+
+    def tasks(self, plan: SearchPlan, report: Callable, cost: Optional[Callable] = None) -> list:
+        """Initial executor tasks for a plan (most expensive first when 'cost' is given)"""
+        return plan.tasks(self.client, report, self.base_max_count, self.base_ttl, cost)
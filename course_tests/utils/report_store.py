@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Report History Store for Course Testing
+Keeps every run's per-test timings in SQLite for trend and regression analysis
+"""
+
+import glob
+import json
+import math
+import os
+import sqlite3
+from typing import Dict, List, Optional, Any
+
+from .latency import make_test_key
+
+
+# File name of the history store inside the reports directory
+HISTORY_FILE = "history.sqlite"
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    " run_id INTEGER PRIMARY KEY,"
+    " timestamp TEXT NOT NULL UNIQUE,"
+    " source TEXT,"
+    " duration REAL,"
+    " total_tests INTEGER,"
+    " total_passed INTEGER,"
+    " pass_rate REAL)",
+    "CREATE TABLE IF NOT EXISTS test_results ("
+    " run_id INTEGER NOT NULL REFERENCES runs(run_id),"
+    " test_key TEXT NOT NULL,"
+    " lab_number INTEGER,"
+    " passed INTEGER,"
+    " execution_time REAL,"
+    " result_count INTEGER,"
+    " run_duration REAL,"
+    " scan_count INTEGER,"
+    " event_count INTEGER,"
+    " PRIMARY KEY (test_key, run_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS test_results_run ON test_results (run_id)",
+)
+
+
+def _mean_stdev(values: List[float]):
+    """Sample mean and standard deviation"""
+    mean = sum(values) / len(values)
+    if len(values) < 2:
+        return mean, 0.0
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+    return mean, math.sqrt(variance)
+
+
+class ReportStore:
+    """
+    SQLite store of test run reports
+
+    One row per run and one row per test per run, keyed so that trend
+    queries for a test and regression checks over recent runs are
+    index lookups even with thousands of runs stored.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize report store
+
+        Args:
+            path: SQLite file (created if missing)
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def ingest_report(self, report: Dict[str, Any], source: Optional[str] = None) -> Optional[int]:
+        """
+        Add one run report (as produced by CourseTestRunner.save_report)
+
+        Args:
+            report: Report dictionary
+            source: Where the report came from (e.g. its JSON file name)
+
+        Returns:
+            New run ID, or None if a run with the same timestamp is stored
+        """
+        cursor = self._db.execute(
+            "INSERT OR IGNORE INTO runs (timestamp, source, duration, total_tests, total_passed, pass_rate)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (report["timestamp"], source, report.get("duration_seconds"),
+             report.get("total_tests"), report.get("total_passed"),
+             report.get("overall_pass_rate"))
+        )
+        if cursor.rowcount == 0:
+            return None
+        run_id = cursor.lastrowid
+
+        rows = []
+        for lab in report.get("lab_results", []):
+            for test in lab.get("results", []):
+                details = test.get("details") or {}
+                if details.get("reused") or details.get("cached"):
+                    # Reused by an incremental run (its own run is stored
+                    # already) or served from the result cache
+                    continue
+                job = test.get("details", {}).get("job_stats", {})
+                rows.append((
+                    run_id,
+                    make_test_key(test["lab_number"], test["test_name"]),
+                    test["lab_number"],
+                    int(bool(test.get("passed"))),
+                    test.get("execution_time"),
+                    test.get("result_count"),
+                    job.get("run_duration"),
+                    job.get("scan_count"),
+                    job.get("event_count")
+                ))
+
+        self._db.executemany(
+            "INSERT OR REPLACE INTO test_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self._db.commit()
+        return run_id
+
+    def ingest_directory(self, reports_dir: str) -> int:
+        """
+        Add every test_results_*.json report in a directory not yet stored
+
+        Args:
+            reports_dir: Directory containing saved reports
+
+        Returns:
+            Number of runs added
+        """
+        known = {row[0] for row in self._db.execute("SELECT source FROM runs")}
+        added = 0
+
+        for path in sorted(glob.glob(os.path.join(reports_dir, "test_results_*.json"))):
+            name = os.path.basename(path)
+            if name in known:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    report = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠ Skipping {name}: {e}")
+                continue
+            if self.ingest_report(report, source=name) is not None:
+                added += 1
+
+        return added
+
+    def list_runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List stored runs, most recent first
+
+        Args:
+            limit: Maximum number of runs (None = all)
+
+        Returns:
+            List of run dictionaries
+        """
+        query = ("SELECT run_id, timestamp, source, duration, total_tests, total_passed, pass_rate"
+                 " FROM runs ORDER BY timestamp DESC")
+        params = ()
+        if limit:
+            query += " LIMIT ?"
+            params = (limit,)
+
+        columns = ["run_id", "timestamp", "source", "duration", "total_tests",
+                   "total_passed", "pass_rate"]
+        return [dict(zip(columns, row)) for row in self._db.execute(query, params)]
+
+    def find_tests(self, pattern: str) -> List[str]:
+        """
+        Find stored test keys
+
+        Args:
+            pattern: Substring of the test key (e.g. 'lab04' or 'join')
+
+        Returns:
+            Matching test keys, sorted
+        """
+        rows = self._db.execute(
+            "SELECT DISTINCT test_key FROM test_results WHERE test_key LIKE ? ORDER BY test_key",
+            (f"%{pattern}%",)
+        )
+        return [row[0] for row in rows]
+
+    def trend(self, test_key: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Latency history of one test
+
+        Args:
+            test_key: Test key (see make_test_key)
+            limit: Number of most recent runs
+
+        Returns:
+            List of per-run dictionaries, oldest first
+        """
+        rows = self._db.execute(
+            "SELECT r.run_id, r.timestamp, t.passed, t.execution_time, t.result_count,"
+            " t.run_duration, t.scan_count"
+            " FROM test_results t JOIN runs r ON r.run_id = t.run_id"
+            " WHERE t.test_key = ? ORDER BY r.timestamp DESC LIMIT ?",
+            (test_key, limit)
+        ).fetchall()
+
+        columns = ["run_id", "timestamp", "passed", "execution_time", "result_count",
+                   "run_duration", "scan_count"]
+        return [dict(zip(columns, row)) for row in reversed(rows)]
+
+    def regressions(self, run_id: Optional[int] = None, window: int = 10,
+                    threshold: float = 3.0, min_samples: int = 5,
+                    min_delta: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        Find tests that are significantly slower than their rolling baseline
+
+        A test is flagged when its time in the checked run lies more than
+        'threshold' standard deviations above the mean of its passing runs
+        in the preceding 'window' runs, and at least 'min_delta' seconds
+        slower (so noise on sub-second searches is not flagged).
+
+        Args:
+            run_id: Run to check (default: most recent)
+            window: Number of earlier runs forming the baseline
+            threshold: z-score above which a test is flagged
+            min_samples: Baseline runs a test needs before it can be flagged
+            min_delta: Minimum slowdown in seconds
+
+        Returns:
+            Flagged tests, largest z-score first
+        """
+        runs = [row[0] for row in self._db.execute(
+            "SELECT run_id FROM runs WHERE timestamp <= COALESCE("
+            " (SELECT timestamp FROM runs WHERE run_id = ?), '9999')"
+            " ORDER BY timestamp DESC LIMIT ?",
+            (run_id, window + 1)
+        )]
+        if len(runs) < 2:
+            return []
+
+        checked, baseline_runs = runs[0], set(runs[1:])
+        placeholders = ",".join("?" * len(runs))
+        current: Dict[str, float] = {}
+        history: Dict[str, List[float]] = {}
+        for test_key, rid, passed, execution_time in self._db.execute(
+                "SELECT test_key, run_id, passed, execution_time FROM test_results"
+                f" WHERE run_id IN ({placeholders})", runs):
+            if execution_time is None:
+                continue
+            if rid == checked:
+                current[test_key] = execution_time
+            elif passed and rid in baseline_runs:
+                history.setdefault(test_key, []).append(execution_time)
+
+        flagged = []
+        for test_key, value in current.items():
+            samples = history.get(test_key, [])
+            if len(samples) < min_samples:
+                continue
+            mean, stdev = _mean_stdev(samples)
+            if value - mean < min_delta:
+                continue
+            z_score = (value - mean) / stdev if stdev > 0 else float("inf")
+            if z_score > threshold:
+                flagged.append({
+                    "test_key": test_key,
+                    "execution_time": value,
+                    "baseline_mean": mean,
+                    "baseline_stdev": stdev,
+                    "baseline_runs": len(samples),
+                    "z_score": z_score
+                })
+
+        flagged.sort(key=lambda item: item["z_score"], reverse=True)
+        return flagged
+
+    def compare(self, run_a: int, run_b: int) -> List[Dict[str, Any]]:
+        """
+        Compare per-test results of two runs
+
+        Args:
+            run_a: Earlier (reference) run ID
+            run_b: Later run ID
+
+        Returns:
+            One dictionary per test in either run, largest slowdown first
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        for test_key, rid, passed, execution_time, result_count in self._db.execute(
+                "SELECT test_key, run_id, passed, execution_time, result_count"
+                " FROM test_results WHERE run_id IN (?, ?)", (run_a, run_b)):
+            side = "a" if rid == run_a else "b"
+            entry = results.setdefault(test_key, {"test_key": test_key})
+            entry[f"passed_{side}"] = bool(passed)
+            entry[f"time_{side}"] = execution_time
+            entry[f"count_{side}"] = result_count
+
+        for entry in results.values():
+            if entry.get("time_a") is not None and entry.get("time_b") is not None:
+                entry["delta"] = entry["time_b"] - entry["time_a"]
+            else:
+                entry["delta"] = None
+
+        return sorted(results.values(),
+                      key=lambda entry: entry["delta"] if entry["delta"] is not None else float("-inf"),
+                      reverse=True)
+
+    def close(self):
+        """Close the database"""
+        self._db.close()
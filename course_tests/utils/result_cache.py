@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Search Result Cache for Course Testing
+Caches search results keyed by query, time range and index data fingerprint
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+
+
+# Matches index=web, index="web", index = web_x10, index=_audit, index=*
+INDEX_PATTERN = re.compile(r'\bindex\s*=\s*"?([\w\*\-]+)"?', re.IGNORECASE)
+
+# Quoted strings are kept verbatim when normalizing whitespace
+QUOTED_PATTERN = re.compile(r'("(?:[^"\\]|\\.)*")')
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Relative time offsets such as -24h, -7d@d, +1mon (the snap suffix is ignored)
+RELATIVE_TIME_PATTERN = re.compile(r"^([+-]\d*)(mon|[smhdwy])", re.IGNORECASE)
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800,
+                "mon": 2592000, "y": 31536000}
+
+# Resolved relative times are snapped down to this many seconds
+TIME_BUCKET_SECONDS = 3600
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for use as a cache key
+
+    Collapses runs of whitespace outside of quoted strings and strips
+    a leading 'search' keyword, so cosmetic differences share one entry.
+
+    Args:
+        query: SPL search query
+
+    Returns:
+        Normalized query string
+    """
+    parts = QUOTED_PATTERN.split(query.strip())
+    normalized = []
+    for i, part in enumerate(parts):
+        if i % 2 == 1:
+            normalized.append(part)
+        else:
+            normalized.append(WHITESPACE_PATTERN.sub(" ", part))
+
+    result = "".join(normalized).strip()
+    if result.lower().startswith("search "):
+        result = result[7:].lstrip()
+    return result
+
+
+def resolve_relative_time(time_spec: str, now: Optional[float] = None,
+                          bucket: int = TIME_BUCKET_SECONDS) -> str:
+    """
+    Resolve a relative time to a coarse absolute one
+
+    Results of '-24h' change as the clock moves events out of the range,
+    so anything keyed on the literal string would outlive its window.
+
+    Args:
+        time_spec: Splunk time ('-24h', '-7d@d', 'now', '@d', epoch, ...)
+        now: Reference epoch time (default: the current time)
+        bucket: Seconds the resolved time is snapped down to
+
+    Returns:
+        Snapped epoch seconds as a string for relative times; any other
+        value (absolute times, '0' for all time) is returned unchanged
+    """
+    if now is None:
+        now = time.time()
+
+    if time_spec == "now" or time_spec.startswith("@"):
+        offset = 0
+    else:
+        match = RELATIVE_TIME_PATTERN.match(time_spec or "")
+        if not match:
+            return time_spec
+        amount = int(match.group(1)[1:] or 1) * (-1 if match.group(1)[0] == "-" else 1)
+        offset = amount * UNIT_SECONDS[match.group(2).lower()]
+
+    return str(int((now + offset) // bucket * bucket))
+
+
+def extract_indexes(query: str) -> List[str]:
+    """
+    Extract index names referenced by a query
+
+    Args:
+        query: SPL search query
+
+    Returns:
+        Sorted list of index names (may contain wildcards such as '*')
+    """
+    return sorted({match.lower() for match in INDEX_PATTERN.findall(query)})
+
+
+class ResultCache:
+    """
+    Two-level cache for search results
+
+    Entries live in an in-memory LRU and, optionally, in a SQLite file so
+    they survive across runs. Keys include a per-index data fingerprint,
+    so an entry is never returned once the underlying data has changed.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 512,
+                 max_age: Optional[float] = None, fingerprint_ttl: float = 30.0):
+        """
+        Initialize result cache
+
+        Args:
+            path: SQLite file for persistent entries (None = memory only)
+            max_entries: Maximum entries kept in memory
+            max_age: Maximum entry age in seconds (None = no limit)
+            fingerprint_ttl: Seconds a data fingerprint is reused before
+                it is fetched again from Splunk
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.fingerprint_ttl = fingerprint_ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._fingerprints: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " created REAL NOT NULL,"
+                " payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(query: str, earliest_time: str, latest_time: str,
+                 fingerprint: str, options: str = "") -> str:
+        """
+        Build a cache key
+
+        Relative times are keyed resolved to the hour (see
+        resolve_relative_time), so an entry for '-24h' is not returned
+        once the window has moved on.
+
+        Args:
+            query: SPL search query
+            earliest_time: Earliest time for search
+            latest_time: Latest time for search
+            fingerprint: Data fingerprint of the indexes the query reads
+            options: Other settings that change the stored result
+                (e.g. how many rows were fetched)
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        material = json.dumps([
+            normalize_query(query), resolve_relative_time(earliest_time),
+            resolve_relative_time(latest_time), fingerprint, options
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get_fingerprint(self, indexes: tuple) -> Optional[str]:
+        """Return a recently fetched fingerprint for the given indexes"""
+        with self._lock:
+            cached = self._fingerprints.get(indexes)
+            if cached and time.time() - cached[0] < self.fingerprint_ttl:
+                return cached[1]
+        return None
+
+    def set_fingerprint(self, indexes: tuple, fingerprint: str):
+        """Remember a fingerprint for the given indexes"""
+        with self._lock:
+            self._fingerprints[indexes] = (time.time(), fingerprint)
+
+    def invalidate_fingerprints(self):
+        """Forget all remembered fingerprints (forces a fresh data check)"""
+        with self._lock:
+            self._fingerprints.clear()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached search result
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Copy of the cached search result dictionary, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT created, payload FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+
+            if entry is None or self._expired(entry[0]):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store a search result
+
+        Args:
+            key: Cache key from make_key()
+            result: Search result dictionary from execute_search() (a copy
+                is stored, so the caller may go on changing it)
+        """
+        entry = (time.time(), copy.deepcopy(result))
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, created, payload) VALUES (?, ?, ?)",
+                    (key, entry[0], json.dumps(result))
+                )
+                self._db.commit()
+
+    def clear(self):
+        """Remove all entries from memory and disk"""
+        with self._lock:
+            self._memory.clear()
+            self._fingerprints.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def prune(self) -> int:
+        """
+        Delete persistent entries older than max_age
+
+        Returns:
+            Number of entries removed
+        """
+        if self._db is None or self.max_age is None:
+            return 0
+
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM results WHERE created < ?", (time.time() - self.max_age,)
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss statistics"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total * 100) if total > 0 else 0,
+            "memory_entries": len(self._memory)
+        }
+
+    def close(self):
+        """Close the persistent store"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, entry: tuple):
+        """Insert into the in-memory LRU, evicting the oldest entry if full"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _expired(self, created: float) -> bool:
+        """Check whether an entry is older than max_age"""
+        return self.max_age is not None and time.time() - created > self.max_age
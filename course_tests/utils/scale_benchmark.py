@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Data-Scale Benchmarks for Course Testing
+Measures how lab query cost grows with data volume
+"""
+
+import fnmatch
+import math
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from .columnar import summarize_fields
+from .result_cache import INDEX_PATTERN
+
+
+# Growth classes by fitted exponent k of cost ~ scale^k (upper bounds)
+GROWTH_CLASSES = [
+    (0.2, "constant"),
+    (0.8, "sublinear"),
+    (1.2, "linear"),
+    (float("inf"), "superlinear"),
+]
+
+
+def scale_query(query: str, index_map: Dict[str, str]) -> Optional[str]:
+    """
+    Point a query at the scaled copies of the indexes it reads
+
+    'index=web' becomes 'index=web_x10'; wildcards such as 'index=*' are
+    expanded to the scaled indexes they match, so a scaled run does not
+    also read the other data sets.
+
+    Args:
+        query: SPL search query
+        index_map: Course index name -> scaled index name
+
+    Returns:
+        Rewritten query, or None if the query reads no course index (its
+        cost does not depend on the data volume)
+    """
+    rewritten = False
+
+    def replace(match):
+        nonlocal rewritten
+        name = match.group(1).lower()
+        if name in index_map:
+            rewritten = True
+            return f"index={index_map[name]}"
+        if "*" in name:
+            matched = [scaled for base, scaled in sorted(index_map.items())
+                       if fnmatch.fnmatch(base, name)]
+            if matched:
+                rewritten = True
+                return "(" + " OR ".join(f"index={scaled}" for scaled in matched) + ")"
+        return match.group(0)
+
+    result = INDEX_PATTERN.sub(replace, query)
+    return result if rewritten else None
+
+
+def fit_power_law(points: List[Tuple[float, float]]) -> Optional[float]:
+    """
+    Fit y = a * x^k by least squares on log-log axes
+
+    Args:
+        points: (x, y) pairs; pairs with a non-positive value are ignored
+
+    Returns:
+        Exponent k, or None with fewer than two usable distinct x values
+    """
+    logs = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len({x for x, _ in logs}) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in logs)
+    variance = sum((x - mean_x) ** 2 for x, _ in logs)
+    return covariance / variance
+
+
+def classify_growth(exponent: Optional[float]) -> str:
+    """Name the growth class of a fitted exponent"""
+    if exponent is None:
+        return "unknown"
+    for limit, name in GROWTH_CLASSES:
+        if exponent < limit:
+            return name
+    return GROWTH_CLASSES[-1][1]
+
+
+class ScaleBenchmark:
+    """
+    Runs the lab query catalog against data sets of several sizes
+
+    Each query is run against the scaled copies of its indexes; the
+    search job's runDuration and scanCount are read before the job is
+    deleted, so the numbers reflect server-side work rather than
+    client or network overhead.
+    """
+
+    def __init__(self, client, catalog: List[Any], repeat: int = 3, timeout: int = 600):
+        """
+        Initialize benchmark
+
+        Args:
+            client: Logged-in SplunkClient
+            catalog: PlannedTest objects from collect_tests()
+            repeat: Runs per query and scale (the median is kept)
+            timeout: Maximum seconds per search
+        """
+        self.client = client
+        self.catalog = catalog
+        self.repeat = max(1, repeat)
+        self.timeout = timeout
+        self.measurements: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.skipped: List[str] = []
+
+    def measure(self, query: str, earliest_time: str, latest_time: str) -> Dict[str, Any]:
+        """
+        Run one query 'repeat' times and record its job statistics
+
+        Returns:
+            Dictionary with success and the median run_duration, wall time,
+            scan_count, event_count and result_count (or an error)
+        """
+        runs = []
+        for _ in range(self.repeat):
+            start_time = time.time()
+            try:
+                with self.client.search_job(query, earliest_time, latest_time) as job:
+                    if not job.wait(self.timeout):
+                        return {"success": False, "error": "Search job failed or timed out"}
+                    info = job.info()
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+            if not info["success"]:
+                return {"success": False, "error": info.get("error", "No job information")}
+
+            runs.append({
+                "run_duration": float(info["run_duration"] or 0),
+                "wall_time": time.time() - start_time,
+                "scan_count": int(info["scan_count"] or 0),
+                "event_count": int(info["event_count"] or 0),
+                "result_count": int(info["result_count"] or 0)
+            })
+
+        summary = {"success": True, "runs": len(runs)}
+        summary.update(summarize_fields(
+            runs, ["run_duration", "wall_time", "scan_count", "event_count", "result_count"]
+        ))
+        return summary
+
+    def run_scale(self, scale: int, index_map: Dict[str, str], verbose: bool = True):
+        """
+        Measure every catalog query against one data scale
+
+        Args:
+            scale: Scale factor of the data set
+            index_map: Course index name -> index holding this scale's data
+            verbose: Print a line per query
+        """
+        for test in self.catalog:
+            spec = test.spec
+            query = scale_query(spec.query, index_map)
+            if query is None:
+                if spec.key not in self.skipped:
+                    self.skipped.append(spec.key)
+                continue
+
+            measurement = self.measure(query, spec.earliest_time, spec.latest_time)
+            self.measurements.setdefault(spec.key, {})[scale] = measurement
+
+            if verbose:
+                if measurement["success"]:
+                    print(f"  ✓ {spec.key}: {measurement['run_duration']:.2f}s, "
+                          f"{int(measurement['scan_count']):,} scanned")
+                else:
+                    print(f"  ✗ {spec.key}: {measurement['error']}")
+
+    def analyze(self) -> List[Dict[str, Any]]:
+        """
+        Fit a scaling curve per query
+
+        Returns:
+            One dictionary per query with its per-scale measurements, the
+            fitted run-duration and scan-count exponents and the growth
+            class, steepest growth first
+        """
+        curves = []
+        for key, by_scale in self.measurements.items():
+            ok = {scale: m for scale, m in sorted(by_scale.items()) if m["success"]}
+            duration_exponent = fit_power_law([(scale, m["run_duration"]) for scale, m in ok.items()])
+            scan_exponent = fit_power_law([(scale, m["scan_count"]) for scale, m in ok.items()])
+            curves.append({
+                "key": key,
+                "scales": {str(scale): m for scale, m in sorted(by_scale.items())},
+                "duration_exponent": duration_exponent,
+                "scan_exponent": scan_exponent,
+                "growth": classify_growth(duration_exponent),
+                "failed_scales": [scale for scale, m in sorted(by_scale.items()) if not m["success"]]
+            })
+
+        curves.sort(key=lambda curve: curve["duration_exponent"]
+                    if curve["duration_exponent"] is not None else float("-inf"), reverse=True)
+        return curves
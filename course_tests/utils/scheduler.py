@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test Scheduling for Course Testing
+Longest-processing-time-first ordering from historical test durations
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from .metrics import percentile
+from .catalog import COST_CLASSES, estimate_cost_class
+
+
+# Seconds assumed per cost class until history for the class exists
+DEFAULT_CLASS_SECONDS = {"light": 1.0, "medium": 3.0, "heavy": 10.0}
+
+
+class LPTScheduler:
+    """
+    Orders tests longest first so slow searches do not start last
+
+    A test's duration is the median of its recent passing runs; tests
+    without history get the median duration of the tests in their cost
+    class that have history (or DEFAULT_CLASS_SECONDS).
+    """
+
+    def __init__(self, history: Optional[Dict[str, List[float]]] = None, recent: int = 5):
+        """
+        Args:
+            history: Test key -> execution times, oldest first (see
+                load_report_history)
+            recent: Number of most recent runs the estimate is based on
+        """
+        self.history = history or {}
+        self.recent = max(1, recent)
+        self.class_seconds = dict(DEFAULT_CLASS_SECONDS)
+
+    def _cost_class(self, spec) -> str:
+        return spec.cost_class if spec.cost_class in COST_CLASSES else estimate_cost_class(spec)
+
+    def _measured(self, spec) -> Optional[float]:
+        times = self.history.get(spec.key)
+        return percentile(times[-self.recent:], 50) if times else None
+
+    def fit(self, planned: Iterable[Any]):
+        """
+        Learn per-class durations from the tests of this run that have history
+
+        Args:
+            planned: PlannedTest objects
+        """
+        by_class: Dict[str, List[float]] = {}
+        for test in planned:
+            measured = self._measured(test.spec)
+            if measured is not None:
+                by_class.setdefault(self._cost_class(test.spec), []).append(measured)
+        for cost_class, durations in by_class.items():
+            self.class_seconds[cost_class] = percentile(durations, 50)
+
+    def estimate(self, spec) -> Tuple[float, str]:
+        """
+        Estimate a test's duration
+
+        Returns:
+            Tuple of (seconds, source), source being 'history' or 'cost_class'
+        """
+        measured = self._measured(spec)
+        if measured is not None:
+            return measured, "history"
+        return self.class_seconds[self._cost_class(spec)], "cost_class"
+
+    def order(self, planned: List[Any]) -> List[Any]:
+        """
+        Sort tests longest first (ties keep lab/test order)
+
+        Args:
+            planned: PlannedTest objects
+
+        Returns:
+            New list in dispatch order
+        """
+        return sorted(planned, key=lambda test: -self.estimate(test.spec)[0])
+
+    def task_cost(self, item) -> float:
+        """
+        Estimate a search plan task: a SearchUnit or a BaseSearchGroup
+
+        A shared search takes about as long as the slowest test it serves.
+        """
+        if hasattr(item, "members"):
+            tests = [test for unit, _ in item.members for test in unit.tests]
+        else:
+            tests = item.tests
+        return max((self.estimate(test.spec)[0] for test in tests), default=0.0)
+
+    def predict(self, planned: List[Any], workers: int) -> Dict[str, Any]:
+        """
+        Simulate dispatching the tests longest first over a worker pool
+
+        Args:
+            planned: PlannedTest objects
+            workers: Number of concurrent workers
+
+        Returns:
+            Dictionary with the predicted makespan, its lower bound
+            (max of total work / workers and the longest test), total
+            estimated work and how many estimates came from history
+        """
+        estimates = [self.estimate(test.spec) for test in planned]
+        durations = sorted((seconds for seconds, _ in estimates), reverse=True)
+        workers = max(1, workers)
+
+        finish_times = [0.0] * min(workers, len(durations))
+        heapq.heapify(finish_times)
+        for duration in durations:
+            heapq.heapreplace(finish_times, finish_times[0] + duration)
+
+        total = sum(durations)
+        return {
+            "makespan": max(finish_times, default=0.0),
+            "lower_bound": max(total / workers, durations[0] if durations else 0.0),
+            "total_work": total,
+            "from_history": sum(1 for _, source in estimates if source == "history"),
+            "tests": len(estimates)
+        }
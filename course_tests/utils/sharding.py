@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Sharded Test Execution for Course Testing
+Distributes tests over several Splunk instances holding identical data
+"""
+
+import threading
+from typing import Callable, Dict, List, Any, Optional
+
+from .parallel import ParallelTestExecutor, PlannedTest
+from .query_planner import QueryPlanner
+from .result_cache import normalize_query
+from .scheduler import LPTScheduler
+
+
+DEFAULT_PORT = 8089
+
+
+class Endpoint:
+    """One Splunk instance of the pool"""
+
+    def __init__(self, host: str, port: int = DEFAULT_PORT, workers: Optional[int] = None):
+        """
+        Args:
+            host: Splunk host
+            port: Splunk management port
+            workers: Tests run concurrently on this instance (None = the
+                runner's --workers setting)
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+
+    @property
+    def label(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+def parse_hosts(hosts: str) -> List[Endpoint]:
+    """
+    Parse a --hosts value
+
+    Args:
+        hosts: Comma-separated HOST[:PORT[:WORKERS]] entries, e.g.
+            'splunk1:8089:4,splunk2:8089:2,localhost:18089'
+
+    Returns:
+        Endpoints in the given order
+
+    Raises:
+        ValueError: If an entry is malformed or listed twice
+    """
+    endpoints = []
+    for item in hosts.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.split(":")
+        if len(parts) > 3 or not parts[0]:
+            raise ValueError(f"Invalid host entry '{item}' (expected HOST[:PORT[:WORKERS]])")
+        try:
+            port = int(parts[1]) if len(parts) > 1 and parts[1] else DEFAULT_PORT
+            workers = int(parts[2]) if len(parts) > 2 else None
+        except ValueError:
+            raise ValueError(f"Invalid port or worker count in '{item}'")
+        if workers is not None and workers < 1:
+            raise ValueError(f"Worker count must be at least 1 in '{item}'")
+        endpoints.append(Endpoint(parts[0], port, workers))
+
+    labels = [endpoint.label for endpoint in endpoints]
+    duplicates = sorted({label for label in labels if labels.count(label) > 1})
+    if duplicates:
+        raise ValueError(f"Hosts listed more than once: {', '.join(duplicates)}")
+    if not endpoints:
+        raise ValueError("No hosts given")
+    return endpoints
+
+
+class Shard:
+    """A logged-in client of one instance and its concurrency limit"""
+
+    def __init__(self, client, workers: int, label: str):
+        self.client = client
+        self.workers = max(1, workers)
+        self.label = label
+
+
+class ShardedExecutor(ParallelTestExecutor):
+    """
+    Runs planned tests on a pool of instances, each with its own worker pool
+
+    Tests with the same query and time range go to the same instance
+    (so --share-searches can still deduplicate them); the groups are
+    assigned longest first to the instance with the least estimated load
+    per worker. Results land in the labs' shared result objects, so the
+    lab summaries form one merged report; each result records its host.
+    """
+
+    def __init__(self, shards: List[Shard], verbose: bool = True, share_searches: bool = False,
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 scheduler=None, incremental=None):
+        """
+        Args:
+            shards: Instances to run on
+            verbose: Print a line as each test completes
+            share_searches: Deduplicate and share base searches per instance
+            progress: Optional callable receiving per-test progress events
+            scheduler: Optional LPTScheduler estimating test durations (tests
+                count as equally long without one)
+            incremental: Optional IncrementalSelector (see ParallelTestExecutor)
+        """
+        super().__init__(max_workers=sum(shard.workers for shard in shards), verbose=verbose,
+                         progress=progress, scheduler=scheduler, incremental=incremental)
+        self.shards = shards
+        self.share_searches = share_searches
+
+    def _estimate(self, test: PlannedTest) -> float:
+        return self.scheduler.estimate(test.spec)[0] if self.scheduler is not None else 1.0
+
+    def assign(self, planned: List[PlannedTest]) -> List[List[PlannedTest]]:
+        """
+        Split tests over the shards
+
+        Returns:
+            One list of tests per shard, in shard order
+        """
+        if self.scheduler is not None:
+            self.scheduler.fit(planned)
+
+        groups: Dict[tuple, List[PlannedTest]] = {}
+        for test in planned:
+            key = (normalize_query(test.spec.query), test.spec.earliest_time, test.spec.latest_time)
+            groups.setdefault(key, []).append(test)
+
+        loads = [0.0] * len(self.shards)
+        assignments: List[List[PlannedTest]] = [[] for _ in self.shards]
+        for tests in sorted(groups.values(), key=lambda tests: -max(map(self._estimate, tests))):
+            target = min(range(len(self.shards)),
+                         key=lambda i: (loads[i] / self.shards[i].workers, i))
+            assignments[target].extend(tests)
+            # Identical queries share one search with --share-searches
+            cost = (max(map(self._estimate, tests)) if self.share_searches
+                    else sum(map(self._estimate, tests)))
+            loads[target] += cost
+
+        # Keep lab/test order within each shard (the shard's own scheduler reorders)
+        position = {id(test): index for index, test in enumerate(planned)}
+        for tests in assignments:
+            tests.sort(key=lambda test: position[id(test)])
+        return assignments
+
+    def execute(self, planned: List[PlannedTest], client=None) -> List[PlannedTest]:
+        """
+        Execute planned tests across the shards, one thread per shard
+
+        Args:
+            planned: Tests to run
+            client: Ignored; each shard uses its own client
+
+        Returns:
+            The same tests, with their results filled in
+        """
+        assignments = self.assign(planned)
+        if self.verbose:
+            for shard, tests in zip(self.shards, assignments):
+                print(f"  {shard.label}: {len(tests)} tests on {shard.workers} workers")
+
+        errors = []
+
+        def run_shard(shard: Shard, tests: List[PlannedTest]):
+            scheduler = None
+            if self.scheduler is not None:
+                scheduler = LPTScheduler(self.scheduler.history, self.scheduler.recent)
+            executor = ParallelTestExecutor(
+                max_workers=shard.workers, verbose=self.verbose,
+                planner=QueryPlanner(shard.client) if self.share_searches else None,
+                progress=self.progress, scheduler=scheduler
+            )
+            executor._print_lock = self._print_lock
+            try:
+                executor.execute(tests, client=shard.client)
+            except Exception as e:
+                errors.append(f"{shard.label}: {e}")
+                for test in tests:
+                    if not test.result.passed and test.result.error_message is None:
+                        test.result.error_message = f"Shard {shard.label} failed: {e}"
+            for test in tests:
+                test.result.details["host"] = shard.label
+
+        threads = [threading.Thread(target=run_shard, args=(shard, tests), daemon=True)
+                   for shard, tests in zip(self.shards, assignments) if tests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for error in errors:
+            print(f"✗ Shard failed: {error}")
+        return planned
+
+    def execute_staged(self, planned, ready_indexes, indexes, client=None):
+        raise ValueError("Sharded runs need the data loaded on every instance first")
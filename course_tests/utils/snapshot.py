@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Index Snapshots for Course Testing
+Saves loaded index buckets as tarballs and restores them into new containers
+"""
+
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import time
+from typing import Dict, List, Optional, Any
+
+
+# Splunk home inside the container and the paths a snapshot covers
+# (relative to it); the course indexes are added per snapshot
+SPLUNK_HOME = "/opt/splunk"
+SNAPSHOT_CONFIG_PATHS = [
+    "etc/system/local/indexes.conf",
+    "etc/apps/search/lookups",
+]
+
+
+def snapshot_key(manifest: Dict[str, Any], load_config: Any) -> str:
+    """
+    Build the key identifying a loaded data set
+
+    Args:
+        manifest: Generator manifest (seed, volume settings, file counts)
+        load_config: Anything else that changes what gets indexed
+            (e.g. the loader's file -> index mapping)
+
+    Returns:
+        Short hex digest
+    """
+    material = json.dumps([manifest, load_config], sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+class IndexSnapshots:
+    """
+    Tarball snapshots of a Splunk container's course indexes
+
+    Snapshots are taken from the container's /opt/splunk volumes with a
+    throwaway container of the same image ('docker run --volumes-from'),
+    so file ownership is preserved and no tools are needed on the host.
+    Splunk must be stopped while a snapshot is saved or restored.
+    """
+
+    def __init__(self, directory: str, container: str, image: str,
+                 max_age: Optional[float] = 20 * 3600):
+        """
+        Initialize snapshot store
+
+        Args:
+            directory: Host directory holding snapshot tarballs
+            container: Name of the Splunk container
+            image: Splunk image (used for the helper container)
+            max_age: Seconds a snapshot stays usable (None = no limit). The
+                loader stamps events with the load time, so a snapshot
+                older than the tests' shortest time range ('-24h') would
+                restore events those tests no longer see.
+        """
+        self.directory = os.path.abspath(directory)
+        self.container = container
+        self.image = image
+        self.max_age = max_age
+
+    def _paths(self, key: str):
+        """Tarball and metadata paths for a key"""
+        base = os.path.join(self.directory, f"splunk-indexes-{key}")
+        return base + ".tar.gz", base + ".json"
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a usable snapshot
+
+        Args:
+            key: Snapshot key from snapshot_key()
+
+        Returns:
+            Snapshot metadata (including expected index counts), or None if
+            there is no snapshot for the key or it is too old
+        """
+        archive, metadata_path = self._paths(key)
+        if not os.path.exists(archive) or not os.path.exists(metadata_path):
+            return None
+
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        age = time.time() - metadata.get("created", 0)
+        if self.max_age is not None and age > self.max_age:
+            print(f"ℹ Snapshot {key} is {age / 3600:.1f}h old (limit {self.max_age / 3600:.1f}h), "
+                  f"not reusing it")
+            return None
+
+        return metadata
+
+    def _run_helper(self, args: List[str]) -> bool:
+        """Run tar in a helper container sharing the Splunk container's volumes"""
+        command = [
+            "docker", "run", "--rm", "--user", "root",
+            "--volumes-from", self.container,
+            "-v", f"{self.directory}:/backup",
+            "--entrypoint", "tar",
+            self.image
+        ] + args
+
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ✗ {' '.join(args[:2])} failed: {result.stderr.strip()[:200]}")
+            return False
+        return True
+
+    def _docker(self, action: str) -> bool:
+        """Stop or start the Splunk container"""
+        result = subprocess.run(["docker", action, self.container], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ✗ docker {action} {self.container} failed: {result.stderr.strip()[:200]}")
+            return False
+        return True
+
+    def save(self, key: str, indexes: List[str], counts: Dict[str, int],
+             manifest: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Save the course indexes of the (running) container as a snapshot
+
+        The container is stopped for the copy and started again afterwards.
+
+        Args:
+            key: Snapshot key
+            indexes: Index names to include
+            counts: Index name -> event count the snapshot holds
+            manifest: Generator manifest, stored for reference
+
+        Returns:
+            True if the snapshot was written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        archive, metadata_path = self._paths(key)
+        paths = SNAPSHOT_CONFIG_PATHS + [f"var/lib/splunk/{index}" for index in indexes]
+
+        print(f"Saving index snapshot {key}...")
+        start_time = time.time()
+        if not self._docker("stop"):
+            return False
+        try:
+            saved = self._run_helper(["czpf", f"/backup/{os.path.basename(archive)}",
+                                      "-C", SPLUNK_HOME] + paths)
+        finally:
+            started = self._docker("start")
+
+        if not saved:
+            return False
+
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "key": key,
+                "created": time.time(),
+                "indexes": indexes,
+                "counts": counts,
+                "manifest": manifest
+            }, f, indent=2)
+
+        self.prune(keep=key)
+        size_mb = os.path.getsize(archive) / (1024 * 1024)
+        print(f"✓ Snapshot saved ({size_mb:.1f} MB, {time.time() - start_time:.0f}s)")
+        return started
+
+    def restore(self, key: str) -> bool:
+        """
+        Restore a snapshot into the container
+
+        The container is stopped while the files are extracted and started
+        again afterwards; the caller waits for Splunk to become ready.
+
+        Args:
+            key: Snapshot key
+
+        Returns:
+            True if the snapshot was extracted and the container restarted
+        """
+        archive, _ = self._paths(key)
+
+        print(f"Restoring index snapshot {key}...")
+        start_time = time.time()
+        if not self._docker("stop"):
+            return False
+        try:
+            restored = self._run_helper(["xzpf", f"/backup/{os.path.basename(archive)}",
+                                         "-C", SPLUNK_HOME])
+        finally:
+            started = self._docker("start")
+
+        if restored and started:
+            print(f"✓ Snapshot restored ({time.time() - start_time:.0f}s)")
+        return restored and started
+
+    def prune(self, keep: Optional[str] = None):
+        """
+        Delete snapshots other than 'keep'
+
+        Args:
+            keep: Key of the snapshot to keep (None = delete all)
+        """
+        for path in glob.glob(os.path.join(self.directory, "splunk-indexes-*")):
+            if keep and os.path.basename(path).startswith(f"splunk-indexes-{keep}."):
+                continue
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"  ⚠ Could not remove {path}: {e}")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+SPL Optimization Advisor for Course Testing
+Flags costly search patterns and rewrites queries where the result is unchanged
+"""
+
+import re
+from typing import Dict, List, Any, Optional
+
+from .columnar import summarize_fields
+from .query_planner import split_pipeline
+from .result_cache import INDEX_PATTERN
+
+
+# Commands that aggregate events (field pruning before them is automatic)
+TRANSFORMING_COMMANDS = {"stats", "chart", "timechart", "top", "rare", "tstats", "contingency"}
+
+# Commands that filter events
+FILTER_COMMANDS = {"search", "where", "regex"}
+
+# Fields tstats can group and filter by without reading raw events
+INDEXED_FIELDS = {"index", "sourcetype", "source", "host", "splunk_server"}
+
+# Rule name -> (severity, advice)
+RULES = {
+    "all_indexes": ("high", "Searches every index; name the indexes the search needs"),
+    "join": ("high", "join runs a capped subsearch; a stats by the shared field over "
+                     "both data sets is usually faster and not truncated"),
+    "transaction": ("high", "transaction keeps events in memory; use stats with "
+                            "min(_time)/max(_time) by the grouping field where possible"),
+    "late_fields": ("medium", "Streaming commands run before any 'fields'; add "
+                              "'| fields' with the needed fields right after the base search"),
+    "rex_on_raw": ("medium", "rex scans _raw; extract from a specific field or use "
+                             "search-time extractions"),
+    "dedup_before_filter": ("medium", "dedup runs before a filter; filter first so "
+                                      "dedup processes fewer events"),
+    "tstats_count": ("info", "Pure count over indexed fields; tstats answers it from "
+                             "index metadata without reading events"),
+}
+
+COMMAND_PATTERN = re.compile(r"^\s*(\w+)\s*(.*)$", re.DOTALL)
+TERM_PATTERN = re.compile(r'"[^"]*"|\(|\)|[^\s()]+')
+FIELD_TERM_PATTERN = re.compile(r'^(\w+)\s*(=|!=)\s*("[^"]*"|\S+)$')
+STATS_COUNT_PATTERN = re.compile(
+    r"^count(?:\s+as\s+(\w+))?(?:\s+by\s+([\w\s,]+))?$", re.IGNORECASE
+)
+
+
+class SearchCommand:
+    """One command of an SPL pipeline"""
+
+    def __init__(self, name: str, args: str, text: str):
+        self.name = name
+        self.args = args
+        self.text = text
+
+
+def parse_pipeline(query: str) -> List[SearchCommand]:
+    """
+    Parse an SPL query into its commands
+
+    The base search of a query not starting with '|' becomes a 'search'
+    command; subsearches stay part of the command they appear in.
+
+    Args:
+        query: SPL search query
+
+    Returns:
+        Commands in pipeline order
+    """
+    stripped = query.strip()
+    generating = stripped.startswith("|")
+    parts = split_pipeline(stripped[1:] if generating else stripped)
+
+    commands = []
+    for position, part in enumerate(parts):
+        match = COMMAND_PATTERN.match(part)
+        name, args = (match.group(1).lower(), match.group(2).strip()) if match else ("", part)
+        if position == 0 and not generating and name != "search":
+            name, args = "search", part
+        commands.append(SearchCommand(name, args, part))
+    return commands
+
+
+def _finding(rule: str, position: int) -> Dict[str, Any]:
+    severity, message = RULES[rule]
+    return {"rule": rule, "severity": severity, "message": message, "command": position}
+
+
+def tstats_rewrite(query: str) -> Optional[str]:
+    """
+    Rewrite a pure event count into a tstats search
+
+    Applies only when the base search filters on indexed fields alone
+    (index, sourcetype, source, host, time modifiers) and the first
+    command is 'stats count [as X] [by <indexed fields>]'; later commands
+    are kept, as tstats produces the same fields.
+
+    Args:
+        query: SPL search query
+
+    Returns:
+        Equivalent tstats query, or None if the rewrite is not safe
+    """
+    commands = parse_pipeline(query)
+    if len(commands) < 2 or query.strip().startswith("|"):
+        return None
+    base, stats = commands[0], commands[1]
+    if stats.name != "stats" or not base.args:
+        return None
+
+    for term in TERM_PATTERN.findall(base.args):
+        if term in ("(", ")") or term.upper() == "OR":
+            continue
+        match = FIELD_TERM_PATTERN.match(term)
+        if not match:
+            return None
+        field = match.group(1).lower()
+        if field not in INDEXED_FIELDS and field not in ("earliest", "latest"):
+            return None
+
+    match = STATS_COUNT_PATTERN.match(stats.args)
+    if not match:
+        return None
+    alias, by_clause = match.groups()
+    by_fields = [field for field in re.split(r"[\s,]+", by_clause or "") if field]
+    if any(field.lower() not in INDEXED_FIELDS for field in by_fields):
+        return None
+
+    rewritten = "| tstats count"
+    if alias:
+        rewritten += f" as {alias}"
+    rewritten += f" where {base.args}"
+    if by_fields:
+        rewritten += " by " + ", ".join(by_fields)
+    rest = [command.text for command in commands[2:]]
+    return " | ".join([rewritten] + rest)
+
+
+def analyze_query(query: str) -> Dict[str, Any]:
+    """
+    Check a query for costly patterns
+
+    Args:
+        query: SPL search query
+
+    Returns:
+        Dictionary with the parsed command names, findings (rule,
+        severity, message, command position) and a safe 'rewrite' (None
+        if there is none)
+    """
+    commands = parse_pipeline(query)
+    names = [command.name for command in commands]
+    findings = []
+
+    # Base search without an index (or index=*) scans every index
+    if not query.strip().startswith("|"):
+        indexes = {match.lower() for match in INDEX_PATTERN.findall(commands[0].args)}
+        if not indexes or "*" in indexes:
+            findings.append(_finding("all_indexes", 0))
+
+    first_transform = next((i for i, name in enumerate(names) if name in TRANSFORMING_COMMANDS),
+                           len(names))
+    seen_fields = False
+    late_fields_flagged = False
+    for position, command in enumerate(commands):
+        if position == 0:
+            continue
+        name = command.name
+        if name == "fields":
+            seen_fields = True
+        elif (position < first_transform and not seen_fields and not late_fields_flagged
+              and name in ("eval", "rex", "lookup", "spath", "rename", "fillnull")):
+            findings.append(_finding("late_fields", position))
+            late_fields_flagged = True
+
+        if name == "join":
+            findings.append(_finding("join", position))
+        elif name == "transaction":
+            findings.append(_finding("transaction", position))
+        elif name == "rex":
+            field = re.search(r"\bfield\s*=\s*(\w+)", command.args)
+            if field is None or field.group(1) == "_raw":
+                findings.append(_finding("rex_on_raw", position))
+        elif name == "dedup" and any(later in FILTER_COMMANDS for later in names[position + 1:]):
+            findings.append(_finding("dedup_before_filter", position))
+
+    rewrite = tstats_rewrite(query)
+    if rewrite is not None:
+        findings.append(_finding("tstats_count", 1))
+
+    return {"commands": names, "findings": findings, "rewrite": rewrite}
+
+
+def compare_variants(client, query: str, rewrite: str, earliest_time: str = "-24h",
+                     latest_time: str = "now", repeat: int = 3) -> Dict[str, Any]:
+    """
+    Run a query and its rewrite alternately and compare their cost
+
+    Args:
+        client: Logged-in SplunkClient
+        query: Original query
+        rewrite: Rewritten query
+        earliest_time: Earliest time for both searches
+        latest_time: Latest time for both searches
+        repeat: Runs of each variant (medians are compared)
+
+    Returns:
+        Dictionary with success, median runDuration and scanCount of each
+        variant, the speedup (original / rewrite) and whether both
+        returned the same number of results
+    """
+    samples = {"original": [], "rewrite": []}
+    for _ in range(max(1, repeat)):
+        for variant, text in (("original", query), ("rewrite", rewrite)):
+            with client.search_job(text, earliest_time, latest_time) as job:
+                if not job.wait():
+                    return {"success": False, "error": f"{variant} search failed or timed out"}
+                info = job.info()
+            if not info["success"]:
+                return {"success": False, "error": info.get("error", "No job information")}
+            samples[variant].append(info)
+
+    summary = {"success": True}
+    for variant, infos in samples.items():
+        medians = summarize_fields(infos, ["run_duration", "scan_count"])
+        summary[variant] = {
+            "run_duration": medians["run_duration"],
+            "scan_count": int(medians["scan_count"]),
+            "result_count": int(infos[-1]["result_count"] or 0)
+        }
+
+    original, rewritten = summary["original"], summary["rewrite"]
+    summary["speedup"] = (original["run_duration"] / rewritten["run_duration"]
+                          if rewritten["run_duration"] > 0 else None)
+    summary["same_result_count"] = original["result_count"] == rewritten["result_count"]
+    return summary
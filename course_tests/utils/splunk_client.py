@@ -5,18 +5,41 @@ Provides interface to execute searches and validate results
 """
 
 import requests
+import os
 import time
 import json
+import threading
+import uuid
 import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
-from urllib.parse import urljoin
+from urllib.parse import urljoin, quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .result_cache import ResultCache, extract_indexes
+from .columnar import ColumnarResults
+from .job_profile import build_job_profile
+
+
+# Prefix of every search job ID created by this client, used to find
+# orphaned jobs (e.g. from interrupted runs) during cleanup
+SID_PREFIX = "coursetest"
+
+# Seconds after which a job of another run counts as orphaned; longer than
+# a search timeout plus the TTL of kept base jobs
+DEFAULT_ORPHAN_AGE = 3600
 
 
 class SplunkClient:
     """Client for interacting with Splunk REST API"""
 
     def __init__(self, host: str = "localhost", port: int = 8089,
-                 username: str = "admin", password: str = "changeme"):
+                 username: str = "admin", password: str = "changeme",
+                 result_cache: Optional[ResultCache] = None,
+                 job_ttl: Optional[int] = 60, delete_jobs: bool = True,
+                 token_file: Optional[str] = None, pool_size: int = 10,
+                 max_retries: int = 3, keep_alive: bool = True):
         """
         Initialize Splunk client
 
@@ -25,6 +48,17 @@ class SplunkClient:
             port: Splunk management port (default 8089)
             username: Splunk username
             password: Splunk password
+            result_cache: Optional cache for execute_search results
+            job_ttl: Seconds a finished job's artifacts are kept on the
+                search head (None = server default, normally 10 minutes)
+            delete_jobs: Delete jobs as soon as execute_search has
+                fetched their results
+            token_file: File used to share the session key across processes
+                (None = always log in with username/password)
+            pool_size: Maximum pooled connections to the management port;
+                size this to the number of threads issuing requests
+            max_retries: Retries for failed connections and idempotent requests
+            keep_alive: Reuse HTTP connections between requests
         """
         self.host = host
         self.port = port
@@ -32,16 +66,222 @@ class SplunkClient:
         self.password = password
         self.base_url = f"https://{host}:{port}"
         self.session_key = None
+        self.token_file = token_file
         self.session = requests.Session()
         self.session.verify = False  # Disable SSL verification for testing
+        self.configure_pool(pool_size, max_retries, keep_alive)
+        self._auth_lock = threading.Lock()
+        self.result_cache = result_cache
+        self.job_ttl = job_ttl
+        self.delete_jobs = delete_jobs
+        self.created_jobs = set()
+        # Part of every SID this client creates, so cleanup can tell runs apart
+        self.run_id = uuid.uuid4().hex[:8]
+        self.governor = None
+        self.collect_job_stats = False
+        self.collect_job_profile = False
+        # Indexes searched by queries that name none (None = index=*)
+        self.default_indexes: Optional[List[str]] = None
+        self._jobs_lock = threading.Lock()
+
+    def configure_pool(self, pool_size: int, max_retries: int = 3, keep_alive: bool = True):
+        """
+        Size the connection pool and set up retries and keep-alive
+
+        Args:
+            pool_size: Maximum pooled connections to the management port
+            max_retries: Retries for failed connections and idempotent requests
+            keep_alive: Reuse HTTP connections between requests
+        """
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.keep_alive = keep_alive
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "DELETE"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if keep_alive:
+            self.session.headers.pop("Connection", None)
+        else:
+            self.session.headers["Connection"] = "close"
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, logging in again once if the session key has expired
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            **kwargs: Passed through to requests
+
+        Returns:
+            Response object
+        """
+        sent_key = self.session_key
+        response = self.session.request(method, url, **kwargs)
+
+        if response.status_code == 401 and self.password and self._relogin(sent_key):
+            response = self.session.request(method, url, **kwargs)
+
+        return response
+
+    def _relogin(self, stale_key: Optional[str]) -> bool:
+        """
+        Replace an expired session key
+
+        Only the first thread to notice the expiry logs in again; the
+        others reuse the key it obtained.
+        """
+        with self._auth_lock:
+            if self.session_key and self.session_key != stale_key:
+                return True
+
+            print("Session key expired, logging in again...")
+            return self._password_login()
 
     def login(self) -> bool:
         """
         Authenticate with Splunk and get session key
 
+        A session key stored in the token file is reused when it is still
+        valid; otherwise the client logs in with username and password.
+
         Returns:
             True if login successful, False otherwise
         """
+        with self._auth_lock:
+            if self.token_file and self._load_session_key():
+                return True
+            return self._password_login()
+
+    def wait_until_ready(self, timeout: float = 300, interval: float = 2.0,
+                         settle: float = 10.0) -> bool:
+        """
+        Wait for splunkd to answer REST requests, then log in
+
+        Polls /services/server/health/splunkd (or /services/server/info on
+        servers without the health endpoint) and requires it to keep
+        answering for 'settle' seconds, so a restart during container
+        provisioning is not mistaken for readiness.
+
+        Args:
+            timeout: Maximum seconds to wait
+            interval: Seconds between probes
+            settle: Seconds the server must stay up before it counts as ready
+
+        Returns:
+            True if the server is ready and login succeeded
+        """
+        start_time = time.time()
+        up_since = None
+        health = None
+
+        while time.time() - start_time < timeout:
+            health = self._probe_health()
+            if health is None:
+                up_since = None
+            elif up_since is None:
+                up_since = time.time()
+            elif time.time() - up_since >= settle:
+                print(f"✓ Splunk is ready after {time.time() - start_time:.0f}s (health: {health})")
+                return self.login()
+            time.sleep(interval)
+
+        print(f"✗ Splunk not ready after {timeout:.0f}s (last health: {health or 'unreachable'})")
+        return False
+
+    def _probe_health(self) -> Optional[str]:
+        """
+        Probe splunkd once
+
+        Returns:
+            Health color ('green', 'yellow', 'red'), 'up' if the server
+            answers but has no health endpoint, or None if it is not up
+        """
+        auth = (self.username, self.password)
+        try:
+            response = self.session.get(
+                urljoin(self.base_url, "/services/server/health/splunkd"),
+                params={"output_mode": "json"}, auth=auth, timeout=5
+            )
+            if response.status_code == 200:
+                return response.json().get("entry", [{}])[0].get("content", {}).get("health", "up")
+            if response.status_code == 404:
+                response = self.session.get(urljoin(self.base_url, "/services/server/info"),
+                                            auth=auth, timeout=5)
+                return "up" if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            pass
+        return None
+
+    def _set_session_key(self, session_key: Optional[str]):
+        """Set (or clear) the session key used for all requests"""
+        self.session_key = session_key
+        if session_key:
+            self.session.headers.update({"Authorization": f"Splunk {session_key}"})
+        else:
+            self.session.headers.pop("Authorization", None)
+
+    def _load_session_key(self) -> bool:
+        """
+        Load and validate a session key from the token file
+
+        Returns:
+            True if a stored key is valid for this host and user
+        """
+        try:
+            with open(self.token_file, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (stored.get("base_url"), stored.get("username")) != (self.base_url, self.username):
+            return False
+
+        self._set_session_key(stored.get("session_key"))
+        try:
+            response = self.session.get(
+                urljoin(self.base_url, "/services/authentication/current-context"),
+                params={"output_mode": "json"}, timeout=30
+            )
+            if response.status_code == 200:
+                return True
+        except Exception:
+            pass
+
+        self._set_session_key(None)
+        return False
+
+    def _save_session_key(self):
+        """Write the current session key to the token file (owner-only permissions)"""
+        try:
+            directory = os.path.dirname(os.path.abspath(self.token_file))
+            os.makedirs(directory, exist_ok=True)
+            fd = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "base_url": self.base_url,
+                    "username": self.username,
+                    "session_key": self.session_key
+                }, f)
+        except OSError as e:
+            print(f"Could not save session key to {self.token_file}: {e}")
+
+    def _password_login(self) -> bool:
+        """Log in with username and password (caller holds the auth lock)"""
+        self._set_session_key(None)
+
         url = urljoin(self.base_url, "/services/auth/login")
         data = {
             "username": self.username,
@@ -64,10 +304,9 @@ class SplunkClient:
                 session_key = root.find(".//sessionKey")
 
             if session_key is not None:
-                self.session_key = session_key.text
-                self.session.headers.update({
-                    "Authorization": f"Splunk {self.session_key}"
-                })
+                self._set_session_key(session_key.text)
+                if self.token_file:
+                    self._save_session_key()
                 return True
 
             print("Login failed: No session key in response")
@@ -80,7 +319,8 @@ class SplunkClient:
             return False
 
     def create_search(self, query: str, earliest_time: str = "-24h",
-                     latest_time: str = "now") -> Optional[str]:
+                     latest_time: str = "now", ttl: Optional[int] = None,
+                     job_params: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         Create a search job
 
@@ -88,6 +328,8 @@ class SplunkClient:
             query: SPL search query
             earliest_time: Earliest time for search
             latest_time: Latest time for search
+            ttl: Seconds to keep the finished job (None = client job_ttl)
+            job_params: Extra search/jobs parameters (e.g. max_count)
 
         Returns:
             Search job ID (sid) if successful, None otherwise
@@ -96,33 +338,50 @@ class SplunkClient:
         if not query.strip().startswith(("search", "|", "Search", "SEARCH")):
             query = f"search {query}"
 
-        # Add index=* if no index is specified (to search all custom indexes)
+        # Add the default indexes (index=* if none are set) if no index is specified
         # Don't add if it's a generating command (starts with |) or already has index=
         query_lower = query.lower()
         if not query_lower.startswith("|") and "index=" not in query_lower and "| inputlookup" not in query_lower:
-            # Insert index=* after 'search' keyword
+            # Insert the index filter after 'search' keyword
             if query_lower.startswith("search "):
-                query = query[:7] + "index=* " + query[7:]
+                query = query[:7] + self._default_index_filter() + " " + query[7:]
 
         url = urljoin(self.base_url, "/services/search/jobs")
         data = {
             "search": query,
             "earliest_time": earliest_time,
             "latest_time": latest_time,
+            "id": f"{SID_PREFIX}_{self.run_id}_{uuid.uuid4().hex}",
             "output_mode": "json"
         }
 
+        ttl = ttl if ttl is not None else self.job_ttl
+        if ttl is not None:
+            data["timeout"] = ttl
+        if job_params:
+            data.update(job_params)
+
         try:
-            response = self.session.post(url, data=data)
+            response = self._request("POST", url, data=data)
             response.raise_for_status()
 
             result = response.json()
-            return result.get("sid")
+            sid = result.get("sid")
+            if sid:
+                with self._jobs_lock:
+                    self.created_jobs.add(sid)
+            return sid
 
         except Exception as e:
             print(f"Failed to create search: {e}")
             return None
 
+    def _default_index_filter(self) -> str:
+        """Index filter added to searches that name no index"""
+        if not self.default_indexes:
+            return "index=*"
+        return "(" + " OR ".join(f"index={index}" for index in self.default_indexes) + ")"
+
     def wait_for_job(self, sid: str, timeout: int = 300) -> bool:
         """
         Wait for search job to complete
@@ -139,7 +398,7 @@ class SplunkClient:
 
         while time.time() - start_time < timeout:
             try:
-                response = self.session.get(url, params={"output_mode": "json"})
+                response = self._request("GET", url, params={"output_mode": "json"})
                 response.raise_for_status()
 
                 result = response.json()
@@ -163,17 +422,21 @@ class SplunkClient:
         print(f"Job {sid} timed out after {timeout} seconds")
         return False
 
-    def get_results(self, sid: str, count: int = 0) -> List[Dict[str, Any]]:
+    def get_results(self, sid: str, count: int = 0, columnar: bool = False):
         """
         Get search results
 
         Args:
             sid: Search job ID
             count: Maximum number of results (0 = all)
+            columnar: Return a ColumnarResults table instead of a list
 
         Returns:
-            List of result dictionaries
+            List of result dictionaries (or ColumnarResults if columnar)
         """
+        if columnar:
+            return ColumnarResults.from_rows(self.get_results(sid, count))
+
         url = urljoin(self.base_url, f"/services/search/jobs/{sid}/results")
         params = {
             "output_mode": "json",
@@ -181,7 +444,7 @@ class SplunkClient:
         }
 
         try:
-            response = self.session.get(url, params=params)
+            response = self._request("GET", url, params=params)
             response.raise_for_status()
 
             result = response.json()
@@ -192,7 +455,9 @@ class SplunkClient:
             return []
 
     def execute_search(self, query: str, earliest_time: str = "-24h",
-                      latest_time: str = "now", timeout: int = 300) -> Dict[str, Any]:
+                      latest_time: str = "now", timeout: int = 300,
+                      use_cache: bool = True, priority: int = 0,
+                      columnar: bool = False, max_results: int = 0) -> Dict[str, Any]:
         """
         Execute a search and return results
 
@@ -201,32 +466,547 @@ class SplunkClient:
             earliest_time: Earliest time for search
             latest_time: Latest time for search
             timeout: Maximum time to wait for results
+            use_cache: Consult the result cache (if one is configured)
+            priority: Admission priority when a governor is attached
+                (lower values are admitted first)
+            columnar: Also return the results as a ColumnarResults table
+                under the 'table' key (requires NumPy)
+            max_results: Fetch at most this many rows (0 = all); 'count'
+                still holds the job's total resultCount (the search fails
+                if the rows were truncated and the total cannot be read)
 
         Returns:
             Dictionary with 'success', 'results', and 'count' keys
+            ('cached' is True when the result came from the cache;
+            'queue_wait' holds the seconds spent waiting for a governor slot)
         """
+        result = self._execute_search(query, earliest_time, latest_time, timeout,
+                                      use_cache, priority, max_results)
+
+        if columnar and result["success"]:
+            result["table"] = ColumnarResults.from_rows(result["results"])
+
+        return result
+
+    def _execute_search(self, query: str, earliest_time: str, latest_time: str,
+                        timeout: int, use_cache: bool, priority: int,
+                        max_results: int = 0) -> Dict[str, Any]:
+        """Run a search through the result cache and concurrency governor"""
         if not self.session_key:
             if not self.login():
                 return {"success": False, "error": "Login failed", "results": [], "count": 0}
 
+        cache_key = None
+        if use_cache and self.result_cache is not None:
+            # Job statistics and profiles are only in results fetched with them
+            cache_key = self._get_cache_key(
+                query, earliest_time, latest_time,
+                f"max_results={max_results};job_stats={int(self.collect_job_stats)};"
+                f"job_profile={int(self.collect_job_profile)}"
+            )
+            if cache_key:
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    cached["cached"] = True
+                    cached["queue_wait"] = 0.0
+                    return cached
+
+        queue_wait = 0.0
+        if self.governor is not None:
+            queue_wait = self.governor.acquire(priority)
+            try:
+                result = self._run_search(query, earliest_time, latest_time, timeout, max_results)
+            finally:
+                self.governor.release()
+        else:
+            result = self._run_search(query, earliest_time, latest_time, timeout, max_results)
+
+        if cache_key and result["success"]:
+            self.result_cache.put(cache_key, result)
+
+        result["queue_wait"] = queue_wait
+        return result
+
+    def _run_search(self, query: str, earliest_time: str, latest_time: str,
+                    timeout: int, max_results: int = 0) -> Dict[str, Any]:
+        """Create a search job, wait for it and fetch its results"""
         # Create search job
         sid = self.create_search(query, earliest_time, latest_time)
         if not sid:
             return {"success": False, "error": "Failed to create search", "results": [], "count": 0}
 
-        # Wait for job to complete
+        # Wait for job to complete (cancel it so it stops using a search slot)
         if not self.wait_for_job(sid, timeout):
+            self.cancel_job(sid)
             return {"success": False, "error": "Search job failed or timed out", "results": [], "count": 0}
 
-        # Get results
-        results = self.get_results(sid)
+        # Get results (only the first rows when a limit is given; the
+        # total comes from the job's resultCount)
+        results = self.get_results(sid, count=max_results)
+        count = len(results)
+        job_info = None
+        if (self.collect_job_stats or self.collect_job_profile
+                or (max_results and count >= max_results)):
+            job_info = self.get_search_job_info(sid)
+            if max_results and count >= max_results:
+                if not job_info["success"]:
+                    # The rows were truncated, so their number is not the total
+                    if self.delete_jobs:
+                        self.delete_job(sid)
+                    return {"success": False, "sid": sid, "results": [], "count": 0,
+                            "error": f"Could not read the result count of job {sid}: "
+                                     f"{job_info.get('error', 'no job information')}"}
+                count = int(job_info["result_count"])
 
-        return {
+        if self.delete_jobs:
+            self.delete_job(sid)
+
+        result = {
             "success": True,
             "sid": sid,
             "results": results,
-            "count": len(results)
+            "count": count
         }
+        if self.collect_job_stats and job_info["success"]:
+            result["job"] = {
+                "run_duration": float(job_info["run_duration"] or 0),
+                "scan_count": int(job_info["scan_count"] or 0),
+                "event_count": int(job_info["event_count"] or 0)
+            }
+        if self.collect_job_profile and job_info["success"]:
+            result["job_profile"] = build_job_profile(job_info)
+        return result
+
+    def search_job(self, query: str, earliest_time: str = "-24h",
+                   latest_time: str = "now", ttl: Optional[int] = None,
+                   keep: bool = False,
+                   job_params: Optional[Dict[str, Any]] = None) -> "SearchJob":
+        """
+        Create a search job handle for use as a context manager
+
+        Example:
+            with client.search_job("index=web | stats count") as job:
+                if job.wait():
+                    results = job.results()
+
+        Args:
+            query: SPL search query
+            earliest_time: Earliest time for search
+            latest_time: Latest time for search
+            ttl: Seconds to keep the finished job (None = client job_ttl)
+            keep: Leave the job on the server when the block exits
+            job_params: Extra search/jobs parameters (e.g. max_count)
+
+        Returns:
+            SearchJob handle (the job is dispatched on entering the block)
+        """
+        return SearchJob(self, query, earliest_time, latest_time, ttl, keep, job_params)
+
+    def control_job(self, sid: str, action: str, **params) -> bool:
+        """
+        Send a control action to a search job
+
+        Args:
+            sid: Search job ID
+            action: Control action (cancel, finalize, pause, touch, setttl, ...)
+            **params: Extra parameters for the action (e.g. ttl=60)
+
+        Returns:
+            True if the action was accepted
+        """
+        url = urljoin(self.base_url, f"/services/search/jobs/{sid}/control")
+        data = {"action": action, "output_mode": "json"}
+        data.update(params)
+
+        try:
+            response = self._request("POST", url, data=data)
+            response.raise_for_status()
+            return True
+
+        except Exception as e:
+            print(f"Failed to {action} job {sid}: {e}")
+            return False
+
+    def cancel_job(self, sid: str) -> bool:
+        """
+        Cancel a running search job and remove its artifacts
+
+        Args:
+            sid: Search job ID
+
+        Returns:
+            True if the job was cancelled
+        """
+        cancelled = self.control_job(sid, "cancel")
+        if cancelled:
+            with self._jobs_lock:
+                self.created_jobs.discard(sid)
+        return cancelled
+
+    def set_job_ttl(self, sid: str, ttl: int) -> bool:
+        """
+        Change how long a search job is kept after it finishes
+
+        Args:
+            sid: Search job ID
+            ttl: Time to live in seconds
+
+        Returns:
+            True if the TTL was updated
+        """
+        return self.control_job(sid, "setttl", ttl=ttl)
+
+    def delete_job(self, sid: str) -> bool:
+        """
+        Delete a search job and its dispatch directory
+
+        Args:
+            sid: Search job ID
+
+        Returns:
+            True if the job was deleted (or no longer exists)
+        """
+        url = urljoin(self.base_url, f"/services/search/jobs/{sid}")
+
+        try:
+            response = self._request("DELETE", url, params={"output_mode": "json"})
+            if response.status_code != 404:
+                response.raise_for_status()
+
+            with self._jobs_lock:
+                self.created_jobs.discard(sid)
+            return True
+
+        except Exception as e:
+            print(f"Failed to delete job {sid}: {e}")
+            return False
+
+    def list_jobs(self, own_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        List search jobs created by course test clients
+
+        Args:
+            own_only: Only include jobs owned by this client's user
+
+        Returns:
+            List of dictionaries with 'sid', 'run_id' (None for SIDs without
+            one), 'owner', 'dispatch_state', 'is_done' and 'age' (seconds
+            since the job was created, None if unknown)
+        """
+        url = urljoin(self.base_url, "/services/search/jobs")
+
+        try:
+            response = self._request("GET", url, params={"output_mode": "json", "count": 0})
+            response.raise_for_status()
+
+            jobs = []
+            for entry in response.json().get("entry", []):
+                content = entry.get("content", {})
+                sid = content.get("sid") or entry.get("name", "")
+                if not sid.startswith(SID_PREFIX):
+                    continue
+                if own_only and entry.get("author") not in (None, self.username):
+                    continue
+
+                parts = sid.split("_")
+                try:
+                    published = datetime.fromisoformat(entry.get("published", ""))
+                    age = (datetime.now(timezone.utc) - published).total_seconds()
+                except (TypeError, ValueError):
+                    age = None
+
+                jobs.append({
+                    "sid": sid,
+                    "run_id": parts[1] if len(parts) == 3 else None,
+                    "owner": entry.get("author"),
+                    "dispatch_state": content.get("dispatchState"),
+                    "is_done": content.get("isDone", False),
+                    "age": age
+                })
+            return jobs
+
+        except Exception as e:
+            print(f"Failed to list search jobs: {e}")
+            return []
+
+    def cleanup_jobs(self, own_only: bool = True,
+                     min_age: float = DEFAULT_ORPHAN_AGE) -> Dict[str, int]:
+        """
+        Cancel and delete orphaned search jobs created by course test clients
+
+        Only jobs of other runs created at least min_age seconds ago are
+        reaped, so concurrent runs (a second runner, other shards, the
+        load simulator) keep their running and kept jobs.
+
+        Args:
+            own_only: Only reap jobs owned by this client's user
+            min_age: Seconds after creation a job of another run is orphaned
+
+        Returns:
+            Dictionary with 'found', 'cancelled', 'deleted' and 'skipped'
+            (recent or of this run) counts
+        """
+        jobs = self.list_jobs(own_only)
+        summary = {"found": len(jobs), "cancelled": 0, "deleted": 0, "skipped": 0}
+
+        for job in jobs:
+            if job["run_id"] == self.run_id or job["age"] is None or job["age"] < min_age:
+                summary["skipped"] += 1
+            elif not job["is_done"] and self.cancel_job(job["sid"]):
+                summary["cancelled"] += 1
+            elif self.delete_job(job["sid"]):
+                summary["deleted"] += 1
+
+        return summary
+
+    def release_jobs(self) -> int:
+        """
+        Delete every job this client created that is still on the server
+
+        Returns:
+            Number of jobs deleted
+        """
+        with self._jobs_lock:
+            sids = list(self.created_jobs)
+
+        return sum(1 for sid in sids if self.delete_job(sid))
+
+    def save_search(self, name: str, search: str, app: str = "search", **params) -> bool:
+        """
+        Create a saved search, or update it if it already exists
+
+        Args:
+            name: Saved search name
+            search: SPL query
+            app: App the saved search belongs to (shared with all users)
+            **params: Further saved search settings (e.g. cron_schedule,
+                is_scheduled, action.summary_index)
+
+        Returns:
+            True if the saved search exists with the given settings
+        """
+        url = urljoin(self.base_url, f"/servicesNS/nobody/{app}/saved/searches")
+        data = {"search": search, "output_mode": "json"}
+        data.update(params)
+
+        try:
+            response = self._request("POST", url, data=dict(data, name=name))
+            if response.status_code == 409:
+                # Already exists: update it in place (the name is part of the URL)
+                response = self._request("POST", f"{url}/{quote(name, safe='')}", data=data)
+            response.raise_for_status()
+            return True
+
+        except Exception as e:
+            print(f"Failed to save search {name}: {e}")
+            return False
+
+    def get_search_limits(self) -> Dict[str, Any]:
+        """
+        Read the concurrent-search limits that apply to this user
+
+        Combines the role quota (highest srchJobsQuota across the user's
+        roles, including imported ones) with the system-wide limit
+        max_searches_per_cpu * cores + base_max_searches from limits.conf.
+
+        Returns:
+            Dictionary with 'user_quota', 'system_limit' and 'effective'
+            (None where a value could not be read; 0 quota = unlimited)
+        """
+        limits = {"user_quota": None, "system_limit": None, "effective": None}
+
+        def get_content(path):
+            response = self._request("GET", urljoin(self.base_url, path),
+                                     params={"output_mode": "json"})
+            response.raise_for_status()
+            return response.json().get("entry", [{}])[0].get("content", {})
+
+        try:
+            roles = get_content("/services/authentication/current-context").get("roles", [])
+            quotas = []
+            for role in roles:
+                content = get_content(f"/services/authorization/roles/{role}")
+                for key in ("srchJobsQuota", "imported_srchJobsQuota"):
+                    if content.get(key) is not None:
+                        quotas.append(int(content[key]))
+            if quotas:
+                limits["user_quota"] = max(quotas)
+        except Exception as e:
+            print(f"Could not read role search quota: {e}")
+
+        try:
+            search_limits = get_content("/services/configs/conf-limits/search")
+            server_info = get_content("/services/server/info")
+            cores = int(server_info.get("numberOfVirtualCores") or server_info.get("numberOfCores") or 1)
+            per_cpu = int(search_limits.get("max_searches_per_cpu", 1))
+            base = int(search_limits.get("base_max_searches", 6))
+            limits["system_limit"] = per_cpu * cores + base
+        except Exception as e:
+            print(f"Could not read system search limits: {e}")
+
+        candidates = [limit for limit in (limits["user_quota"], limits["system_limit"]) if limit]
+        if candidates:
+            limits["effective"] = min(candidates)
+
+        return limits
+
+    def get_data_fingerprint(self, indexes: List[str]) -> Optional[str]:
+        """
+        Get a cheap fingerprint of the data stored in the given indexes
+
+        Uses tstats (index-time metadata only) to read the event count and
+        latest _indextime per index, so the fingerprint changes whenever
+        events are added or removed.
+
+        Args:
+            indexes: Index names (wildcards allowed)
+
+        Returns:
+            Fingerprint string, or None if it could not be determined
+        """
+        key = tuple(sorted(indexes))
+        if self.result_cache is not None:
+            fingerprint = self.result_cache.get_fingerprint(key)
+            if fingerprint is not None:
+                return fingerprint
+
+        where = " OR ".join(f"index={index}" for index in key)
+        query = f"| tstats count max(_indextime) as latest where {where} by index"
+        result = self.execute_search(query, earliest_time="0", use_cache=False)
+        if not result["success"]:
+            return None
+
+        fingerprint = ";".join(
+            f"{row.get('index')}:{row.get('count')}:{row.get('latest')}"
+            for row in sorted(result["results"], key=lambda r: r.get("index", ""))
+        )
+
+        if self.result_cache is not None:
+            self.result_cache.set_fingerprint(key, fingerprint)
+        return fingerprint
+
+    def _get_cache_key(self, query: str, earliest_time: str,
+                       latest_time: str, options: str = "") -> Optional[str]:
+        """
+        Build a result cache key for a query
+
+        Returns None for queries whose inputs cannot be fingerprinted
+        (generating commands that read no index, such as inputlookup).
+        """
+        indexes = extract_indexes(query)
+        if not indexes:
+            if query.strip().startswith("|"):
+                return None
+            # create_search() adds the default indexes when no index is given
+            indexes = list(self.default_indexes or ["*"])
+
+        fingerprint = self.get_data_fingerprint(indexes)
+        if fingerprint is None:
+            return None
+
+        return self.result_cache.make_key(query, earliest_time, latest_time, fingerprint, options)
+
+    def get_index_counts(self, method: str = "tstats") -> Optional[Dict[str, int]]:
+        """
+        Get event counts for all indexes in a single request
+
+        Args:
+            method: 'tstats' (one tstats search over index-time metadata) or
+                'rest' (totalEventCount from /services/data/indexes)
+
+        Returns:
+            Dictionary of index name -> event count, or None on failure
+        """
+        if method == "tstats":
+            result = self.execute_search("| tstats count where index=* by index",
+                                         earliest_time="0", use_cache=False)
+            if not result["success"]:
+                return None
+            return {row["index"]: int(row.get("count", 0))
+                    for row in result["results"] if row.get("index")}
+
+        url = urljoin(self.base_url, "/services/data/indexes")
+
+        try:
+            response = self._request("GET", url, params={"output_mode": "json", "count": 0})
+            response.raise_for_status()
+
+            return {
+                entry["name"]: int(entry.get("content", {}).get("totalEventCount") or 0)
+                for entry in response.json().get("entry", [])
+            }
+
+        except Exception as e:
+            print(f"Failed to get index counts: {e}")
+            return None
+
+    def get_indexing_queues(self) -> Optional[Dict[str, int]]:
+        """
+        Get the current fill of splunkd's ingestion queues
+
+        Returns:
+            Dictionary of queue name -> queued items, or None on failure
+        """
+        url = urljoin(self.base_url, "/services/server/introspection/queues")
+
+        try:
+            response = self._request("GET", url, params={"output_mode": "json", "count": 0})
+            response.raise_for_status()
+
+            return {
+                entry["name"]: int(entry.get("content", {}).get("current_size") or 0)
+                for entry in response.json().get("entry", [])
+            }
+
+        except Exception as e:
+            print(f"Failed to get indexing queues: {e}")
+            return None
+
+    def wait_for_index_counts(self, expected: Dict[str, int], timeout: float = 300,
+                              interval: float = 2.0, check_queues: bool = True) -> Dict[str, Any]:
+        """
+        Wait until every index holds at least the expected number of events
+
+        Polls per-index tstats counts and the ingestion queues; indexing
+        is complete once all counts are reached and the queues are empty.
+
+        Args:
+            expected: Index name -> number of events sent to it
+            timeout: Maximum seconds to wait
+            interval: Seconds between polls
+            check_queues: Also wait for the ingestion queues to drain (turn
+                off while other data is still being sent)
+
+        Returns:
+            Dictionary with success, the last counts, the indexes still
+            short of their expected count and the elapsed time
+        """
+        start_time = time.time()
+        last_report = 0.0
+        counts: Dict[str, int] = {}
+        pending = dict(expected)
+
+        while True:
+            counts = self.get_index_counts(method="tstats") or counts
+            pending = {
+                index: {"expected": want, "actual": counts.get(index, 0)}
+                for index, want in expected.items() if counts.get(index, 0) < want
+            }
+            queues = self.get_indexing_queues() if check_queues else None
+            queued = sum(queues.values()) if queues is not None else 0
+
+            elapsed = time.time() - start_time
+            if not pending and queued == 0:
+                return {"success": True, "counts": counts, "pending": {}, "elapsed": elapsed}
+            if elapsed >= timeout:
+                return {"success": False, "counts": counts, "pending": pending, "elapsed": elapsed}
+
+            if elapsed - last_report >= 10:
+                last_report = elapsed
+                waiting = ", ".join(f"{index} {item['actual']}/{item['expected']}"
+                                    for index, item in pending.items()) or "queues draining"
+                print(f"  ... {elapsed:.0f}s: {waiting} ({queued} items queued)")
+            time.sleep(interval)
 
     def check_index_data(self, index: str) -> Dict[str, Any]:
         """
@@ -295,7 +1075,7 @@ class SplunkClient:
         url = urljoin(self.base_url, f"/services/search/jobs/{sid}")
 
         try:
-            response = self.session.get(url, params={"output_mode": "json"})
+            response = self._request("GET", url, params={"output_mode": "json"})
             response.raise_for_status()
 
             result = response.json()
@@ -308,8 +1088,11 @@ class SplunkClient:
                 "is_done": content.get("isDone"),
                 "is_failed": content.get("isFailed"),
                 "result_count": content.get("resultCount", 0),
+                "event_count": content.get("eventCount", 0),
                 "scan_count": content.get("scanCount", 0),
-                "run_duration": content.get("runDuration", 0)
+                "run_duration": content.get("runDuration", 0),
+                "disk_usage": content.get("diskUsage", 0),
+                "performance": content.get("performance", {})
             }
 
         except Exception as e:
@@ -317,3 +1100,61 @@ class SplunkClient:
                 "success": False,
                 "error": str(e)
             }
+
+
+class SearchJob:
+    """
+    Handle for a single search job
+
+    Used as a context manager: the job is dispatched on entry and, on exit,
+    cancelled if still running and deleted unless 'keep' was requested.
+    """
+
+    def __init__(self, client: SplunkClient, query: str, earliest_time: str = "-24h",
+                 latest_time: str = "now", ttl: Optional[int] = None, keep: bool = False,
+                 job_params: Optional[Dict[str, Any]] = None):
+        self.client = client
+        self.job_params = job_params
+        self.query = query
+        self.earliest_time = earliest_time
+        self.latest_time = latest_time
+        self.ttl = ttl
+        self.keep = keep
+        self.sid = None
+        self.done = False
+
+    def __enter__(self) -> "SearchJob":
+        self.sid = self.client.create_search(
+            self.query, self.earliest_time, self.latest_time, ttl=self.ttl,
+            job_params=self.job_params
+        )
+        if not self.sid:
+            raise RuntimeError(f"Failed to create search: {self.query[:100]}")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def wait(self, timeout: int = 300) -> bool:
+        """Wait for the job to finish; returns True on success"""
+        self.done = self.client.wait_for_job(self.sid, timeout)
+        return self.done
+
+    def results(self, count: int = 0) -> List[Dict[str, Any]]:
+        """Fetch the job's results"""
+        return self.client.get_results(self.sid, count)
+
+    def info(self) -> Dict[str, Any]:
+        """Fetch the job's status and statistics"""
+        return self.client.get_search_job_info(self.sid)
+
+    def close(self):
+        """Cancel the job if unfinished and delete it unless kept"""
+        if not self.sid:
+            return
+
+        if not self.done:
+            self.client.cancel_job(self.sid)
+        elif not self.keep:
+            self.client.delete_job(self.sid)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Summary Searches for Course Testing
+Pre-computed hourly and daily aggregates behind the dashboard and trend tests
+"""
+
+import time
+from typing import Dict, List, Any, Optional
+
+from .splunk_client import SplunkClient
+from .result_cache import UNIT_SECONDS, extract_indexes
+
+
+# Index the summary rows are written to
+SUMMARY_INDEX = "summary"
+
+
+class SummarySearch:
+    """
+    A scheduled search writing per-span aggregates to the summary index
+
+    The search must produce one row per time bucket (and group) with
+    additive statistics (counts, sums, maxima), so reports over any range
+    can be rebuilt from the rows. The schedule summarizes the previous
+    complete span; bootstrap() backfills the spans it has not summarized.
+    """
+
+    def __init__(self, name: str, search: str, span: str,
+                 backfill_earliest: str = "-30d@d"):
+        """
+        Args:
+            name: Saved search name, also the 'source' of its summary rows
+            search: Aggregating SPL query
+            span: Bucket size, '1h' or '1d' (sets the schedule)
+            backfill_earliest: Start of the backfilled time range
+        """
+        self.name = name
+        self.search = search
+        self.span = span
+        self.backfill_earliest = backfill_earliest
+
+    def saved_search_params(self) -> Dict[str, Any]:
+        """Saved search settings: scheduled, summary indexing the previous span"""
+        unit = self.span[-1]
+        return {
+            "cron_schedule": "15 0 * * *" if unit == "d" else "5 * * * *",
+            "is_scheduled": 1,
+            "dispatch.earliest_time": f"-1{unit}@{unit}",
+            "dispatch.latest_time": f"@{unit}",
+            "action.summary_index": 1,
+            "action.summary_index._name": SUMMARY_INDEX
+        }
+
+    @property
+    def span_seconds(self) -> int:
+        """Bucket size in seconds"""
+        return int(self.span[:-1] or 1) * UNIT_SECONDS[self.span[-1]]
+
+    def backfill_query(self) -> str:
+        """
+        Query writing the summary rows for the backfill range
+
+        collect timestamps rows with info_min_time before _time, so the
+        range fields added by addinfo are dropped and each row keeps its
+        bucket's _time; info_search_time stays for the latest-run filter.
+        (Scheduled runs cover exactly one span, so there info_min_time is
+        the bucket start anyway.)
+        """
+        return (f'{self.search} | addinfo | fields - info_min_time, info_max_time, info_sid '
+                f'| collect index={SUMMARY_INDEX} source="{self.name}"')
+
+
+# Aggregates behind the timechart tests of Labs 3, 5, 6, 11 and 12
+COURSE_SUMMARIES = [
+    SummarySearch(
+        "course_web_hourly",
+        "index=web | bin _time span=1h | stats count, sum(response_time) as sum_response_time, "
+        "max(response_time) as max_response_time by _time, status",
+        "1h"
+    ),
+    SummarySearch(
+        "course_sales_daily",
+        "index=sales | bin _time span=1d | stats count, sum(final_amount) as revenue by _time",
+        "1d"
+    ),
+]
+
+
+def summary_source(name: str) -> str:
+    """
+    Base search over a summary's rows
+
+    A bucket summarized more than once (backfilled while still open, then
+    again by the schedule) keeps only the rows of its latest run, so rows
+    are never double-counted.
+
+    Args:
+        name: Summary search name
+
+    Returns:
+        SPL to append report commands to
+    """
+    return (f'index={SUMMARY_INDEX} source="{name}" '
+            f'| eventstats max(info_search_time) as latest_run by _time '
+            f'| where info_search_time=latest_run')
+
+
+class SummaryBootstrap:
+    """Creates the summary searches, backfills them and waits until they are complete"""
+
+    def __init__(self, client: SplunkClient, summaries: Optional[List[SummarySearch]] = None,
+                 timeout: float = 300, interval: float = 2.0):
+        """
+        Args:
+            client: Logged-in SplunkClient
+            summaries: Summary searches to set up (default: COURSE_SUMMARIES)
+            timeout: Seconds to wait for backfilled rows to become searchable
+            interval: Seconds between polls
+        """
+        self.client = client
+        self.summaries = summaries if summaries is not None else COURSE_SUMMARIES
+        self.timeout = timeout
+        self.interval = interval
+
+    def missing_buckets(self, summary: SummarySearch) -> Optional[List[int]]:
+        """
+        Find the buckets that hold raw events but no complete summary rows
+
+        A bucket is complete once a run that started after its latest
+        event was indexed summarized it, so unchanged buckets (the open
+        one included) are not summarized again.
+
+        Returns:
+            Sorted bucket start times (epoch seconds), or None if they
+            could not be determined (everything is backfilled then)
+        """
+        indexes = extract_indexes(summary.search)
+        if not indexes or any("*" in index for index in indexes):
+            return None
+        where = " OR ".join(f"index={index}" for index in indexes)
+
+        raw = self.client.execute_search(
+            f"| tstats max(_indextime) as indexed where {where} by _time span={summary.span} "
+            f"| eval bucket=_time",
+            earliest_time=summary.backfill_earliest, latest_time="now", use_cache=False)
+        existing = self.client.execute_search(
+            f'index={SUMMARY_INDEX} source="{summary.name}" '
+            f'| stats max(info_search_time) as last_run by _time | eval bucket=_time',
+            earliest_time=summary.backfill_earliest, latest_time="now", use_cache=False)
+        if not raw["success"] or not existing["success"]:
+            return None
+
+        last_runs = {int(float(row["bucket"])): float(row.get("last_run") or 0)
+                     for row in existing["results"] if row.get("bucket")}
+        return sorted(int(float(row["bucket"])) for row in raw["results"] if row.get("bucket")
+                      and last_runs.get(int(float(row["bucket"])), 0) < float(row.get("indexed") or 0))
+
+    @staticmethod
+    def bucket_ranges(buckets: List[int], span_seconds: int) -> List[tuple]:
+        """
+        Merge bucket start times into contiguous (earliest, latest) ranges
+
+        A range reaching past the current time ends at 'now'.
+        """
+        ranges = []
+        for bucket in buckets:
+            if ranges and ranges[-1][1] == bucket:
+                ranges[-1][1] = bucket + span_seconds
+            else:
+                ranges.append([bucket, bucket + span_seconds])
+        now = time.time()
+        return [(str(start), "now" if end > now else str(end)) for start, end in ranges]
+
+    def backfill(self, summary: SummarySearch, earliest_time: Optional[str] = None,
+                 latest_time: str = "now") -> Dict[str, Any]:
+        """
+        Summarize a time range (default: the whole backfill range, up to now)
+
+        Returns:
+            Dictionary with success, the number of rows written, the number
+            of distinct _time buckets and the run's info_search_time
+        """
+        # All rows are fetched (at most one per bucket and group) to count the buckets
+        result = self.client.execute_search(summary.backfill_query(),
+                                            earliest_time=earliest_time or summary.backfill_earliest,
+                                            latest_time=latest_time, use_cache=False)
+        if not result["success"]:
+            return {"success": False, "error": result.get("error", "Backfill search failed")}
+        if result["count"] == 0:
+            return {"success": False, "error": "Backfill produced no rows"}
+
+        return {"success": True, "rows": result["count"],
+                "buckets": len({row.get("_time") for row in result["results"]}),
+                "run_time": float(result["results"][0].get("info_search_time") or 0)}
+
+    def wait_until_complete(self, summary: SummarySearch, rows: int, buckets: int,
+                            run_time: float) -> Dict[str, Any]:
+        """
+        Wait until every row of a backfill run is searchable in its own bucket
+
+        Rows stamped with one shared time (instead of their bucket's
+        _time) would be found in a single bucket and never complete.
+
+        Args:
+            summary: Summary search
+            rows: Rows the backfill wrote
+            buckets: Distinct _time buckets among those rows
+            run_time: The backfill run's info_search_time
+
+        Returns:
+            Dictionary with success, rows and buckets found and elapsed time
+        """
+        query = (f'index={SUMMARY_INDEX} source="{summary.name}" '
+                 f'| where info_search_time>={run_time} | stats count, dc(_time) as buckets')
+        start_time = time.time()
+
+        while True:
+            found = self.client.execute_search(query, earliest_time=summary.backfill_earliest,
+                                               latest_time="now", use_cache=False)
+            row = found["results"][0] if found["success"] and found["results"] else {}
+            count, found_buckets = int(row.get("count", 0)), int(row.get("buckets", 0))
+            elapsed = time.time() - start_time
+            if count >= rows and found_buckets >= buckets:
+                return {"success": True, "rows": count, "buckets": found_buckets, "elapsed": elapsed}
+            if elapsed >= self.timeout:
+                return {"success": False, "rows": count, "buckets": found_buckets, "elapsed": elapsed}
+            time.sleep(self.interval)
+
+    def bootstrap(self) -> Dict[str, Any]:
+        """
+        Set up every summary: saved search, backfill, wait for completion
+
+        Only buckets without complete summary rows are backfilled, so
+        repeated runs do not pile up copies of the same buckets.
+
+        Returns:
+            Dictionary with overall success and per-summary outcomes
+        """
+        outcomes = {}
+        for summary in self.summaries:
+            if not self.client.save_search(summary.name, summary.search,
+                                           **summary.saved_search_params()):
+                print(f"✗ {summary.name}: could not create the scheduled search")
+                outcomes[summary.name] = {"success": False, "error": "Saved search not created"}
+                continue
+
+            missing = self.missing_buckets(summary)
+            if missing == []:
+                print(f"✓ {summary.name}: already complete, nothing to backfill")
+                outcomes[summary.name] = {"success": True, "rows": 0, "elapsed": 0.0}
+                continue
+            ranges = ([(summary.backfill_earliest, "now")] if missing is None
+                      else self.bucket_ranges(missing, summary.span_seconds))
+
+            backfill = {"success": True, "rows": 0, "buckets": 0, "run_time": None}
+            for earliest_time, latest_time in ranges:
+                part = self.backfill(summary, earliest_time, latest_time)
+                if not part["success"]:
+                    backfill = part
+                    break
+                backfill["rows"] += part["rows"]
+                backfill["buckets"] += part["buckets"]
+                backfill["run_time"] = (part["run_time"] if backfill["run_time"] is None
+                                        else min(backfill["run_time"], part["run_time"]))
+            if not backfill["success"]:
+                print(f"✗ {summary.name}: {backfill['error']}")
+                outcomes[summary.name] = backfill
+                continue
+
+            complete = self.wait_until_complete(summary, backfill["rows"], backfill["buckets"],
+                                                backfill["run_time"])
+            outcomes[summary.name] = {"success": complete["success"], "rows": backfill["rows"],
+                                      "elapsed": complete["elapsed"]}
+            if complete["success"]:
+                print(f"✓ {summary.name}: {backfill['rows']} rows in {backfill['buckets']} "
+                      f"buckets backfilled "
+                      f"({complete['elapsed']:.0f}s to become searchable)")
+            else:
+                print(f"✗ {summary.name}: {complete['rows']}/{backfill['rows']} rows in "
+                      f"{complete['buckets']}/{backfill['buckets']} time buckets searchable "
+                      f"after {complete['elapsed']:.0f}s")
+
+        return {"success": all(outcome["success"] for outcome in outcomes.values()),
+                "summaries": outcomes}
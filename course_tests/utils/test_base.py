@@ -4,9 +4,22 @@ Base Test Class for Course Lab Validation
 Provides common testing functionality
 """
 
+import contextlib
 import time
 from typing import Dict, List, Any, Optional
 from .splunk_client import SplunkClient
+from .query_planner import apply_head_limit
+from .latency import make_test_key
+from .summaries import COURSE_SUMMARIES, SummaryBootstrap
+from .columnar import summarize_fields
+
+
+# Indexes holding the course data
+COURSE_INDEXES = ["web", "app", "auth", "sales", "performance", "api"]
+
+# Number of result rows fetched per test: enough for the required-field
+# check and the sample results kept in reports
+SAMPLE_RESULTS = 3
 
 
 class LabTestResult:
@@ -36,6 +49,68 @@ class LabTestResult:
         }
 
 
+class QueryTest:
+    """Parameters of a single query test, independent of when it runs"""
+
+    def __init__(self, test_name: str, query: str, lab_number: int,
+                 expected_min_results: int = 0,
+                 expected_max_results: Optional[int] = None,
+                 earliest_time: str = "-24h",
+                 latest_time: str = "now",
+                 required_fields: Optional[List[str]] = None,
+                 latency_budget: Optional[float] = None,
+                 summary_query: Optional[str] = None):
+        self.test_name = test_name
+        self.query = query
+        self.lab_number = lab_number
+        self.expected_min_results = expected_min_results
+        self.expected_max_results = expected_max_results
+        self.earliest_time = earliest_time
+        self.latest_time = latest_time
+        self.required_fields = required_fields
+        self.latency_budget = latency_budget
+        # Equivalent query over the summary index (see utils/summaries.py)
+        self.summary_query = summary_query
+        # Scheduling metadata declared in the test catalog (None = unknown):
+        # 'light', 'medium' or 'heavy', and {"indexes": [...], "lookups": [...]}
+        self.cost_class: Optional[str] = None
+        self.depends_on: Optional[Dict[str, List[str]]] = None
+        # Run after the concurrent tests, one at a time (timing-sensitive)
+        self.serial = False
+
+    @property
+    def key(self) -> str:
+        """Identifier that is stable across runs (lab number and test name)"""
+        return make_test_key(self.lab_number, self.test_name)
+
+
+class SpeedupTest(QueryTest):
+    """
+    Paired benchmark: an optimized query must beat its naive form
+
+    'query' holds the optimized form, so tools that read the catalog see
+    the query the lab recommends.
+    """
+
+    def __init__(self, test_name: str, naive_query: str, optimized_query: str,
+                 lab_number: int, min_speedup: Optional[float] = None,
+                 min_scan_ratio: Optional[float] = None, repeat: int = 3,
+                 same_results: bool = False, setup_query: Optional[str] = None,
+                 ready_query: Optional[str] = None, earliest_time: str = "-24h",
+                 latest_time: str = "now", summaries: Optional[List[str]] = None):
+        super().__init__(test_name, optimized_query, lab_number, expected_min_results=1,
+                         earliest_time=earliest_time, latest_time=latest_time)
+        self.naive_query = naive_query
+        self.min_speedup = min_speedup
+        self.min_scan_ratio = min_scan_ratio
+        self.repeat = max(1, repeat)
+        self.same_results = same_results
+        self.setup_query = setup_query
+        self.ready_query = ready_query
+        self.summaries = summaries
+        self.serial = True
+
+
 class LabTestBase:
     """Base class for lab tests"""
 
@@ -52,13 +127,25 @@ class LabTestBase:
         self.lab_number = lab_number
         self.lab_name = lab_name
         self.results: List[LabTestResult] = []
+        # When set, run_query_test records tests here instead of running them
+        self.collector: Optional[List[Any]] = None
+        # Rows fetched per search (0 = all); counts come from job metadata
+        self.fetch_limit = SAMPLE_RESULTS
+        # Append '| head N' to tests without a maximum bound (None = off)
+        self.auto_head: Optional[int] = None
+        # LatencyGate checking passing tests against their budgets
+        self.latency_gate = None
+        # Run tests with a summary_query against the summary index
+        self.use_summaries = False
 
     def run_query_test(self, test_name: str, query: str,
                       expected_min_results: int = 0,
                       expected_max_results: Optional[int] = None,
                       earliest_time: str = "-24h",
                       latest_time: str = "now",
-                      required_fields: Optional[List[str]] = None) -> LabTestResult:
+                      required_fields: Optional[List[str]] = None,
+                      latency_budget: Optional[float] = None,
+                      summary_query: Optional[str] = None) -> LabTestResult:
         """
         Run a single query test
 
@@ -70,25 +157,293 @@ class LabTestBase:
             earliest_time: Search earliest time
             latest_time: Search latest time
             required_fields: List of fields that must exist in results
+            latency_budget: Maximum execution time in seconds when latency
+                gating is enabled (None = learn from earlier runs)
+            summary_query: Query returning the same report from the summary
+                index, run instead of 'query' when use_summaries is set
 
         Returns:
-            LabTestResult object
+            LabTestResult object (filled in later when collecting tests)
+        """
+        spec = QueryTest(
+            test_name, query, self.lab_number,
+            expected_min_results=expected_min_results,
+            expected_max_results=expected_max_results,
+            earliest_time=earliest_time,
+            latest_time=latest_time,
+            required_fields=required_fields,
+            latency_budget=latency_budget,
+            summary_query=summary_query
+        )
+        return self.submit_test(spec)
+
+    def run_speedup_test(self, test_name: str, naive_query: str, optimized_query: str,
+                         min_speedup: Optional[float] = None,
+                         min_scan_ratio: Optional[float] = None, repeat: int = 3,
+                         same_results: bool = False, setup_query: Optional[str] = None,
+                         ready_query: Optional[str] = None, earliest_time: str = "-24h",
+                         latest_time: str = "now",
+                         summaries: Optional[List[str]] = None) -> LabTestResult:
         """
-        result = LabTestResult(test_name, self.lab_number)
-        result.query = query
+        Run a paired benchmark of a naive and an optimized query
+
+        Both forms run alternately 'repeat' times; the test passes when the
+        median runDuration ratio (naive / optimized) reaches min_speedup and
+        the median scanCount ratio reaches min_scan_ratio.
+
+        Args:
+            test_name: Name of the test
+            naive_query: Query written the slow way
+            optimized_query: The lab's optimized form (must return results)
+            min_speedup: Minimum runDuration ratio (None = not checked)
+            min_scan_ratio: Minimum scanCount ratio (None = not checked)
+            repeat: Runs of each form
+            same_results: Also require equal result counts
+            setup_query: Search run once before measuring (e.g. populating
+                a summary index)
+            ready_query: Search polled after setup until it returns as many
+                results as the setup search did
+            earliest_time: Search earliest time
+            latest_time: Search latest time
+            summaries: Summary searches (see COURSE_SUMMARIES) the optimized
+                query reads; they are bootstrapped before measuring, which
+                writes nothing when they are already complete
+
+        Returns:
+            LabTestResult object (filled in later when collecting tests)
+        """
+        spec = SpeedupTest(
+            test_name, naive_query, optimized_query, self.lab_number,
+            min_speedup=min_speedup, min_scan_ratio=min_scan_ratio, repeat=repeat,
+            same_results=same_results, setup_query=setup_query, ready_query=ready_query,
+            earliest_time=earliest_time, latest_time=latest_time, summaries=summaries
+        )
+        return self.submit_test(spec)
+
+    def submit_test(self, spec: QueryTest) -> LabTestResult:
+        """
+        Run a test, or record it when a collector is attached
+
+        Args:
+            spec: Test parameters
+
+        Returns:
+            LabTestResult object (filled in later when collecting tests)
+        """
+        if self.use_summaries and spec.summary_query:
+            spec.query = spec.summary_query
+        result = LabTestResult(spec.test_name, self.lab_number)
+        result.query = spec.query
+
+        if self.collector is not None:
+            self.collector.append((self, spec, result))
+            return result
+
+        return self.execute_test(spec, result)
+
+    def execute_test(self, spec: QueryTest, result: LabTestResult,
+                     client: Optional[SplunkClient] = None) -> LabTestResult:
+        """
+        Execute a query test and record the outcome
+
+        Args:
+            spec: Test parameters
+            result: Result object to fill in
+            client: Client to run the search on (default: the lab's client)
+
+        Returns:
+            The filled-in LabTestResult
+        """
+        client = client or self.client
+
+        if isinstance(spec, SpeedupTest):
+            return self.execute_speedup_test(spec, result, client)
 
         try:
             start_time = time.time()
 
             # Execute search
-            search_result = self.client.execute_search(
-                query=query,
-                earliest_time=earliest_time,
-                latest_time=latest_time
+            search_result = client.execute_search(
+                query=self.prepare_query(spec),
+                earliest_time=spec.earliest_time,
+                latest_time=spec.latest_time,
+                max_results=self.fetch_limit
             )
 
+            return self.evaluate_search_result(spec, result, search_result,
+                                               time.time() - start_time)
+
+        except Exception as e:
+            result.passed = False
+            result.error_message = f"Exception during test: {str(e)}"
+
+        return result
+
+    def _measure_job(self, client: SplunkClient, query: str, spec: QueryTest) -> Dict[str, Any]:
+        """Run one search job and read its statistics before it is deleted"""
+        with client.search_job(query, spec.earliest_time, spec.latest_time) as job:
+            if not job.wait():
+                raise RuntimeError(f"Search failed or timed out: {query[:80]}")
+            info = job.info()
+        if not info["success"]:
+            raise RuntimeError(info.get("error", "No job information"))
+        return {
+            "run_duration": float(info["run_duration"] or 0),
+            "scan_count": int(info["scan_count"] or 0),
+            "result_count": int(info["result_count"] or 0)
+        }
+
+    def _wait_until_ready(self, client: SplunkClient, spec: "SpeedupTest", query: str,
+                          min_count: int = 1, timeout: float = 120,
+                          interval: float = 2.0) -> bool:
+        """Poll the ready query until it returns at least min_count results"""
+        deadline = time.time() + timeout
+        while True:
+            ready = client.execute_search(query, spec.earliest_time,
+                                          spec.latest_time, use_cache=False, max_results=1)
+            if ready["success"] and ready["count"] >= max(1, min_count):
+                return True
+            if time.time() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def execute_speedup_test(self, spec: "SpeedupTest", result: LabTestResult,
+                             client: SplunkClient) -> LabTestResult:
+        """
+        Execute a paired benchmark and check the speedup
+
+        Returns:
+            The filled-in LabTestResult
+        """
+        start_time = time.time()
+        slot = client.governor.slot() if client.governor is not None else contextlib.nullcontext()
+
+        try:
+            if spec.summaries:
+                summaries = [summary for summary in COURSE_SUMMARIES if summary.name in spec.summaries]
+                unknown = set(spec.summaries) - {summary.name for summary in summaries}
+                if unknown:
+                    result.error_message = f"Unknown summaries: {', '.join(sorted(unknown))}"
+                    return result
+                if not SummaryBootstrap(client, summaries).bootstrap()["success"]:
+                    result.error_message = f"Summaries not available: {', '.join(spec.summaries)}"
+                    return result
+
+            setup_rows = 1
+            if spec.setup_query:
+                setup = client.execute_search(spec.setup_query, spec.earliest_time,
+                                              spec.latest_time, use_cache=False, max_results=1)
+                if not setup["success"]:
+                    result.error_message = f"Setup search failed: {setup.get('error')}"
+                    return result
+                setup_rows = setup["count"]
+            if spec.ready_query and not self._wait_until_ready(client, spec, spec.ready_query,
+                                                               setup_rows):
+                result.error_message = "Setup data did not become searchable"
+                return result
+
+            samples = {"naive": [], "optimized": []}
+            with slot:
+                for _ in range(spec.repeat):
+                    samples["naive"].append(self._measure_job(client, spec.naive_query, spec))
+                    samples["optimized"].append(self._measure_job(client, spec.query, spec))
+
+        except Exception as e:
+            result.passed = False
+            result.error_message = f"Exception during test: {str(e)}"
+            return result
+
+        finally:
             result.execution_time = time.time() - start_time
 
+        medians = {
+            variant: summarize_fields(runs, ["run_duration", "scan_count", "result_count"])
+            for variant, runs in samples.items()
+        }
+        naive, optimized = medians["naive"], medians["optimized"]
+        speedup = (naive["run_duration"] / optimized["run_duration"]
+                   if optimized["run_duration"] > 0 else float("inf"))
+        scan_ratio = (naive["scan_count"] / optimized["scan_count"]
+                      if optimized["scan_count"] > 0 else float("inf"))
+
+        result.result_count = int(optimized["result_count"])
+        result.details = {
+            "naive_query": spec.naive_query,
+            "naive": naive,
+            "optimized": optimized,
+            "speedup": speedup,
+            "scan_ratio": scan_ratio,
+            "min_speedup": spec.min_speedup,
+            "min_scan_ratio": spec.min_scan_ratio,
+            "runs": spec.repeat
+        }
+
+        if result.result_count < spec.expected_min_results:
+            result.error_message = "Optimized query returned no results"
+        elif spec.same_results and naive["result_count"] != optimized["result_count"]:
+            result.error_message = (f"Result counts differ: naive {int(naive['result_count'])}, "
+                                    f"optimized {result.result_count}")
+        elif spec.min_speedup is not None and speedup < spec.min_speedup:
+            result.error_message = (f"Speedup {speedup:.2f}x below {spec.min_speedup:.1f}x "
+                                    f"({naive['run_duration']:.2f}s vs {optimized['run_duration']:.2f}s)")
+        elif spec.min_scan_ratio is not None and scan_ratio < spec.min_scan_ratio:
+            result.error_message = (f"Scan ratio {scan_ratio:.1f}x below {spec.min_scan_ratio:.1f}x "
+                                    f"({int(naive['scan_count'])} vs {int(optimized['scan_count'])} events)")
+        else:
+            result.passed = True
+        return result
+
+    def head_limit(self, spec: QueryTest) -> Optional[int]:
+        """
+        Get the auto-head limit for a test
+
+        Returns:
+            Number of results the assertions need, or None if the query
+            must not be limited (auto-head off, or a maximum bound to check)
+        """
+        if self.auto_head is None or spec.expected_max_results is not None:
+            return None
+        return max(self.auto_head, spec.expected_min_results, self.fetch_limit, 1)
+
+    def prepare_query(self, spec: QueryTest, query: Optional[str] = None) -> str:
+        """
+        Get the query to run for a test, with the auto-head limit applied
+
+        Args:
+            spec: Test parameters
+            query: Query to use instead of spec.query (e.g. a post-process search)
+
+        Returns:
+            SPL query
+        """
+        query = query or spec.query
+        limit = self.head_limit(spec)
+        return apply_head_limit(query, limit) if limit is not None else query
+
+    def evaluate_search_result(self, spec: QueryTest, result: LabTestResult,
+                               search_result: Dict[str, Any],
+                               execution_time: float) -> LabTestResult:
+        """
+        Check a search result against a test's expectations
+
+        Args:
+            spec: Test parameters
+            result: Result object to fill in
+            search_result: Dictionary returned by execute_search()
+            execution_time: Seconds spent obtaining the search result (time
+                spent waiting for a governor slot is subtracted)
+
+        Returns:
+            The filled-in LabTestResult
+        """
+        expected_min_results = spec.expected_min_results
+        expected_max_results = spec.expected_max_results
+        required_fields = spec.required_fields
+
+        try:
+            queue_wait = float(search_result.get("queue_wait") or 0.0)
+            result.execution_time = max(0.0, execution_time - queue_wait)
+
             if not search_result["success"]:
                 result.passed = False
                 result.error_message = search_result.get("error", "Unknown error")
@@ -126,6 +481,19 @@ class LabTestBase:
                 "execution_time": result.execution_time,
                 "sample_results": results_data[:3] if results_data else []
             }
+            if search_result.get("job"):
+                result.details["job_stats"] = search_result["job"]
+            if search_result.get("job_profile"):
+                result.details["job_profile"] = search_result["job_profile"]
+            if search_result.get("cached"):
+                result.details["cached"] = True
+            if queue_wait:
+                result.details["queue_wait"] = queue_wait
+            if spec.summary_query and spec.query == spec.summary_query:
+                result.details["summary"] = True
+
+            if self.latency_gate is not None:
+                self.latency_gate.check(spec, result)
 
         except Exception as e:
             result.passed = False
@@ -196,18 +564,27 @@ class DataValidator:
     def __init__(self, client: SplunkClient):
         self.client = client
 
-    def validate_index(self, index: str, min_events: int = 1000) -> Dict[str, Any]:
+    def validate_index(self, index: str, min_events: int = 1000,
+                       event_count: Optional[int] = None) -> Dict[str, Any]:
         """
         Validate that an index exists and has sufficient data
 
         Args:
             index: Index name
             min_events: Minimum expected events
+            event_count: Known event count (None = count with a full scan)
 
         Returns:
             Validation result dictionary
         """
-        result = self.client.check_index_data(index)
+        if event_count is None:
+            result = self.client.check_index_data(index)
+        else:
+            result = {
+                "exists": event_count > 0,
+                "has_data": event_count > 0,
+                "event_count": event_count
+            }
 
         if not result["has_data"]:
             return {
@@ -266,10 +643,31 @@ class DataValidator:
             "message": f"Lookup '{lookup_name}' validated with {result['row_count']} rows"
         }
 
-    def validate_all_course_data(self) -> Dict[str, Any]:
+    def get_index_counts(self) -> Optional[Dict[str, int]]:
+        """
+        Get event counts for all indexes without scanning raw events
+
+        Tries a single tstats search first, then the index REST endpoint.
+
+        Returns:
+            Dictionary of index name -> event count, or None if neither works
+        """
+        for method in ("tstats", "rest"):
+            counts = self.client.get_index_counts(method)
+            if counts is not None:
+                return counts
+        return None
+
+    def validate_all_course_data(self, full_scan: bool = False,
+                                 full_scan_fallback: bool = True) -> Dict[str, Any]:
         """
         Validate all required data for the course
 
+        Args:
+            full_scan: Count every index with 'stats count' over raw events
+                instead of the metadata fast path
+            full_scan_fallback: Fall back to full scans if the fast path fails
+
         Returns:
             Comprehensive validation results
         """
@@ -289,8 +687,15 @@ class DataValidator:
             ("api", 5000)
         ]
 
+        index_counts = None
+        if not full_scan:
+            index_counts = self.get_index_counts()
+            if index_counts is None and not full_scan_fallback:
+                index_counts = {}
+
         for index, min_events in required_indexes:
-            validation = self.validate_index(index, min_events)
+            event_count = index_counts.get(index, 0) if index_counts is not None else None
+            validation = self.validate_index(index, min_events, event_count)
             validations["indexes"].append(validation)
             if not validation["valid"]:
                 validations["overall_valid"] = False
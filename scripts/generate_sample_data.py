@@ -6,6 +6,7 @@ Generates comprehensive sample data for all course labs
 
 import random
 import json
+import argparse
 from datetime import datetime, timedelta
 import os
 import sys
@@ -15,6 +16,9 @@ OUTPUT_DIR = "../data"
 DAYS_OF_DATA = 30
 EVENTS_PER_DAY = 10000
 
+# Written next to the data files; identifies the data set (e.g. for snapshots)
+MANIFEST_FILE = "generator.json"
+
 # Sample data pools
 HOSTS = ["web-server-01", "web-server-02", "app-server-01", "app-server-02", "db-server-01"]
 USERS = [f"user{i:04d}" for i in range(1, 501)]
@@ -290,63 +294,111 @@ def generate_api_logs(output_file, start_date, num_events):
             f.write(json.dumps(log_entry) + '\n')
 
 
-def main():
-    """Main data generation function"""
-    print("=" * 60)
-    print("Splunk Advanced Course - Sample Data Generator")
-    print("=" * 60)
+# Event files: (generator, file name, divisor of the total event volume)
+EVENT_FILES = [
+    (generate_web_logs, "web_access.log", 3),
+    (generate_application_logs, "application.log", 4),
+    (generate_authentication_logs, "auth.log", 8),
+    (generate_sales_data, "sales.log", 6),
+    (generate_performance_metrics, "performance.log", 10),
+    (generate_api_logs, "api.log", 5),
+]
+
+
+def read_manifest(output_dir=OUTPUT_DIR):
+    """
+    Read the manifest describing a generated data set
+
+    Returns:
+        Manifest dictionary, or None if the directory has no manifest
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def generate_all(output_dir=OUTPUT_DIR, progress=None, seed=None, scale=1):
+    """
+    Generate every sample data file
+
+    Args:
+        output_dir: Directory the files are written to
+        progress: Optional callable receiving a progress event dictionary
+            after each file ({"stage": "generate", "event": "file_generated",
+            "file": ..., "events": ...})
+        seed: Random seed; the same seed and configuration produce the
+            same events, apart from timestamps relative to now (None =
+            different data on every run)
+        scale: Multiplier of EVENTS_PER_DAY (e.g. 10 or 100 for data
+            volume benchmarks)
+
+    Returns:
+        Dictionary with success, output_dir, file name -> event count and
+        the manifest written to the output directory
+    """
+    random.seed(seed)
 
     # Create output directory
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-        print(f"\nCreated output directory: {OUTPUT_DIR}")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"\nCreated output directory: {output_dir}")
 
     # Generate data for the past 30 days
     end_date = datetime.now()
     start_date = end_date - timedelta(days=DAYS_OF_DATA)
 
     print(f"\nGenerating data from {start_date.date()} to {end_date.date()}")
-    print(f"Approximately {EVENTS_PER_DAY * DAYS_OF_DATA:,} events total\n")
+    events_per_day = EVENTS_PER_DAY * scale
+    print(f"Approximately {events_per_day * DAYS_OF_DATA:,} events total\n")
+
+    files = {}
 
     # Generate various log types
-    generate_web_logs(
-        os.path.join(OUTPUT_DIR, "web_access.log"),
-        start_date,
-        EVENTS_PER_DAY * DAYS_OF_DATA // 3
-    )
-
-    generate_application_logs(
-        os.path.join(OUTPUT_DIR, "application.log"),
-        start_date,
-        EVENTS_PER_DAY * DAYS_OF_DATA // 4
-    )
-
-    generate_authentication_logs(
-        os.path.join(OUTPUT_DIR, "auth.log"),
-        start_date,
-        EVENTS_PER_DAY * DAYS_OF_DATA // 8
-    )
-
-    generate_sales_data(
-        os.path.join(OUTPUT_DIR, "sales.log"),
-        start_date,
-        EVENTS_PER_DAY * DAYS_OF_DATA // 6
-    )
-
-    generate_performance_metrics(
-        os.path.join(OUTPUT_DIR, "performance.log"),
-        start_date,
-        EVENTS_PER_DAY * DAYS_OF_DATA // 10
-    )
-
-    generate_api_logs(
-        os.path.join(OUTPUT_DIR, "api.log"),
-        start_date,
-        EVENTS_PER_DAY * DAYS_OF_DATA // 5
-    )
+    for generator, filename, divisor in EVENT_FILES:
+        num_events = events_per_day * DAYS_OF_DATA // divisor
+        generator(os.path.join(output_dir, filename), start_date, num_events)
+        files[filename] = num_events
+        if progress:
+            progress({"stage": "generate", "event": "file_generated",
+                      "file": filename, "events": num_events})
 
     # Generate lookup files
-    generate_user_data(os.path.join(OUTPUT_DIR, "users.csv"))
+    generate_user_data(os.path.join(output_dir, "users.csv"))
+    files["users.csv"] = len(USERS)
+    if progress:
+        progress({"stage": "generate", "event": "file_generated",
+                  "file": "users.csv", "events": len(USERS)})
+
+    manifest = {
+        "seed": seed,
+        "days_of_data": DAYS_OF_DATA,
+        "events_per_day": events_per_day,
+        "files": files
+    }
+    if seed is None:
+        # Unseeded data cannot be reproduced, so tie the manifest to this run
+        manifest["generated_at"] = end_date.isoformat()
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return {"success": True, "output_dir": output_dir, "files": files, "manifest": manifest}
+
+
+def main():
+    """Main data generation function"""
+    parser = argparse.ArgumentParser(description="Splunk Advanced Course - Sample Data Generator")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible data")
+    parser.add_argument("--scale", type=int, default=1,
+                        help=f"Multiplier of the {EVENTS_PER_DAY:,} events per day (default: 1)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Splunk Advanced Course - Sample Data Generator")
+    print("=" * 60)
+
+    generate_all(OUTPUT_DIR, seed=args.seed, scale=args.scale)
 
     print("\n" + "=" * 60)
     print("Data generation complete!")
@@ -54,6 +54,7 @@ class SplunkLoader:
         self.auth = (username, password)
         self.session = requests.Session()
         self.session.verify = False
+        self.loaded_counts = {}
 
     def wait_for_splunk(self, timeout=180):
         """Wait for Splunk to be ready"""
@@ -103,13 +104,37 @@ class SplunkLoader:
             print(f"  ✗ Error creating index {index_name}: {e}")
             return False
 
-    def create_hec_token(self):
-        """Create HEC token for data loading"""
+    def delete_index(self, index_name):
+        """Delete a Splunk index and its events"""
+        url = f"{self.base_url}/servicesNS/nobody/system/data/indexes/{index_name}"
+
+        try:
+            response = self.session.delete(url, auth=self.auth)
+
+            if response.status_code in [200, 404]:
+                print(f"  ✓ Removed index: {index_name}")
+                return True
+            else:
+                print(f"  ✗ Failed to remove index {index_name}: {response.status_code}")
+                return False
+
+        except Exception as e:
+            print(f"  ✗ Error removing index {index_name}: {e}")
+            return False
+
+    def create_hec_token(self, indexes=None):
+        """
+        Create HEC token for data loading
+
+        Args:
+            indexes: Index names the token may write to (default: the
+                course indexes); an existing token is updated to allow them
+        """
         url = f"{self.base_url}/servicesNS/admin/splunk_httpinput/data/inputs/http"
         data = {
             'name': 'course_hec',
             'index': 'web',
-            'indexes': 'web,app,auth,sales,performance,api',
+            'indexes': ','.join(indexes or [index_config["name"] for index_config in INDEXES]),
             'disabled': '0'
         }
 
@@ -125,6 +150,8 @@ class SplunkLoader:
                     return token
                 # If already exists, try to get existing token
                 get_url = f"{url}/course_hec"
+                if indexes:
+                    self.session.post(get_url, auth=self.auth, data={'indexes': data['indexes']})
                 get_response = self.session.get(get_url, auth=self.auth)
                 match = re.search(r'<s:key name="token">([a-f0-9\-]+)</s:key>', get_response.text)
                 if match:
@@ -311,6 +338,7 @@ class SplunkLoader:
                         print(f"  ✗ Final batch failed: {response.status_code}")
                         return False
 
+            self.loaded_counts[index] = self.loaded_counts.get(index, 0) + total_events
             print(f"  ✓ Loaded {total_events} events from {filepath.name} to index {index}")
             if failed_parse > 0:
                 print(f"    (Skipped {failed_parse} unparseable lines)")
@@ -361,33 +389,55 @@ class SplunkLoader:
             print(f"  ✗ Error uploading lookup: {e}")
             return False
 
-def main():
-    print("=" * 70)
-    print("Splunk Advanced Course - Data Loader")
-    print("=" * 70)
-    print()
-
-    # Display platform information
-    current_platform = platform.system()
-    print(f"Platform: {current_platform}")
-    print(f"Python: {platform.python_version()}")
-    print(f"Data Directory: {DATA_DIR}")
-    print()
+def load_all(host=SPLUNK_HOST, port=SPLUNK_PORT, username=SPLUNK_USERNAME,
+             password=SPLUNK_PASSWORD, data_dir=DATA_DIR, progress=None,
+             only_indexes=None, clean=False, index_suffix=""):
+    """
+    Create the course indexes and load every data file
+
+    Args:
+        host: Splunk host
+        port: Splunk management port
+        username: Splunk username
+        password: Splunk password
+        data_dir: Directory containing the generated data files
+        progress: Optional callable receiving a progress event dictionary
+            as soon as each file has been sent ({"stage": "load",
+            "event": "index_loaded", "index": ..., "file": ..., "events": ...})
+        only_indexes: Load only the files for these indexes (None = all)
+        clean: Delete and recreate each index before loading it, so a
+            reload does not duplicate events
+        index_suffix: Appended to every index name (e.g. '_x10' to load a
+            scaled data set next to the course indexes)
+
+    Returns:
+        Dictionary with success, files_loaded, files_failed and
+        index name -> number of events sent ('indexes')
+    """
+    data_dir = Path(data_dir)
 
     # Initialize loader
-    loader = SplunkLoader(SPLUNK_HOST, SPLUNK_PORT, SPLUNK_USERNAME, SPLUNK_PASSWORD)
+    loader = SplunkLoader(host, port, username, password)
 
     # Wait for Splunk
     if not loader.wait_for_splunk():
-        print("\n✗ Splunk is not ready. Please start Splunk first.")
-        sys.exit(1)
+        return {"success": False, "error": "Splunk is not ready. Please start Splunk first.",
+                "files_loaded": 0, "files_failed": len(DATA_FILES), "indexes": {}}
 
     print()
 
+    indexes = [index_config for index_config in INDEXES
+               if only_indexes is None or index_config["name"] in only_indexes]
+    data_files = [data_file for data_file in DATA_FILES
+                  if only_indexes is None or data_file["index"] in only_indexes]
+
     # Create indexes
     print("Creating indexes...")
-    for index_config in INDEXES:
-        loader.create_index(index_config["name"], index_config["datatype"])
+    for index_config in indexes:
+        index_name = index_config["name"] + index_suffix
+        if clean:
+            loader.delete_index(index_name)
+        loader.create_index(index_name, index_config["datatype"])
 
     print()
 
@@ -397,33 +447,72 @@ def main():
 
     # Create HEC token
     print("\nCreating HEC token for data loading...")
-    hec_token = loader.create_hec_token()
+    hec_indexes = None
+    if index_suffix:
+        hec_indexes = [index_config["name"] for index_config in INDEXES]
+        hec_indexes += [index_config["name"] + index_suffix for index_config in INDEXES]
+    hec_token = loader.create_hec_token(hec_indexes)
     if not hec_token:
-        print("\n✗ Failed to create HEC token. Cannot load data.")
-        sys.exit(1)
+        return {"success": False, "error": "Failed to create HEC token. Cannot load data.",
+                "files_loaded": 0, "files_failed": len(data_files), "indexes": {}}
+
+    # Upload lookup files first, so searches that enrich events with them
+    # can run as soon as their index has been loaded
+    print("\nUploading lookup files...")
+    lookup_file = data_dir / "users.csv"
+    if lookup_file.exists():
+        loader.upload_lookup(lookup_file, "users.csv")
+    else:
+        print(f"  ✗ Lookup file not found: {lookup_file}")
 
     # Load data files
     print("\nLoading data files...")
     success_count = 0
     fail_count = 0
 
-    for data_file in DATA_FILES:
+    for data_file in data_files:
         # Use Path for cross-platform file path handling
-        filepath = DATA_DIR / data_file["file"]
-        if loader.load_data_file(filepath, data_file["index"], data_file["sourcetype"], hec_token):
+        filepath = data_dir / data_file["file"]
+        index = data_file["index"] + index_suffix
+        before = loader.loaded_counts.get(index, 0)
+        if loader.load_data_file(filepath, index, data_file["sourcetype"], hec_token):
             success_count += 1
+            if progress:
+                progress({"stage": "load", "event": "index_loaded", "index": index,
+                          "file": data_file["file"],
+                          "events": loader.loaded_counts.get(index, 0) - before})
         else:
             fail_count += 1
 
     print()
 
-    # Upload lookup files
-    print("Uploading lookup files...")
-    lookup_file = DATA_DIR / "users.csv"
-    if lookup_file.exists():
-        loader.upload_lookup(lookup_file, "users.csv")
-    else:
-        print(f"  ✗ Lookup file not found: {lookup_file}")
+    return {
+        "success": fail_count == 0,
+        "files_loaded": success_count,
+        "files_failed": fail_count,
+        "indexes": dict(loader.loaded_counts)
+    }
+
+
+def main():
+    print("=" * 70)
+    print("Splunk Advanced Course - Data Loader")
+    print("=" * 70)
+    print()
+
+    # Display platform information
+    current_platform = platform.system()
+    print(f"Platform: {current_platform}")
+    print(f"Python: {platform.python_version()}")
+    print(f"Data Directory: {DATA_DIR}")
+    print()
+
+    result = load_all()
+    if "error" in result:
+        print(f"\n✗ {result['error']}")
+        sys.exit(1)
+    success_count = result["files_loaded"]
+    fail_count = result["files_failed"]
 
     print()
     print("=" * 70)